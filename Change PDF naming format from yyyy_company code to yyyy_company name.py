@@ -1,19 +1,21 @@
 import os
-import pandas as pd
+import argparse
+
+from company_registry import open_registry
+from bulk_ops import Plan, add_arguments, execute, ops_journal_path_for
 
 # Paths
 excel_path = r"C:\Users\lenin\OneDrive\Desktop\All company list.xlsx"
 base_path = r"C:\Users\lenin\OneDrive\Desktop\NSE Scraper"
 
-# Load Excel (col1 = code, col2 = name)
-df = pd.read_excel(excel_path)
-codes = df.iloc[:, 0].astype(str).str.strip()
-names = df.iloc[:, 1].astype(str).str.strip()
+parser = argparse.ArgumentParser(description="Rename YEAR_CODE.pdf files to YEAR_Company Name.pdf")
+add_arguments(parser)
+args = parser.parse_args()
 
-# Map: code → company name
-code_to_name = dict(zip(codes, names))
+# Company registry (code ↔ name ↔ aliases), re-imported only when the Excel changes
+registry = open_registry(excel_path)
 
-print("Starting PDF renaming...\n")
+print("Planning PDF renaming...\n")
 
 # Counters
 total_files = 0
@@ -22,6 +24,8 @@ skipped_no_underscore = 0
 skipped_no_match = 0
 skipped_other = 0
 
+plan = Plan()
+
 # Loop over all folders
 for folder in os.listdir(base_path):
     folder_path = os.path.join(base_path, folder)
@@ -36,32 +40,20 @@ for folder in os.listdir(base_path):
         total_files += 1
         old_file_path = os.path.join(folder_path, file)
 
-        # Expect format: YEAR_CODE.pdf
-        if "_" not in file:
-            print(f"Skipping unexpected file (no underscore): {file}")
+        # Expect YEAR_CODE.pdf (any registry alias, either order, is accepted)
+        year, code, token = registry.parse(file)
+        if year is None:
+            print(f"Skipping unexpected file (no year): {file}")
             skipped_no_underscore += 1
             continue
 
-        try:
-            year, rest = file.split("_", 1)
-        except ValueError:
-            print(f"Skipping malformed file: {file}")
-            skipped_other += 1
-            continue
-
-        # Extract code and remove .pdf
-        code = rest.replace(".pdf", "").strip()
-
-        # Look up company name
-        if code not in code_to_name:
-            print(f"❌ No match found for code: {code} in file {file}")
+        if code is None:
+            print(f"❌ No match found for code: {token} in file {file}")
             skipped_no_match += 1
             continue
 
-        company_name = code_to_name[code]
-
         # Build new filename
-        new_filename = f"{year}_{company_name}.pdf"
+        new_filename = registry.render(code, year)
         new_file_path = os.path.join(folder_path, new_filename)
 
         if file == new_filename:
@@ -69,17 +61,26 @@ for folder in os.listdir(base_path):
             skipped_other += 1
             continue
 
-        os.rename(old_file_path, new_file_path)
+        if os.path.exists(new_file_path) or plan.claimed(new_file_path):
+            print(f"⚠️ Target exists, skipping: {file} → {new_filename}")
+            skipped_other += 1
+            continue
+
+        plan.rename(old_file_path, new_file_path)
         renamed_files += 1
         print(f"✅ {file} → {new_filename}")
 
+# Execute the plan (serial renames, journaled, reversible with --rollback)
+print()
+execute(lambda: plan, ops_journal_path_for("PDF rename", base_path), args)
+
 # ✅ Final Summary
 print("\n============================")
 print("📊 RENAME SUMMARY REPORT")
 print("============================")
 print(f"Total PDF files scanned:     {total_files}")
-print(f"✅ Successfully renamed:      {renamed_files}")
-print(f"⚠️ Skipped (no underscore):   {skipped_no_underscore}")
+print(f"✅ Planned renames:           {renamed_files}")
+print(f"⚠️ Skipped (no year):         {skipped_no_underscore}")
 print(f"⚠️ Skipped (no code match):   {skipped_no_match}")
 print(f"⚠️ Skipped (already ok/other): {skipped_other}")
 print("============================")
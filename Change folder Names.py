@@ -1,39 +1,45 @@
 import os
-import pandas as pd
+import argparse
+
+from company_registry import open_registry
+from bulk_ops import Plan, add_arguments, execute, ops_journal_path_for
 
 # Paths
 excel_path = r"C:\Users\lenin\OneDrive\Desktop\All company list.xlsx"
 folder_path = r"C:\Users\lenin\OneDrive\Desktop\NSE Scraper"
 
-# Load Excel
-df = pd.read_excel(excel_path)
-
-# First column = code, second column = name
-codes = df.iloc[:, 0].astype(str).str.strip()
-names = df.iloc[:, 1].astype(str).str.strip()
-
-# Create mapping dict
-mapping = dict(zip(codes, names))
-
-# Process folder names
-for folder in os.listdir(folder_path):
-    old_path = os.path.join(folder_path, folder)
-
-    if not os.path.isdir(old_path):
-        continue
-
-    folder_clean = folder.strip()
-
-    # If folder name matches a company code
-    if folder_clean in mapping:
-        new_name = mapping[folder_clean]
-        new_path = os.path.join(folder_path, new_name)
-
-        # Prevent overwriting existing folder
-        if os.path.exists(new_path):
-            print(f"Skipped (target exists): {folder} → {new_name}")
+parser = argparse.ArgumentParser(description="Rename company-code folders to company names")
+add_arguments(parser)
+args = parser.parse_args()
+
+# Company registry (code ↔ name ↔ aliases), re-imported only when the Excel changes
+registry = open_registry(excel_path)
+
+# Plan folder renames (executed serially, journaled, reversible with --rollback)
+def plan_renames():
+    plan = Plan()
+    for folder in os.listdir(folder_path):
+        old_path = os.path.join(folder_path, folder)
+
+        if not os.path.isdir(old_path):
+            continue
+
+        # Folder named by code, ISIN, or a current / former company name
+        code = registry.resolve(folder)
+        if code is not None:
+            new_name = registry.folder(code)
+            if new_name == folder:
+                continue
+            new_path = os.path.join(folder_path, new_name)
+
+            # Prevent overwriting existing folder (or one renamed earlier in this plan)
+            if os.path.exists(new_path) or plan.claimed(new_path):
+                print(f"Skipped (target exists): {folder} → {new_name}")
+            else:
+                plan.rename(old_path, new_path)
+                print(f"Rename: {folder} → {new_name}")
         else:
-            os.rename(old_path, new_path)
-            print(f"Renamed: {folder} → {new_name}")
-    else:
-        print(f"No match for: {folder}")
+            print(f"No match for: {folder}")
+    return plan
+
+execute(plan_renames, ops_journal_path_for("Change folder Names", folder_path), args)
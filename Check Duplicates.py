@@ -1,32 +1,85 @@
+"""
+⚡ PDF DUPLICATE CHECK ⚡
+-----------------------
+Content-based duplicate detection over the PDF corpus (dedup.py):
+byte-identical files via size → partial hash → full hash, optionally
+near-identical reports via MinHash. Each group keeps one canonical file;
+--apply records the others as aliases in the results store so they are
+never scored again and carry a copy of the canonical row. Near matches
+naming different company-years are listed as SIMILAR and never applied.
+
+  python "Check Duplicates.py"
+  python "Check Duplicates.py" --near --apply
+"""
+
 import os
+import argparse
 from collections import Counter
 
-# Path to your directory
-path = r"C:\Users\lenin\OneDrive\Desktop\NSE Scraper"
+from dedup import WORKERS, SIMILAR, find_duplicates
+from results_store import ResultsStore, store_path_for
+
+# =========================
+# CONFIG
+# =========================
+PDF_FOLDER = r"C:\Users\lenin\OneDrive\Desktop\BSE_Scraper\Company_PDF"
+EXCEL_MAIN = r"C:\Users\lenin\OneDrive\Desktop\BSE_Scraper\ISO Data Collection.xlsx"
+
+parser = argparse.ArgumentParser(description="Find duplicate PDFs by content")
+parser.add_argument("--folder", default=PDF_FOLDER)
+parser.add_argument("--near", action="store_true", help="Also find near-identical reports (needs PyMuPDF)")
+parser.add_argument("--apply", action="store_true", help="Record aliases in the results store")
+parser.add_argument("--workers", type=int, default=WORKERS)
+args = parser.parse_args()
+
+store_path = store_path_for(EXCEL_MAIN)
+store = ResultsStore(store_path) if os.path.exists(store_path) else None
+
+# reuse hashes the store already recorded, while size / mtime still match
+processed = store.processed_files() if store else set()
+known = {}
+for row in (store.summary() if store else []):
+    size, mtime, sha = row[-3:]
+    path = os.path.join(args.folder, str(row[1]))
+    if sha and os.path.exists(path):
+        st = os.stat(path)
+        if (st.st_size, st.st_mtime) == (size, mtime):
+            known[path] = sha
 
-# Get only folder names (ignore files)
-folder_names = [
-    name for name in os.listdir(path)
-    if os.path.isdir(os.path.join(path, name))
-]
+# =========================
+# SCAN
+# =========================
+print(f"[⚡] Hashing PDFs in {args.folder} ({args.workers} workers)")
+aliases = find_duplicates(args.folder, near=args.near, processed=processed,
+                          workers=args.workers, known=known)
 
-# Count occurrences
-counts = Counter(folder_names)
+# =========================
+# REPORT
+# =========================
+groups = {}
+for alias, keep, kind, sim in aliases:
+    groups.setdefault((keep, kind), []).append((alias, sim))
 
-# Unique folders
-unique_folders = [name for name, count in counts.items() if count == 1]
+kinds = Counter(kind for _, _, kind, _ in aliases)
+print(f"Duplicate groups      : {len(groups)}")
+print(f"Exact duplicate files : {kinds['exact']}")
+print(f"Near duplicate files  : {kinds['near']}")
+print(f"Similar, not aliased  : {kinds[SIMILAR]}\n")
 
-# Duplicate folders (count > 1)
-duplicate_folders = {name: count for name, count in counts.items() if count > 1}
+for (keep, kind), members in sorted(groups.items()):
+    print(f"[{kind.upper()}] {'like' if kind == SIMILAR else 'keep'} {os.path.basename(keep)}")
+    for alias, sim in members:
+        print(f"        ↳ {os.path.basename(alias)}" + (f"  (sim {sim:.3f})" if kind != "exact" else ""))
 
-# Print results
-print(f"Total folders found: {len(folder_names)}")
-print(f"Unique folders: {len(unique_folders)}")
-print(f"Repeated folders: {len(duplicate_folders)}\n")
+applied = [a for a in aliases if a[2] != SIMILAR]
 
-if duplicate_folders:
-    print("Duplicate folder names and counts:")
-    for name, count in duplicate_folders.items():
-        print(f"{name} → {count} times")
+if not applied:
+    print("✅ No duplicate PDFs found!")
+elif args.apply:
+    if store is None:
+        print("[⚠️] No results store — run ISO Maker once before --apply")
+    else:
+        n = store.set_aliases(applied)
+        print(f"\n[💾] {n} aliases recorded — the scorer will skip them")
 else:
-    print("✅ No duplicate folders found!")
+    print("\n[⚡] Dry run — re-run with --apply to record aliases")
@@ -1,5 +1,6 @@
 import pandas as pd
-from fuzzywuzzy import process
+
+from name_matcher import NameMatcher, DecisionCache, cache_path_for, TOP_K
 
 # -----------------------------
 # File paths
@@ -41,24 +42,27 @@ print(f"Unmatched after exact match: {len(unmatched)}")
 
 # -----------------------------
 # FUZZY MATCH ONLY FOR UNMATCHED
+# (legal suffixes normalized, blocked candidates, vectorized scoring,
+#  decisions cached next to the output file)
 # -----------------------------
-ref_names = df_ref['SCRIP_LONG_NAME Clean'].tolist()
-code_map = df_ref.set_index('SCRIP_LONG_NAME Clean')['SCRIP_CODE'].to_dict()
+THRESHOLD = None  # None = backend default (90 rapidfuzz, 80 TF-IDF); adjust if required
 
-THRESHOLD = 90  # Adjust if required
+output_file = r"C:\Users\lenin\OneDrive\Desktop\List of companies with 10 year data_FINAL_UPDATED.xlsx"
 
-def fuzzy_match(name):
-    match, score = process.extractOne(name, ref_names)
-    return match if score >= THRESHOLD else None
+matcher = NameMatcher(df_ref['SCRIP_LONG_NAME Clean'], df_ref['SCRIP_CODE'])
+cache = DecisionCache(cache_path_for(output_file))
+print(f"Matching backend: {matcher.backend}")
 
-unmatched['Fuzzy_Matched_Name'] = unmatched['Company Name Clean'].apply(fuzzy_match)
-unmatched['Fuzzy_Match_Code'] = unmatched['Fuzzy_Matched_Name'].map(code_map)
+decisions = matcher.match(unmatched['Company Name Clean'], threshold=THRESHOLD, cache=cache).set_index('Query')
+unmatched['Fuzzy_Matched_Name'] = unmatched['Company Name Clean'].map(decisions['Match'])
+unmatched['Fuzzy_Match_Code'] = unmatched['Company Name Clean'].map(decisions['Key'])
+unmatched['Fuzzy_Score'] = unmatched['Company Name Clean'].map(decisions['Score'])
 
 # -----------------------------
 # Merge fuzzy results back into df_main
 # -----------------------------
 df_main = df_main.merge(
-    unmatched[['Company Name Clean', 'Fuzzy_Match_Code']],
+    unmatched[['Company Name Clean', 'Fuzzy_Match_Code', 'Fuzzy_Score']].drop_duplicates('Company Name Clean'),
     on='Company Name Clean',
     how='left'
 )
@@ -73,14 +77,19 @@ df_main['Final_Company_Code'] = df_main['Exact_Match_Code'].fillna(df_main['Fuzz
 # -----------------------------
 still_unmatched = df_main[df_main['Final_Company_Code'].isna()][['Company Name']]
 
+# Top candidates for manual review (record a decision with DecisionCache.decide)
+candidates = matcher.top_k(df_main.loc[df_main['Final_Company_Code'].isna(), 'Company Name Clean'].unique(), k=TOP_K)
+
 # -----------------------------
 # Save outputs
 # -----------------------------
-output_file = r"C:\Users\lenin\OneDrive\Desktop\List of companies with 10 year data_FINAL_UPDATED.xlsx"
 df_main.to_excel(output_file, index=False)
 
 unmatched_report = r"C:\Users\lenin\OneDrive\Desktop\Unmatched_companies_report.xlsx"
-still_unmatched.to_excel(unmatched_report, index=False)
+with pd.ExcelWriter(unmatched_report) as writer:
+    still_unmatched.to_excel(writer, sheet_name="Unmatched", index=False)
+    candidates.to_excel(writer, sheet_name="Candidates", index=False)
+cache.close()
 
 print("Processing complete.")
 print("Final updated file:", output_file)
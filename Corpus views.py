@@ -0,0 +1,56 @@
+"""
+⚡ CORPUS VIEWS ⚡
+----------------
+Flat views of the scraper tree without copying (corpus_catalog.py).
+
+  python "Corpus views.py"                                   # view sizes
+  python "Corpus views.py" --view missing --list
+  python "Corpus views.py" --view missing --materialize "C:\\...\\Missing_PDFs_FLAT2"
+  python "Corpus views.py" --view all --materialize "C:\\...\\Company_PDF" --mode symlink
+"""
+
+import argparse
+
+from corpus_catalog import VIEWS, CorpusCatalog
+
+# =========================
+# CONFIG
+# =========================
+SOURCE_ROOT = r"C:\Users\lenin\OneDrive\Desktop\NSE Scraper"
+EXCEL_MAIN = r"C:\Users\lenin\OneDrive\Desktop\BSE_Scraper\ISO Data Collection.xlsx"
+
+parser = argparse.ArgumentParser(description="Flat, filtered views of the PDF corpus")
+parser.add_argument("--view", choices=sorted(VIEWS))
+parser.add_argument("--list", action="store_true", help="Print flat name → real path")
+parser.add_argument("--materialize", metavar="DEST", help="Generate the view as a link tree in DEST")
+parser.add_argument("--mode", choices=("hardlink", "symlink"), default="hardlink")
+parser.add_argument("--source", default=SOURCE_ROOT)
+args = parser.parse_args()
+
+catalog = CorpusCatalog(args.source, EXCEL_MAIN)
+
+collisions = catalog.collisions()
+if len(collisions):
+    print(f"[⚠️] {collisions['norm'].nunique()} file names occur in more than one folder "
+          f"(first path in sorted order wins)")
+
+if not args.view:
+    for name in VIEWS:
+        print(f"{name:<12} : {len(catalog.view(name)):>7} PDFs")
+    raise SystemExit(0)
+
+if args.list:
+    for flat, path in catalog.paths(args.view).items():
+        print(f"{flat:<50} {path}")
+
+if args.materialize:
+    report = catalog.materialize(args.view, args.materialize, mode=args.mode)
+    s = report["status"]
+    print(f"[💾] {args.view} → {args.materialize}")
+    print(f"     linked {s.get('done', 0)}, already there {s.get('skipped', 0) + s.get('resumed', 0)}, "
+          f"pruned {report['pruned']}, failed {s.get('failed', 0)} "
+          f"in {report['seconds']:.2f}s ({report['methods']})")
+elif not args.list:
+    print(f"{args.view} : {len(catalog.view(args.view))} PDFs")
+
+catalog.close()
@@ -0,0 +1,88 @@
+"""
+⚡ ISO27001 EVIDENCE SEARCH ⚡
+----------------------------
+Ranked evidence across the whole corpus, straight from the stored
+sentence embeddings — no scorer rerun.
+
+  python "Evidence search.py" --domain A.9 --top 20
+  python "Evidence search.py" --domain A.17 --company "Infosys Ltd"
+  python "Evidence search.py" --query "multi-factor authentication" --company "Infosys Ltd"
+  python "Evidence search.py" --rebuild
+"""
+
+import os
+import argparse
+import time
+
+import pandas as pd
+
+from evidence_index import SentenceStore, EvidenceIndex
+from iso_scoring import ISO_DOMAINS, normalize_rows
+
+# =========================
+# CONFIG
+# =========================
+WORK_DIR = r"C:\Users\lenin\OneDrive\Desktop\BSE_Scraper"
+SENTENCE_STORE = os.path.join(WORK_DIR, "sentence_store")
+INDEX_DIR = os.path.join(WORK_DIR, "evidence_index")
+EXPORT_XLSX = os.path.join(WORK_DIR, "ISO_Evidence_Search.xlsx")
+
+# =========================
+# ARGS
+# =========================
+parser = argparse.ArgumentParser(description="Search stored ISO evidence sentences")
+parser.add_argument("--domain", help="ISO domain key, e.g. A.9")
+parser.add_argument("--query", help="Free-text query (loads the embedding model)")
+parser.add_argument("--company", help="Restrict results to one company")
+parser.add_argument("--top", type=int, default=10, help="Number of sentences to return")
+parser.add_argument("--rebuild", action="store_true", help="Rebuild the index from the sentence store")
+parser.add_argument("--export", action="store_true", help=f"Also write results to {os.path.basename(EXPORT_XLSX)}")
+args = parser.parse_args()
+
+model = None
+
+def load_model():
+    global model
+    if model is None:
+        from sentence_transformers import SentenceTransformer
+        print("[⚡] Loading embedding model (offline)")
+        model = SentenceTransformer("all-mpnet-base-v2", local_files_only=True, device="cpu")
+    return model
+
+# =========================
+# INDEX
+# =========================
+if args.rebuild or not os.path.exists(os.path.join(INDEX_DIR, "docs.json")):
+    print("[⚡] Building evidence index from sentence store")
+    domain_matrix = normalize_rows(load_model().encode(list(ISO_DOMAINS.values()), show_progress_bar=False))
+    index = EvidenceIndex.build(SentenceStore(SENTENCE_STORE), domain_matrix, ISO_DOMAINS.keys())
+    index.save(INDEX_DIR)
+else:
+    index = EvidenceIndex.load(INDEX_DIR)
+
+print(f"[⚡] Index ready :: {len(index.vectors)} sentences, {len(index.docs)} reports ({index.backend})")
+
+if not args.domain and not args.query:
+    raise SystemExit(0)
+
+# =========================
+# QUERY
+# =========================
+start = time.perf_counter()
+if args.query:
+    vec = load_model().encode([args.query], show_progress_bar=False)
+    start = time.perf_counter()
+    hits = index.search(vec, args.top, args.company)
+else:
+    hits = index.top_k_for_domain(args.domain, args.top, args.company)
+elapsed = (time.perf_counter() - start) * 1000
+
+results = pd.DataFrame(hits)
+print(f"[⚡] {len(results)} hits in {elapsed:.1f} ms\n")
+
+for rank, hit in enumerate(hits, 1):
+    print(f"{rank:>3}. [{hit['Sim']:.3f}] {hit['Company']} {hit['Year']} :: {hit['Sentence'][:200]}")
+
+if args.export and not results.empty:
+    results.to_excel(EXPORT_XLSX, index=False)
+    print(f"\n[💾] Results written to {EXPORT_XLSX}")
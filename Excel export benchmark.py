@@ -0,0 +1,122 @@
+"""
+⚡ EXCEL EXPORT BENCHMARK ⚡
+--------------------------
+Write time and peak RSS for one OG-style result sheet (14 domains × score
+/ sim / snippet / reason) written three ways:
+
+  • baseline    : applymap(clean) + df.to_excel(engine="openpyxl")
+  • write_only  : excel_export.write_excel, openpyxl write_only
+  • xlsxwriter  : excel_export.write_excel, constant_memory (if installed)
+
+Each method runs in its own process so peak RSS is not shared.
+
+  python "Excel export benchmark.py" --rows 5000
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+
+import numpy as np
+import pandas as pd
+
+ROWS = 5000
+DOMAINS = [f"A.{i} Domain {i}" for i in range(5, 19)]
+SNIPPET_CHARS = 300
+
+# =========================
+# SYNTHETIC SHEET
+# =========================
+def make_frame(n, seed=0):
+    rng = np.random.default_rng(seed)
+    words = np.array("the company has implemented access control policies audit backup encryption "
+                     "incident response vendor risk monitoring\x07 training".split())
+    cols = {"Company": [f"Company {i % 500}" for i in range(n)],
+            "Year": [str(2019 + i % 7) for i in range(n)],
+            "File": [f"Company {i}_{2019 + i % 7}.pdf" for i in range(n)]}
+    for d in DOMAINS:
+        score = rng.integers(0, 3, n)
+        cols[d] = score
+        cols[f"{d}__score"] = score
+        cols[f"{d}__sim"] = rng.random(n).round(4)
+        cols[f"{d}__snippet"] = [" ".join(rng.choice(words, SNIPPET_CHARS // 6))[:SNIPPET_CHARS] for _ in range(n)]
+        cols[f"{d}__reason"] = np.where(score > 0, "scored", "no_match")
+    cols["Total_Score"] = sum(cols[d] for d in DOMAINS)
+    cols["Status"] = "OK"
+    return pd.DataFrame(cols)
+
+# =========================
+# PEAK RSS
+# =========================
+def peak_rss_mb():
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    except ImportError:
+        import psutil  # Windows
+        return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+
+# =========================
+# CHILD: ONE METHOD
+# =========================
+def run_one(method, rows, out):
+    df = make_frame(rows)
+    base_rss = peak_rss_mb()
+    start = time.perf_counter()
+
+    if method == "baseline":
+        clean = lambda v: re.sub(r"[\x00-\x08\x0B-\x1F]", "", v) if isinstance(v, str) else v
+        elementwise = df.map if hasattr(df, "map") else df.applymap  # applymap was renamed in pandas 2.1
+        elementwise(clean).to_excel(out, index=False, engine="openpyxl")
+    else:
+        from excel_export import write_excel
+        write_excel(df, out, engine="openpyxl" if method == "write_only" else "xlsxwriter")
+
+    print(json.dumps({
+        "method": method,
+        "seconds": time.perf_counter() - start,
+        "peak_mb": peak_rss_mb(),
+        "frame_mb": base_rss,
+        "file_mb": os.path.getsize(out) / 1e6,
+    }))
+
+# =========================
+# PARENT
+# =========================
+def main():
+    parser = argparse.ArgumentParser(description="Excel export benchmark")
+    parser.add_argument("--rows", type=int, default=ROWS)
+    parser.add_argument("--method", help=argparse.SUPPRESS)
+    parser.add_argument("--out", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.method:
+        return run_one(args.method, args.rows, args.out)
+
+    methods = ["baseline", "write_only"]
+    try:
+        import xlsxwriter  # noqa: F401
+        methods.append("xlsxwriter")
+    except ImportError:
+        print("[⚠️] xlsxwriter not installed — skipping constant_memory run")
+
+    print(f"[⚡] {args.rows} rows × {len(make_frame(1).columns)} columns\n")
+    print(f"{'method':<12}{'seconds':>10}{'peak RSS MB':>14}{'(frame only)':>14}{'file MB':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for m in methods:
+            out = os.path.join(tmp, f"{m}.xlsx")
+            res = subprocess.run(
+                [sys.executable, __file__, "--method", m, "--rows", str(args.rows), "--out", out],
+                capture_output=True, text=True, check=True,
+            )
+            r = json.loads(res.stdout.strip().splitlines()[-1])
+            print(f"{m:<12}{r['seconds']:>10.2f}{r['peak_mb']:>14.0f}{r['frame_mb']:>14.0f}{r['file_mb']:>10.1f}")
+
+if __name__ == "__main__":
+    main()
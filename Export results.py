@@ -0,0 +1,39 @@
+"""
+⚡ ISO RESULTS EXPORT ⚡
+----------------------
+On-demand workbook export from the append-only results store
+("ISO Data Collection.sqlite" → "ISO Data Collection.xlsx").
+
+  python "Export results.py"
+  python "Export results.py" --csv
+"""
+
+import os
+import sys
+import argparse
+
+from results_store import ResultsStore, store_path_for
+
+# =========================
+# CONFIG
+# =========================
+EXCEL_MAIN = r"C:\Users\lenin\OneDrive\Desktop\BSE_Scraper\ISO Data Collection.xlsx"
+
+parser = argparse.ArgumentParser(description="Export the ISO results store to Excel")
+parser.add_argument("--store", default=store_path_for(EXCEL_MAIN))
+parser.add_argument("--out", default=EXCEL_MAIN)
+parser.add_argument("--csv", action="store_true", help="Also write a CSV shadow copy")
+args = parser.parse_args()
+
+if not os.path.exists(args.store):
+    print(f"[❌] Results store not found: {args.store}")
+    sys.exit(1)
+
+store = ResultsStore(args.store)
+n = store.export_excel(args.out)
+print(f"[💾] {n} rows → {args.out}")
+
+if args.csv:
+    csv_path = os.path.splitext(args.out)[0] + ".csv"
+    store.to_frame().to_csv(csv_path, index=False)
+    print(f"[💾] CSV shadow → {csv_path}")
@@ -1,27 +1,53 @@
 import os
-import shutil
+import argparse
+
+from dedup import ContentIndex
+from bulk_ops import Plan, add_arguments, execute, ops_journal_path_for
 
 source = r"C:\Users\lenin\OneDrive\Desktop\NSE Scraper"
 destination = r"C:\Users\lenin\OneDrive\Desktop\BSE_Scraper\Company_PDF"
 
+parser = argparse.ArgumentParser(description="Flatten every PDF under the source tree into the destination")
+add_arguments(parser)
+args = parser.parse_args()
+
 # Create destination folder if it does not exist
 os.makedirs(destination, exist_ok=True)
 
-# Walk through all subfolders
-for root, dirs, files in os.walk(source):
-    for file in files:
-        if file.lower().endswith(".pdf"):
-            src_path = os.path.join(root, file)
-            dst_path = os.path.join(destination, file)
+duplicates = []
+
+def plan_moves():
+    # Byte-identity index of what is already there (hashes only on size collisions)
+    index = ContentIndex(destination)
+    plan = Plan()
+
+    # Walk through all subfolders
+    for root, dirs, files in os.walk(source):
+        for file in files:
+            if file.lower().endswith(".pdf"):
+                src_path = os.path.join(root, file)
+                dst_path = os.path.join(destination, file)
+
+                # Same bytes already in the destination (or planned) → skip, never score twice
+                same = index.find(src_path)
+                if same is not None:
+                    duplicates.append((src_path, same))
+                    continue
+
+                # Same name but different content → keep both with a suffix
+                if os.path.exists(dst_path) or plan.claimed(dst_path):
+                    base, ext = os.path.splitext(file)
+                    counter = 1
+                    while os.path.exists(dst_path) or plan.claimed(dst_path):
+                        dst_path = os.path.join(destination, f"{base}_{counter}{ext}")
+                        counter += 1
 
-            # If a file with the same name already exists, rename the new copy
-            if os.path.exists(dst_path):
-                base, ext = os.path.splitext(file)
-                counter = 1
-                while os.path.exists(dst_path):
-                    dst_path = os.path.join(destination, f"{base}_{counter}{ext}")
-                    counter += 1
+                plan.copy(src_path, dst_path)
+                index.add(src_path)
+    return plan
 
-            shutil.copy2(src_path, dst_path)
+execute(plan_moves, ops_journal_path_for("Folder mover", destination), args)
 
-print("PDF copy completed.")
+print(f"Skipped {len(duplicates)} duplicate(s).")
+for src_path, same in duplicates[:20]:
+    print(f"   = {src_path}  →  {os.path.basename(same)}")
@@ -16,13 +16,13 @@ import os
 import re
 import fitz
 import pandas as pd
-import numpy as np
 from datetime import datetime
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
-import nltk
 from nltk.tokenize import sent_tokenize
 
+from iso_scoring import score_document
+from warm_start import MODEL_NAME, ensure_nltk, domain_matrix, get_encoder
+from keyword_matcher import KeywordMatcher
+
 # =========================
 # CONFIG
 # =========================
@@ -43,6 +43,14 @@ SECURITY_KEYWORDS = [
     "business continuity","iso","security"
 ]
 
+EVIDENCE_WORDS = [
+    "implemented","established","maintained","audit",
+    "certified","monitored","trained","reviewed","tested"
+]
+
+# one compiled pass tags both the security filter and the evidence words
+matcher = KeywordMatcher({"security": SECURITY_KEYWORDS, "evidence": EVIDENCE_WORDS})
+
 ISO_DOMAINS = {
     "A.5": "Information security policies",
     "A.6": "Organization of information security",
@@ -65,15 +73,11 @@ ISO_KEYS = list(ISO_DOMAINS.keys())
 # INIT NLP
 # =========================
 print("[⚡] Loading NLTK tokenizer")
-nltk.download("punkt", quiet=True)
-
-print("[⚡] Loading embedding model (offline)")
-model = SentenceTransformer(
-    "all-mpnet-base-v2",
-    local_files_only=True,
-    device="cpu"
-)
-iso_embeddings = model.encode(list(ISO_DOMAINS.values()), show_progress_bar=False)
+ensure_nltk("punkt")
+
+print("[⚡] Loading embedding model (daemon or offline)")
+model = get_encoder(MODEL_NAME)
+iso_matrix = domain_matrix(ISO_DOMAINS.values(), model)
 print("[⚡] Embedding model online\n")
 
 # =========================
@@ -93,18 +97,11 @@ def split_sentences(text):
     return [s for s in sent_tokenize(text) if len(s.strip()) > 10]
 
 def filter_security_sentences(sentences):
-    return [
-        s for s in sentences
-        if any(k in s.lower() for k in SECURITY_KEYWORDS)
-    ]
-
-def has_evidence(sents, idx):
-    words = [
-        "implemented","established","maintained","audit",
-        "certified","monitored","trained","reviewed","tested"
-    ]
-    lo, hi = max(0, idx-WINDOW), min(len(sents)-1, idx+WINDOW)
-    return any(any(w in sents[i].lower() for w in words) for i in range(lo, hi+1))
+    """Security-relevant sentences plus their evidence-word hits."""
+    hits = matcher.tag(sentences)
+    keep = matcher.group_hits(hits, "security")
+    evidence = matcher.group_hits(hits, "evidence")[keep]
+    return [s for s, k in zip(sentences, keep) if k], evidence
 
 # =========================
 # LOAD DATA
@@ -147,26 +144,20 @@ for idx, row in batch.iterrows():
         continue
 
     sentences = split_sentences(text)
-    sentences = filter_security_sentences(sentences)
+    sentences, evidence = filter_security_sentences(sentences)
 
     if not sentences:
         print("   └─ No security-relevant sentences")
         continue
 
     sent_embeddings = model.encode(sentences, show_progress_bar=False)
-    sims = cosine_similarity(sent_embeddings, iso_embeddings)
-
-    scores = {}
-    for j, key in enumerate(ISO_KEYS):
-        idx_best = int(np.argmax(sims[:, j]))
-        sim = sims[idx_best, j]
-
-        score = 0
-        if sim >= SIM_MENTION:
-            score = 1
-            if sim >= SIM_HIGH or has_evidence(sentences, idx_best):
-                score = 2
-        scores[key] = score
+    result = score_document(
+        sent_embeddings, iso_matrix,
+        hits=evidence,
+        window=WINDOW, sim_mention=SIM_MENTION, sim_high=SIM_HIGH
+    )
+
+    scores = {key: int(result.scores[j]) for j, key in enumerate(ISO_KEYS)}
 
     for k, v in scores.items():
         df.at[idx, k] = v
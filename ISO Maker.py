@@ -6,47 +6,57 @@ ISO27001 Batch Scoring Script – OFFLINE STABLE FINAL
 • MuPDF errors suppressed
 • Batch confirmation restored
 • Infinite-loop proof
-• Safe Excel backups
+• Incremental, deduplicated store snapshots per batch
+• Append-only results store, Excel exported once per run
+• Every scored PDF journaled (fsync) before the batch commit
+• Score drift refreshed per batch; suspect rows queued for re-extraction
 """
 
 import os
-import re
 import sys
-import glob
 import zipfile
-import shutil
 import logging
 import warnings
-import contextlib
-import io
 from datetime import datetime
 
-import fitz  # PyMuPDF
 import pandas as pd
-import numpy as np
 from tqdm import tqdm
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
-import nltk
-from nltk.tokenize import sent_tokenize
+
+from iso_scoring import ISO_DOMAINS
+from iso_pipeline import score_pdf, pipeline_config
+from provenance import fingerprint
+from evidence_index import SentenceStore
+from warm_start import MODEL_NAME, ensure_nltk, resolve_snapshot, domain_matrix, get_encoder
+from scoring_service import service_available, submit, stream_results, job_status
+from results_store import ResultsStore, store_path_for
+from journal import WorkerJournal
+from snapshots import Snapshots, snapshot_dir_for
+from corpus_catalog import CorpusCatalog
+from score_drift import DriftState, drift_state_path_for
+from company_registry import scorer_registry
 
 # =========================
 # CONFIG
 # =========================
 PDF_FOLDER = r"C:\Users\lenin\OneDrive\Desktop\BSE_Scraper\Company_PDF"
 EXCEL_MAIN = r"C:\Users\lenin\OneDrive\Desktop\BSE_Scraper\ISO Data Collection.xlsx"
+STORE_PATH = store_path_for(EXCEL_MAIN)
+SNAPSHOT_DIR = snapshot_dir_for(STORE_PATH)
+DRIFT_PATH = drift_state_path_for(STORE_PATH)
 WORK_DIR = r"C:\Users\lenin\OneDrive\Desktop\BSE_Scraper"
 LOG_FILE = os.path.join(WORK_DIR, "iso_processing_log.txt")
-
-HF_MODEL_ROOT = (
-    r"C:\Users\lenin\.cache\huggingface\hub"
-    r"\models--sentence-transformers--all-mpnet-base-v2\snapshots"
-)
+SENTENCE_STORE = os.path.join(WORK_DIR, "sentence_store")
 
 BATCH_SIZE = 20
 SIM_MENTION = 0.60
 SIM_HIGH = 0.72
 WINDOW = 1
+EXPORT_EXCEL = True  # refresh EXCEL_MAIN from the store once at the end of the run
+
+# Score straight from the scraper tree through a catalog view instead of the
+# flattened PDF_FOLDER copy: None, "all", "unprocessed", "missing" or "failed"
+CATALOG_VIEW = None
+SOURCE_ROOT = r"C:\Users\lenin\OneDrive\Desktop\NSE Scraper"
 
 warnings.filterwarnings("ignore")
 logging.basicConfig(filename=LOG_FILE, level=logging.INFO)
@@ -62,27 +72,11 @@ def log(msg):
 # =========================
 # NLTK
 # =========================
-def ensure_nltk():
-    try:
-        nltk.data.find("tokenizers/punkt")
-    except LookupError:
-        nltk.download("punkt")
-
-ensure_nltk()
-
-# =========================
-# UTILITIES
-# =========================
-def normalize_filename(f):
-    return os.path.basename(str(f)).strip().lower()
+ensure_nltk("punkt")
 
 # =========================
 # EXCEL INTEGRITY
 # =========================
-def newest_backup():
-    files = glob.glob(os.path.join(WORK_DIR, "ISO Data Collection_backup_*.xlsx"))
-    return max(files, key=os.path.getmtime) if files else None
-
 def excel_is_valid(path):
     return os.path.exists(path) and os.path.getsize(path) > 1024 and zipfile.is_zipfile(path)
 
@@ -95,68 +89,9 @@ def load_master_excel():
         except Exception as e:
             log(f"❌ Excel read failed: {e}")
 
-    backup = newest_backup()
-    if backup:
-        shutil.copy2(backup, EXCEL_MAIN)
-        log(f"🛠 Recovered Excel from backup: {os.path.basename(backup)}")
-        return pd.read_excel(EXCEL_MAIN, engine="openpyxl")
-
     log("⚠️ No valid Excel found, starting fresh")
     return pd.DataFrame()
 
-# =========================
-# QUIET MuPDF
-# =========================
-@contextlib.contextmanager
-def suppress_mupdf():
-    stderr = sys.stderr
-    try:
-        sys.stderr = io.StringIO()
-        yield
-    finally:
-        sys.stderr = stderr
-
-def extract_text(pdf_path):
-    try:
-        with suppress_mupdf():
-            doc = fitz.open(pdf_path)
-
-        try:
-            doc.set_option("widget.update-appearance", False)
-        except Exception:
-            pass
-
-        text = []
-        for page in doc:
-            try:
-                text.append(page.get_text("text") or "")
-            except Exception:
-                try:
-                    text.append(page.get_text("raw") or "")
-                except Exception:
-                    pass
-        doc.close()
-        return "\n".join(text)
-
-    except Exception as e:
-        log(f"❌ PDF FAILED: {os.path.basename(pdf_path)} | {e}")
-        return None
-
-# =========================
-# NLP HELPERS
-# =========================
-def split_sentences(txt):
-    txt = re.sub(r"\n+", " ", txt)
-    return [s for s in sent_tokenize(txt) if len(s.strip()) > 10]
-
-def has_evidence(sents, idx, window):
-    keywords = [
-        "implemented", "established", "maintained", "audit", "certified",
-        "monitored", "trained", "reviewed", "tested", "assessed"
-    ]
-    lo, hi = max(0, idx - window), min(len(sents) - 1, idx + window)
-    return any(any(k in sents[i].lower() for k in keywords) for i in range(lo, hi + 1))
-
 # =========================
 # PROMPT
 # =========================
@@ -166,136 +101,136 @@ def ask_continue(remaining):
     choice = input("➡️ Continue with next batch? [Y/n]: ").strip().lower()
     return choice in ("", "y", "yes")
 
+# =========================
+# SERVICE MODE (THIN CLIENT)
+# =========================
+if service_available():
+    log("🛰 Scoring service detected — no local model or Excel load needed")
+    if CATALOG_VIEW:
+        catalog = CorpusCatalog(SOURCE_ROOT, EXCEL_MAIN)
+        job = submit(list(catalog.paths(CATALOG_VIEW).values()))
+        catalog.close()
+    else:
+        job = submit([PDF_FOLDER])
+    log(f"🆕 PDFs remaining: {job['total']}")
+
+    for row in tqdm(stream_results(job["job_id"]), total=job["total"], desc="Processing PDFs"):
+        if row["Status"] != "OK":
+            log(f"❌ {row['File']} :: {row['Status']}")
+
+    log(f"💾 Service committed {job_status(job['job_id'])['done']} rows")
+    if EXPORT_EXCEL:
+        log(f"📤 Exported {ResultsStore(STORE_PATH).export_excel(EXCEL_MAIN)} rows to Excel")
+    log("🎉 COMPLETE — SCRIPT FINISHED SAFELY")
+    sys.exit(0)
+
 # =========================
 # MODEL (OFFLINE SNAPSHOT)
 # =========================
-snapshots = glob.glob(os.path.join(HF_MODEL_ROOT, "*"))
-if not snapshots:
+if resolve_snapshot(MODEL_NAME) is None:
     log("❌ No offline model snapshot found.")
     sys.exit(1)
 
-EMBEDDING_MODEL = max(snapshots, key=os.path.getmtime)
-
-log("🧠 Loading embedding model (OFFLINE)")
-model = SentenceTransformer(
-    EMBEDDING_MODEL,
-    local_files_only=True,
-    device="cpu"
-)
-
 # =========================
 # ISO DOMAINS
 # =========================
-ISO_DOMAINS = {
-    "A.5": "Information security policies",
-    "A.6": "Organization of information security",
-    "A.7": "Human resource security",
-    "A.8": "Asset management",
-    "A.9": "Access control",
-    "A.10": "Cryptography",
-    "A.11": "Physical security",
-    "A.12": "Operations security",
-    "A.13": "Communications security",
-    "A.14": "System development security",
-    "A.15": "Supplier relationships",
-    "A.16": "Incident management",
-    "A.17": "Business continuity",
-    "A.18": "Compliance",
-}
-
 keys = list(ISO_DOMAINS.keys())
-iso_embeddings = model.encode(list(ISO_DOMAINS.values()), show_progress_bar=False)
+sentence_store = SentenceStore(SENTENCE_STORE)
+iso_matrix = domain_matrix(ISO_DOMAINS.values())  # cached on disk after first run
 
 # =========================
 # LOAD STATE
 # =========================
-master_df = load_master_excel()
-processed_files = {normalize_filename(f) for f in master_df.get("File", [])}
-
-pdf_files = [f for f in os.listdir(PDF_FOLDER) if f.lower().endswith(".pdf")]
-remaining = [f for f in pdf_files if normalize_filename(f) not in processed_files]
+store = ResultsStore(STORE_PATH)
+registry = scorer_registry()  # Company → registry code, when the company list exists
+snapshots = Snapshots(SNAPSHOT_DIR)
+if not len(store) and snapshots.latest():
+    log(f"🛠 Restored {snapshots.restore(store)} rows from snapshot {snapshots.latest()['created']}")
+if not len(store):
+    master_df = load_master_excel()
+    if not master_df.empty:
+        store.import_frame(master_df)
+        log(f"🗄 Migrated {len(master_df)} Excel rows into results store")
+
+journal = WorkerJournal(STORE_PATH)  # per process: parallel scorers never truncate each other's rows
+recovered = journal.recover(store)
+if recovered:
+    log(f"🛠 Recovered {recovered} rows from journal")
+
+log(f"✅ Results store ready ({len(store)} files)")
+
+CONFIG = pipeline_config(ISO_DOMAINS, MODEL_NAME, SIM_MENTION, SIM_HIGH, WINDOW)
+FINGERPRINT = store.register_config(fingerprint(CONFIG), CONFIG)
+log(f"🧾 Config fingerprint: {FINGERPRINT}")
+
+if CATALOG_VIEW:
+    catalog = CorpusCatalog(SOURCE_ROOT, store)
+    SOURCES = catalog.paths(CATALOG_VIEW)  # {flat name: real path}
+    catalog.close()
+    remaining = store.unprocessed(SOURCES)
+    log(f"🗂 Catalog view '{CATALOG_VIEW}': {len(SOURCES)} PDFs under {SOURCE_ROOT}")
+else:
+    SOURCES = PDF_FOLDER
+    remaining = store.pending(PDF_FOLDER)
 
-log(f"📁 PDFs found: {len(pdf_files)}")
 log(f"🆕 PDFs remaining: {len(remaining)}")
 
+drift = DriftState(DRIFT_PATH)
+
+if remaining:
+    log("🧠 Loading embedding model (daemon or OFFLINE snapshot)")
+    model = get_encoder(MODEL_NAME)
+
 # =========================
 # MAIN LOOP
 # =========================
-while remaining:
-    batch = remaining[:BATCH_SIZE]
-    rows = []
-
-    for pdf in tqdm(batch, desc="Processing PDFs"):
-        path = os.path.join(PDF_FOLDER, pdf)
-        base = os.path.splitext(pdf)[0]
-        company, year = (base.split("_", 1) + [""])[:2]
-
-        text = extract_text(path)
-
-        if text is None:
-            rows.append({
-                "Company": company,
-                "Year": year,
-                "File": pdf,
-                "Processed_On": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "Total_Score": 0,
-                "Status": "PDF_READ_FAILED",
-            })
-            continue
-
-        sentences = split_sentences(text)
-        if not sentences:
-            rows.append({
-                "Company": company,
-                "Year": year,
-                "File": pdf,
-                "Processed_On": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "Total_Score": 0,
-                "Status": "NO_TEXT",
-            })
-            continue
-
-        sims = cosine_similarity(
-            model.encode(sentences, show_progress_bar=False),
-            iso_embeddings,
-        )
-
-        row = {
-            "Company": company,
-            "Year": year,
-            "File": pdf,
-            "Processed_On": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "Status": "OK",
-        }
-
-        for j, key in enumerate(keys):
-            idx = int(np.argmax(sims[:, j]))
-            score = 0
-            if sims[idx, j] >= SIM_MENTION:
-                score = 1
-                if sims[idx, j] >= SIM_HIGH or has_evidence(sentences, idx, WINDOW):
-                    score = 2
-            row[key] = score
-
-        row["Total_Score"] = sum(row[k] for k in keys)
-        rows.append(row)
-
-    df = pd.DataFrame(rows)
-
-    if os.path.exists(EXCEL_MAIN):
-        backup = EXCEL_MAIN.replace(".xlsx", f"_backup_{datetime.now():%Y%m%d_%H%M%S}.xlsx")
-        shutil.copy2(EXCEL_MAIN, backup)
-
-    master_df = pd.concat([master_df, df], ignore_index=True)
-    master_df.drop_duplicates(subset=["File"], keep="last", inplace=True)
-    master_df.to_excel(EXCEL_MAIN, index=False, engine="openpyxl")
-
-    log(f"💾 Saved {len(df)} rows")
-
-    remaining = remaining[BATCH_SIZE:]
-
-    if remaining and not ask_continue(len(remaining)):
-        log("⏹ User stopped safely")
-        break
-
+try:
+    while remaining:
+        # lease the batch so other scorers on this store skip it
+        batch = store.claim(remaining, limit=BATCH_SIZE)
+        if not batch:
+            log("🔒 Remaining PDFs are claimed by other scorers")
+            break
+
+        for pdf in tqdm(batch, desc="Processing PDFs"):
+            row = score_pdf(
+                SOURCES[pdf] if CATALOG_VIEW else os.path.join(PDF_FOLDER, pdf),
+                model,
+                iso_matrix,
+                keys,
+                sentence_store,
+                sim_mention=SIM_MENTION,
+                sim_high=SIM_HIGH,
+                window=WINDOW,
+                fingerprint=FINGERPRINT,
+                registry=registry,
+            )
+            if row["Status"] == "PDF_READ_FAILED":
+                log(f"❌ PDF FAILED: {pdf}")
+            journal.append(row)
+            store.renew()  # keep the lease alive through long batches
+
+        log(f"💾 Saved {journal.compact(store, folder=SOURCES)} rows")
+
+        if snapshots.snapshot(store):
+            snapshots.prune()
+
+        _, suspects = drift.refresh(store)
+        if len(suspects):
+            log(f"📈 Score drift: {len(suspects)} new flag(s), {len(drift.queued())} PDF(s) queued for re-extraction")
+
+        taken = set(batch)
+        remaining = [f for f in remaining if f not in taken]
+
+        if remaining and not ask_continue(len(remaining)):
+            log("⏹ User stopped safely")
+            break
+finally:
+    # unscored leftovers (failed / stopped batches) go back to the pool
+    store.release()
+
+if EXPORT_EXCEL and len(store):
+    log(f"📤 Exported {store.export_excel(EXCEL_MAIN)} rows to Excel")
+
+journal.close()
 log("🎉 COMPLETE — SCRIPT FINISHED SAFELY")
@@ -0,0 +1,62 @@
+"""
+⚡ ISO27001 LONG-FORMAT RESULTS ⚡
+--------------------------------
+Convert the wide results (store or workbook) into typed long tables and
+rebuild any wide layout from them on demand.
+
+  python "Long results.py"                                   # build + size report
+  python "Long results.py" --summary Year                    # mean score per year × domain
+  python "Long results.py" --wide og --out "ISO OG view.xlsx"
+"""
+
+import os
+import argparse
+
+from long_schema import LongResults, LAYOUTS
+from results_store import load_results, store_path_for
+
+# =========================
+# CONFIG
+# =========================
+WORK_DIR = r"C:\Users\lenin\OneDrive\Desktop\BSE_Scraper"
+EXCEL_MAIN = os.path.join(WORK_DIR, "ISO Data Collection.xlsx")
+LONG_DIR = os.path.join(WORK_DIR, "iso_long")
+
+parser = argparse.ArgumentParser(description="Long-format ISO results")
+parser.add_argument("--source", default=store_path_for(EXCEL_MAIN), help="Results store (.sqlite) or workbook")
+parser.add_argument("--dir", default=LONG_DIR, help="Folder for the long tables")
+parser.add_argument("--rebuild", action="store_true", help="Rebuild the long tables from --source")
+parser.add_argument("--summary", metavar="COLUMN", help="Mean score per COLUMN × domain")
+parser.add_argument("--wide", choices=LAYOUTS, help="Rebuild a wide sheet in this layout")
+parser.add_argument("--out", help="Workbook for --wide")
+args = parser.parse_args()
+
+# =========================
+# BUILD / LOAD
+# =========================
+if args.rebuild or not os.path.isdir(args.dir):
+    print(f"[⚡] Reading {args.source}")
+    wide = load_results(args.source)
+    long = LongResults.from_wide(wide)
+    long.save(args.dir)
+
+    wide_mem = int(wide.memory_usage(deep=True).sum())
+    long_mem = sum(long.nbytes().values())
+    print(f"[⚡] {len(long.documents)} reports, {len(long.scores)} domain scores, {len(long.evidence)} evidence rows")
+    print(f"[⚡] Memory :: wide {wide_mem / 1e6:.1f} MB → long {long_mem / 1e6:.1f} MB")
+    if os.path.exists(args.source):
+        print(f"[⚡] Disk   :: source {os.path.getsize(args.source) / 1e6:.1f} MB → long {long.disk_bytes(args.dir) / 1e6:.1f} MB")
+else:
+    long = LongResults.load(args.dir)
+    print(f"[⚡] Loaded long tables :: {len(long.documents)} reports")
+
+# =========================
+# QUERIES / VIEWS
+# =========================
+if args.summary:
+    print(long.domain_summary(args.summary).round(2).to_string())
+
+if args.wide:
+    out = args.out or os.path.join(WORK_DIR, f"ISO Data Collection ({args.wide}).xlsx")
+    long.to_wide(args.wide).to_excel(out, index=False)
+    print(f"[💾] {args.wide} sheet written to {out}")
@@ -0,0 +1,38 @@
+"""
+⚡ ISO27001 RESULTS MERGE ⚡
+--------------------------
+Fold results stores filled on other machines (Colab, Kaggle, a second PC)
+into the main store. Safe to re-run: rows already merged are skipped and
+an older row never overwrites a newer one for the same File.
+
+  python "Merge results.py" "Downloads/ISO Data Collection.sqlite"
+  python "Merge results.py" colab.sqlite kaggle.sqlite --export
+"""
+
+import argparse
+
+from results_store import ResultsStore, store_path_for
+
+# =========================
+# CONFIG
+# =========================
+EXCEL_MAIN = r"C:\Users\lenin\OneDrive\Desktop\BSE_Scraper\ISO Data Collection.xlsx"
+
+parser = argparse.ArgumentParser(description="Merge results stores into the main store")
+parser.add_argument("sources", nargs="+", help=".sqlite stores to merge")
+parser.add_argument("--store", default=store_path_for(EXCEL_MAIN), help="Main results store")
+parser.add_argument("--export", action="store_true", help="Refresh the main workbook afterwards")
+args = parser.parse_args()
+
+store = ResultsStore(args.store)
+print(f"[⚡] Main store :: {len(store)} files")
+
+for src in args.sources:
+    print(f"[⚡] {src} → merged {store.merge_from(src)} rows")
+
+print(f"[💾] Main store :: {len(store)} files")
+
+if args.export:
+    print(f"[📤] Exported {store.export_excel(EXCEL_MAIN)} rows to {EXCEL_MAIN}")
+
+store.close()
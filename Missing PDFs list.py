@@ -1,66 +1,102 @@
-import pandas as pd
+"""
+⚡ MISSING COMPANY-YEARS ⚡
+-------------------------
+Company × year coverage from the results (store or Excel), built once
+into a bitmap (coverage.Coverage) and cached next to the CSV. The cache
+carries the store watermark (max_seq; Excel mtime without a store) and is
+rebuilt as soon as new results have been committed.
+
+  python "Missing PDFs list.py"                          # full report + CSV
+  python "Missing PDFs list.py" --start 2018 --end 2022  # other window
+  python "Missing PDFs list.py" --complete 2019 2023     # who is complete (cached)
+"""
+
+import os
+import argparse
+
+from corpus_index import CorpusIndex
+from coverage import Coverage
+from results_store import ResultsStore, store_path_for
 
 # =========================
 # CONFIG
 # =========================
 EXCEL_PATH = r"C:\Users\lenin\OneDrive\Desktop\BSE_Scraper\ISO Data Collection.xlsx"
+PDF_FOLDER = r"C:\Users\lenin\OneDrive\Desktop\BSE_Scraper\Company_PDF"
 OUTPUT_CSV = r"C:\Users\lenin\OneDrive\Desktop\BSE_Scraper\missing_company_years.csv"
+COVERAGE_CACHE = os.path.splitext(OUTPUT_CSV)[0] + ".coverage.npz"
 
-EXPECTED_YEARS = set(str(y) for y in range(2016, 2026))
+EXPECTED_YEARS = (2016, 2025)
 
-# =========================
-# LOAD DATA
-# =========================
-df = pd.read_excel(EXCEL_PATH, dtype=str)
+parser = argparse.ArgumentParser(description="Company × year coverage report")
+parser.add_argument("--start", type=int, default=EXPECTED_YEARS[0])
+parser.add_argument("--end", type=int, default=EXPECTED_YEARS[1])
+parser.add_argument("--complete", nargs=2, type=int, metavar=("START", "END"),
+                    help="List companies complete for this window from the cached matrix")
+args = parser.parse_args()
+
+def results_watermark():
+    """Where the results stand now: store max_seq, else the Excel mtime."""
+    if os.path.exists(store_path_for(EXCEL_PATH)):
+        store = ResultsStore(store_path_for(EXCEL_PATH))
+        seq = store.max_seq()
+        store.close()
+        return f"store:{seq}"
+    if os.path.exists(EXCEL_PATH):
+        return f"excel:{os.stat(EXCEL_PATH).st_mtime_ns}"
+    return "none"
 
-# Normalize
-df["Company"] = df["Company"].str.strip()
-df["Year"] = df["Year"].str.strip()
+def show_complete(cov):
+    complete = cov.complete_for(*args.complete)
+    print(f"Companies complete for {args.complete[0]}–{args.complete[1]} : {len(complete)}")
+    for company in complete:
+        print(f"   {company}")
+    raise SystemExit(0)
 
 # =========================
-# ANALYSIS
+# QUICK QUERY (NO RESCAN)
 # =========================
-results = []
-
-companies = sorted(df["Company"].dropna().unique())
+WATERMARK = results_watermark()
+if args.complete and os.path.exists(COVERAGE_CACHE):
+    cov = Coverage.load(COVERAGE_CACHE)
+    if cov.watermark == WATERMARK:
+        show_complete(cov)
+    print("♻️ Results changed since the coverage cache was built — rebuilding")
 
-for company in companies:
-    years_present = set(
-        df.loc[df["Company"] == company, "Year"]
-        .dropna()
-        .unique()
-    )
-
-    missing_years = sorted(EXPECTED_YEARS - years_present)
+# =========================
+# LOAD DATA (SHARED INDEX, ONE RESULTS READ)
+# =========================
+index = CorpusIndex(PDF_FOLDER, EXCEL_PATH, hash_files=False)
+cov = Coverage.from_frame(index.stored, expected=(args.start, args.end))
+index.close()
+cov.save(COVERAGE_CACHE, watermark=WATERMARK)
 
-    if missing_years:
-        results.append({
-            "Company": company,
-            "Years_Present": ", ".join(sorted(years_present)),
-            "Missing_Years": ", ".join(missing_years),
-            "Missing_Count": len(missing_years)
-        })
+if args.complete:
+    show_complete(cov)
 
 # =========================
 # OUTPUT
 # =========================
-missing_df = pd.DataFrame(results).sort_values(
-    by=["Missing_Count", "Company"],
-    ascending=[False, True]
-)
-
+missing_df = cov.missing_report(args.start, args.end)
 missing_df.to_csv(OUTPUT_CSV, index=False)
 
+tiers = cov.to_frame(args.start, args.end)["Tier"].value_counts()
+
 # =========================
 # SUMMARY
 # =========================
 print("========== ISO DATA AUDIT ==========")
-print(f"Total companies found        : {len(companies)}")
+print(f"Total companies found        : {len(cov.companies)}")
 print(f"Companies with missing PDFs  : {len(missing_df)}")
 print(f"Total missing PDFs detected : {missing_df['Missing_Count'].sum()}")
+print(f"Companies with gaps          : {int(cov.gaps().any(axis=1).sum())}")
+print("-----------------------------------")
+print("Completeness tiers:")
+for tier, n in tiers.items():
+    print(f"   {tier:<10} {n}")
 print("-----------------------------------")
 print("Top 10 companies with most missing years:")
-print(missing_df.head(10).to_string(index=False))
+print(missing_df.head(10)[["Company", "Years_Present", "Missing_Years", "Missing_Count"]].to_string(index=False))
 print("-----------------------------------")
 print(f"Detailed report saved to:\n{OUTPUT_CSV}")
 print("===================================")
@@ -1,7 +1,10 @@
 import os
-import shutil
+import argparse
 import pandas as pd
 
+from corpus_index import CorpusIndex
+from bulk_ops import Plan, add_arguments, execute, ops_journal_path_for
+
 # =========================
 # CONFIG
 # =========================
@@ -9,48 +12,57 @@ MISSING_CSV = r"C:\Users\lenin\OneDrive\Desktop\BSE_Scraper\missing_company_year
 SOURCE_ROOT = r"C:\Users\lenin\OneDrive\Desktop\NSE Scraper"
 DEST_FOLDER = r"C:\Users\lenin\OneDrive\Desktop\Missing_PDFs_FLAT2"
 
+parser = argparse.ArgumentParser(description="Copy missing company-year PDFs into one flat folder")
+add_arguments(parser)
+args = parser.parse_args()
+
 os.makedirs(DEST_FOLDER, exist_ok=True)
 
+# =========================
+# SOURCE INDEX (ONE RECURSIVE SCAN)
+# =========================
+source = CorpusIndex(SOURCE_ROOT, hash_files=False, recursive=True)
+source.refresh()
+available = {rel.lower(): rel for rel in source.files()["rel_path"]}
+folders = {os.path.dirname(rel).lower() for rel in available}
+source.close()
+
 # =========================
 # LOAD MISSING LIST
 # =========================
 df = pd.read_csv(MISSING_CSV)
 
-copied = 0
 not_found = []
 
 # =========================
-# PROCESS
+# PLAN
 # =========================
-for _, row in df.iterrows():
-    company = row["Company"].strip()
-    years = [y.strip() for y in row["Missing_Years"].split(",")]
-
-    company_folder = os.path.join(SOURCE_ROOT, company)
+def plan_copies():
+    plan = Plan()
+    for company, missing in zip(df["Company"].str.strip(), df["Missing_Years"].fillna("")):
+        years = [y.strip() for y in missing.split(",") if y.strip()]
 
-    if not os.path.isdir(company_folder):
-        print(f"[WARN] Company folder not found: {company}")
-        not_found.append((company, "ALL"))
-        continue
+        if company.lower() not in folders and not os.path.isdir(os.path.join(SOURCE_ROOT, company)):
+            print(f"[WARN] Company folder not found: {company}")
+            not_found.append((company, "ALL"))
+            continue
 
-    for year in years:
-        pdf_name = f"{year}_{company}.pdf"
-        src_pdf = os.path.join(company_folder, pdf_name)
-        dst_pdf = os.path.join(DEST_FOLDER, pdf_name)
+        for year in years:
+            pdf_name = f"{year}_{company}.pdf"
+            rel = available.get(os.path.join(company, pdf_name).lower())
 
-        if os.path.exists(src_pdf):
-            shutil.copy2(src_pdf, dst_pdf)
-            copied += 1
-            print(f"[OK] Copied: {pdf_name}")
-        else:
-            print(f"[MISS] Not found: {pdf_name}")
-            not_found.append((company, year))
+            if rel is not None:
+                plan.copy(os.path.join(SOURCE_ROOT, rel), os.path.join(DEST_FOLDER, pdf_name))
+            else:
+                print(f"[MISS] Not found: {pdf_name}")
+                not_found.append((company, year))
+    return plan
 
 # =========================
-# SUMMARY
+# PROCESS (PARALLEL, JOURNALED)
 # =========================
 print("\n========== SUMMARY ==========")
-print(f"Total PDFs copied      : {copied}")
+execute(plan_copies, ops_journal_path_for("Missing pdf mover", DEST_FOLDER), args)
 print(f"PDFs not found         : {len(not_found)}")
 
 if not_found:
@@ -7,16 +7,18 @@ import re
 import time
 import fitz  # PyMuPDF
 import torch
-import pandas as pd
-import numpy as np
 from tqdm import tqdm
 from datetime import datetime
 from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 import nltk
 from nltk.tokenize import sent_tokenize
 from openpyxl.utils.exceptions import IllegalCharacterError
 
+from iso_scoring import normalize_rows, evidence_hits, score_document
+from results_store import open_store
+from company_registry import split_name, scorer_registry, company_code
+from excel_export import sanitize_frame, write_excel
+
 # =========================
 # CONFIG
 # =========================
@@ -30,6 +32,7 @@ SIM_HIGH = 0.72
 WINDOW = 1
 MAX_SENTENCES = 1500
 EXCEL_WRITE_RETRIES = 3
+EXCEL_CONTROL_RE = r"[\x00-\x08\x0B-\x1F]"  # stripped from every string cell
 
 # =========================
 # DEVICE (SAFE)
@@ -105,11 +108,6 @@ def log(msg):
     with open(LOG_FILE, "a", encoding="utf-8") as f:
         f.write(f"{ts} {msg}\n")
 
-def clean_excel_string(val):
-    if isinstance(val, str):
-        return re.sub(r"[\x00-\x08\x0B-\x1F]", "", val)
-    return val
-
 def extract_text(pdf_path):
     try:
         with fitz.open(pdf_path) as doc:
@@ -121,35 +119,24 @@ def split_sentences(text):
     text = re.sub(r"\n+", " ", text)
     return [s for s in sent_tokenize(text) if len(s.strip()) > 10][:MAX_SENTENCES]
 
-def has_evidence(sentences, idx):
-    keywords = ["implemented","established","maintained","audit","certified",
-                "monitored","trained","reviewed","tested","assessed"]
-    lo, hi = max(0, idx-WINDOW), min(len(sentences)-1, idx+WINDOW)
-    return any(any(k in sentences[i].lower() for k in keywords) for i in range(lo, hi+1))
-
 # =========================
 # MODEL
 # =========================
 log("Loading embedding model")
 model = SentenceTransformer("all-mpnet-base-v2", device=device)
-iso_embeddings = model.encode(list(iso_descriptions.values()), show_progress_bar=False)
+iso_matrix = normalize_rows(model.encode(list(iso_descriptions.values()), show_progress_bar=False))
 log("Model ready")
 
 # =========================
-# LOAD EXCEL
+# RESULTS STORE / RESUME
 # =========================
-if os.path.exists(EXCEL_PATH):
-    df_existing = pd.read_excel(EXCEL_PATH)
-    processed = set(df_existing["File"].astype(str))
-else:
-    df_existing = pd.DataFrame()
-    processed = set()
+store = open_store(EXCEL_PATH)
+registry = scorer_registry()  # Company → registry code, when the company list exists
 
 # =========================
 # SELECT PDF BATCH
 # =========================
-all_pdfs = sorted([f for f in os.listdir(PDF_FOLDER) if f.lower().endswith(".pdf")])
-pending = [f for f in all_pdfs if f not in processed][:BATCH_SIZE]
+pending = sorted(store.pending(PDF_FOLDER))[:BATCH_SIZE]
 
 log(f"Processing {len(pending)} PDFs")
 
@@ -172,21 +159,19 @@ for i, pdf in enumerate(tqdm(pending, desc="Scoring PDFs")):
         continue
 
     sent_emb = model.encode(sentences, show_progress_bar=False)
-    sim = cosine_similarity(sent_emb, iso_embeddings)
+    result = score_document(sent_emb, iso_matrix, hits=evidence_hits(sentences), window=WINDOW,
+                            sim_mention=SIM_MENTION, sim_high=SIM_HIGH)
 
-    base, year = os.path.splitext(pdf)[0].split("_",1) if "_" in pdf else (pdf,"")
-    row = {"Company": base, "Year": year, "File": pdf}
+    year, base = split_name(pdf)
+    year = year or ""
+    row = {"Company": base, "Code": company_code(registry, base), "Year": year, "File": pdf}
 
     total = 0
     for j, dom in enumerate(ISO_KEYS):
-        idx = int(np.argmax(sim[:,j]))
-        score = 0
-        if sim[idx,j] >= SIM_MENTION:
-            score = 1
-            if sim[idx,j] >= SIM_HIGH or has_evidence(sentences, idx):
-                score = 2
+        idx = int(result.best_idx[j])
+        score = int(result.scores[j])
         row[f"{dom}__score"] = score
-        row[f"{dom}__sim"] = round(float(sim[idx,j]),4)
+        row[f"{dom}__sim"] = round(float(result.best_sim[j]),4)
         row[f"{dom}__snippet"] = sentences[idx][:200]
         row[f"{dom}__reason"] = "semantic"
         total += score
@@ -199,15 +184,18 @@ for i, pdf in enumerate(tqdm(pending, desc="Scoring PDFs")):
 # =========================
 # SAVE (SAFE)
 # =========================
-df_new = pd.DataFrame(rows).applymap(clean_excel_string)
-df_final = pd.concat([df_existing, df_new], ignore_index=True)
+store.commit(rows, folder=PDF_FOLDER)
+log(f"Committed {len(rows)} rows to results store")
+
+# workbook for download from the VM — one write per run, no re-read
+df_final = sanitize_frame(store.to_frame(), pattern=EXCEL_CONTROL_RE)
 
 for attempt in range(EXCEL_WRITE_RETRIES):
     try:
-        df_final.to_excel(EXCEL_PATH, index=False)
+        write_excel(df_final, EXCEL_PATH, sanitize=False)
         log("Excel saved successfully")
         break
-    except IllegalCharacterError as e:
+    except (IllegalCharacterError, PermissionError) as e:
         log(f"[WARN] Excel write failed (attempt {attempt+1})")
         time.sleep(2)
 else:
@@ -7,16 +7,18 @@ import re
 import time
 import fitz
 import torch
-import pandas as pd
-import numpy as np
 from tqdm import tqdm
 from datetime import datetime
 from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 import nltk
 from nltk.tokenize import sent_tokenize
 from openpyxl.utils.exceptions import IllegalCharacterError
 
+from iso_scoring import normalize_rows, evidence_hits, score_document
+from results_store import open_store
+from company_registry import split_name, scorer_registry, company_code
+from excel_export import sanitize_frame, write_excel
+
 # =========================
 # PATHS (KAGGLE)
 # =========================
@@ -30,6 +32,7 @@ SIM_HIGH = 0.72
 WINDOW = 1
 MAX_SENTENCES = 1500
 EXCEL_WRITE_RETRIES = 3
+EXCEL_CONTROL_RE = r"[\x00-\x08\x0B-\x1F]"  # stripped from every string cell
 
 # =========================
 # DEVICE (AUTO)
@@ -99,11 +102,6 @@ ISO_KEYS = list(iso_descriptions.keys())
 # =========================
 # HELPERS
 # =========================
-def clean_excel(val):
-    if isinstance(val, str):
-        return re.sub(r"[\x00-\x08\x0B-\x1F]", "", val)
-    return val
-
 def extract_text(pdf):
     try:
         with fitz.open(pdf) as doc:
@@ -115,32 +113,21 @@ def split_sentences(text):
     text = re.sub(r"\n+", " ", text)
     return [s for s in sent_tokenize(text) if len(s.strip()) > 10][:MAX_SENTENCES]
 
-def has_evidence(sents, idx):
-    words = ["implemented","established","maintained","audit","certified",
-             "monitored","trained","reviewed","tested","assessed"]
-    lo, hi = max(0, idx-WINDOW), min(len(sents)-1, idx+WINDOW)
-    return any(any(w in sents[i].lower() for w in words) for i in range(lo, hi+1))
-
 # =========================
 # MODEL
 # =========================
 print("[⚡] Loading embedding model")
 model = SentenceTransformer("all-mpnet-base-v2", device=device)
-iso_emb = model.encode(list(iso_descriptions.values()), show_progress_bar=False)
+iso_matrix = normalize_rows(model.encode(list(iso_descriptions.values()), show_progress_bar=False))
 print("[⚡] Model ready")
 
 # =========================
-# LOAD EXCEL / RESUME
+# RESULTS STORE / RESUME
 # =========================
-if os.path.exists(EXCEL_PATH):
-    df_existing = pd.read_excel(EXCEL_PATH)
-    processed = set(df_existing["File"].astype(str))
-else:
-    df_existing = pd.DataFrame()
-    processed = set()
+store = open_store(EXCEL_PATH)
+registry = scorer_registry()  # Company → registry code, when the company list exists
 
-all_pdfs = sorted(f for f in os.listdir(PDF_FOLDER) if f.lower().endswith(".pdf"))
-pending = [f for f in all_pdfs if f not in processed][:BATCH_SIZE]
+pending = sorted(store.pending(PDF_FOLDER))[:BATCH_SIZE]
 
 print(f"[⚡] Processing {len(pending)} PDFs")
 
@@ -160,21 +147,19 @@ for i, pdf in enumerate(tqdm(pending, desc="Scoring PDFs")):
         continue
 
     emb = model.encode(sents, show_progress_bar=False)
-    sim = cosine_similarity(emb, iso_emb)
+    result = score_document(emb, iso_matrix, hits=evidence_hits(sents), window=WINDOW,
+                            sim_mention=SIM_MENTION, sim_high=SIM_HIGH)
 
-    base, year = os.path.splitext(pdf)[0].split("_",1) if "_" in pdf else (pdf,"")
-    row = {"Company": base, "Year": year, "File": pdf}
+    year, base = split_name(pdf)
+    year = year or ""
+    row = {"Company": base, "Code": company_code(registry, base), "Year": year, "File": pdf}
 
     total = 0
     for j, k in enumerate(ISO_KEYS):
-        idx = int(np.argmax(sim[:,j]))
-        score = 0
-        if sim[idx,j] >= SIM_MENTION:
-            score = 1
-            if sim[idx,j] >= SIM_HIGH or has_evidence(sents, idx):
-                score = 2
+        idx = int(result.best_idx[j])
+        score = int(result.scores[j])
         row[f"{k}__score"] = score
-        row[f"{k}__sim"] = round(float(sim[idx,j]),4)
+        row[f"{k}__sim"] = round(float(result.best_sim[j]),4)
         row[f"{k}__snippet"] = sents[idx][:200]
         row[f"{k}__reason"] = "semantic"
         total += score
@@ -187,14 +172,18 @@ for i, pdf in enumerate(tqdm(pending, desc="Scoring PDFs")):
 # =========================
 # SAVE SAFELY
 # =========================
-df_new = pd.DataFrame(rows).applymap(clean_excel)
-df_final = pd.concat([df_existing, df_new], ignore_index=True)
+store.commit(rows, folder=PDF_FOLDER)
+print(f"[⚡] Committed {len(rows)} rows to results store")
+
+# workbook for download from the VM — one write per run, no re-read
+df_final = sanitize_frame(store.to_frame(), pattern=EXCEL_CONTROL_RE)
 
 for _ in range(EXCEL_WRITE_RETRIES):
     try:
-        df_final.to_excel(EXCEL_PATH, index=False)
+        write_excel(df_final, EXCEL_PATH, sanitize=False)
         break
-    except IllegalCharacterError:
+    except (IllegalCharacterError, PermissionError):
         time.sleep(2)
 
+print(f"[⚡] Download {os.path.basename(store.path)} and run \"Merge results.py\" to fold this run into the main store")
 print("[⚡] SAFE TO CLOSE — RESUME READY")
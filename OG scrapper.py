@@ -8,16 +8,20 @@ import re
 import time
 import shutil
 import fitz  # PyMuPDF
-import pandas as pd
-import numpy as np
 from tqdm import tqdm
 from datetime import datetime
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
-import nltk
 from nltk.tokenize import sent_tokenize
 import torch
 
+from iso_scoring import evidence_hits, score_document
+from warm_start import MODEL_NAME, ensure_nltk, domain_matrix, get_encoder
+from evidence_index import SentenceStore
+from results_store import open_store, store_path_for
+from excel_export import sanitize_frame, write_excel
+from provenance import OG_SCRAPPER, scoring_config, fingerprint, stamp
+from journal import WorkerJournal
+from company_registry import split_name, scorer_registry, company_code
+
 # =========================
 # CONFIG
 # =========================
@@ -26,6 +30,7 @@ EXCEL_PATH = r"C:\Users\lenin\OneDrive\Desktop\BSE_Scraper\ISO Data Collection.x
 CSV_SHADOW = EXCEL_PATH.replace(".xlsx", ".csv")
 LOG_FILE = r"C:\Users\lenin\OneDrive\Desktop\BSE_Scraper\iso_log.txt"
 QUARANTINE = r"C:\Users\lenin\OneDrive\Desktop\BSE_Scraper\quarantine"
+SENTENCE_STORE = r"C:\Users\lenin\OneDrive\Desktop\BSE_Scraper\sentence_store"
 
 BATCH_SIZE = 1000
 MAX_SENTENCES = 1500
@@ -34,6 +39,9 @@ SIM_MENTION = 0.60
 SIM_HIGH = 0.72
 WINDOW = 1
 
+# the store is the system of record; run "Export results.py" for the workbook
+EXPORT_EXCEL = False
+
 os.makedirs(QUARANTINE, exist_ok=True)
 
 # =========================
@@ -48,10 +56,7 @@ def log(msg):
 # =========================
 # NLTK
 # =========================
-try:
-    nltk.data.find("tokenizers/punkt")
-except LookupError:
-    nltk.download("punkt")
+ensure_nltk("punkt")
 
 # =========================
 # ISO DESCRIPTIONS (UNCHANGED)
@@ -96,22 +101,14 @@ device = "cuda" if torch.cuda.is_available() else "cpu"
 torch.set_grad_enabled(False)
 
 log(f"Loading embedding model ({device.upper()})")
-model = SentenceTransformer("all-mpnet-base-v2", device=device)
-iso_embeddings = model.encode(list(iso_descriptions.values()), show_progress_bar=False)
+model = get_encoder(MODEL_NAME, device=device, local_files_only=False)
+iso_matrix = domain_matrix(iso_descriptions.values(), model)
+sentence_store = SentenceStore(SENTENCE_STORE)
 log("Model ready")
 
 # =========================
 # SAFETY HELPERS
 # =========================
-def excel_safe(val):
-    if not isinstance(val, str):
-        return val
-    return re.sub(
-        r"[\x00-\x08\x0B\x0C\x0E-\x1F\uD800-\uDFFF\uFFFE\uFFFF]",
-        "",
-        val
-    )
-
 def quarantine_pdf(pdf, reason):
     try:
         shutil.move(
@@ -140,114 +137,130 @@ def split_sentences(txt):
     txt = re.sub(r"\n+", " ", txt)
     return [s for s in sent_tokenize(txt) if len(s.strip()) > 10][:MAX_SENTENCES]
 
-def has_evidence(sents, idx):
-    words = [
-        "implemented", "established", "maintained",
-        "audit", "certified", "monitored",
-        "trained", "reviewed"
-    ]
-    lo, hi = max(0, idx - WINDOW), min(len(sents) - 1, idx + WINDOW)
-    return any(any(w in sents[i].lower() for w in words) for i in range(lo, hi + 1))
+EVIDENCE_WORDS = [
+    "implemented", "established", "maintained",
+    "audit", "certified", "monitored",
+    "trained", "reviewed"
+]
 
 # =========================
 # LOAD EXISTING DATA (RESUME)
 # =========================
-if os.path.exists(EXCEL_PATH):
-    df_existing = pd.read_excel(EXCEL_PATH)
-    processed = set(df_existing["File"].astype(str))
-else:
-    df_existing = pd.DataFrame()
-    processed = set()
+store = open_store(EXCEL_PATH)
+registry = scorer_registry()  # Company → registry code, when the company list exists
+
+# rows scored before a crash are still in the (dead worker's) journal
+journal = WorkerJournal(store_path_for(EXCEL_PATH))
+recovered = journal.recover(store)
+if recovered:
+    log(f"Recovered {recovered} rows from journal")
 
-pdfs = [f for f in os.listdir(PDF_FOLDER) if f.lower().endswith(".pdf")]
-pending = [p for p in pdfs if p not in processed][:BATCH_SIZE]
+# processed-file index — no rows are read to find pending work;
+# claimed PDFs are leased to this run so parallel workers never overlap
+pending = store.claim(store.pending(PDF_FOLDER), limit=BATCH_SIZE)
 
 log(f"Processing {len(pending)} PDFs")
 
+# what produced these rows — "Recompute stale.py" reprocesses on change
+config = scoring_config(
+    iso_descriptions,
+    {"sim_mention": SIM_MENTION, "sim_high": SIM_HIGH, "window": WINDOW,
+     "max_sentences": MAX_SENTENCES, "min_sentence_chars": 10},
+    EVIDENCE_WORDS,
+    MODEL_NAME,
+    producer=OG_SCRAPPER,
+)
+config_fp = store.register_config(fingerprint(config), config)
+log(f"Config fingerprint {config_fp}")
+
 # =========================
-# MAIN LOOP
+# MAIN LOOP (EVERY ROW JOURNALED)
 # =========================
-rows = []
-
-for pdf in tqdm(pending, desc="Scoring PDFs"):
-    base = os.path.splitext(pdf)[0]
-    try:
-        year, company = base.split("_", 1)
-    except ValueError:
-        year, company = "", base
-
-    path = os.path.join(PDF_FOLDER, pdf)
-    text = extract_text(path)
-
-    if not text:
-        quarantine_pdf(pdf, "NO_TEXT")
-        continue
+saved = 0
 
-    sentences = split_sentences(text)
-    if not sentences:
-        quarantine_pdf(pdf, "NO_SENTENCES")
-        continue
-
-    try:
-        sent_emb = model.encode(sentences, batch_size=32, show_progress_bar=False)
-    except Exception:
-        quarantine_pdf(pdf, "EMBEDDING_FAIL")
-        continue
+try:
+    for pdf in tqdm(pending, desc="Scoring PDFs"):
+        year, company = split_name(pdf)
+        year = year or ""
+
+        path = os.path.join(PDF_FOLDER, pdf)
+        text = extract_text(path)
+
+        if not text:
+            quarantine_pdf(pdf, "NO_TEXT")
+            continue
+
+        sentences = split_sentences(text)
+        if not sentences:
+            quarantine_pdf(pdf, "NO_SENTENCES")
+            continue
+
+        try:
+            sent_emb = model.encode(sentences, batch_size=32, show_progress_bar=False)
+        except Exception:
+            quarantine_pdf(pdf, "EMBEDDING_FAIL")
+            continue
+
+        sentence_store.save(pdf, company, year, sentences, sent_emb)
+
+        result = score_document(
+            sent_emb, iso_matrix,
+            hits=evidence_hits(sentences, EVIDENCE_WORDS),
+            window=WINDOW, sim_mention=SIM_MENTION, sim_high=SIM_HIGH
+        )
 
-    sims = cosine_similarity(sent_emb, iso_embeddings)
+        row = {
+            "Company": company,
+            "Code": company_code(registry, company),
+            "Year": year,
+            "File": pdf
+        }
 
-    row = {
-        "Company": company,
-        "Year": year,
-        "File": pdf
-    }
+        total = 0
 
-    total = 0
+        for j, domain in enumerate(iso_keys):
+            idx = int(result.best_idx[j])
+            sim = float(result.best_sim[j])
+            snippet = sentences[idx]
 
-    for j, domain in enumerate(iso_keys):
-        idx = int(np.argmax(sims[:, j]))
-        sim = float(sims[idx, j])
-        snippet = sentences[idx]
+            score = int(result.scores[j])
+            reason = "scored" if score else "no_match"
 
-        score = 0
-        reason = "no_match"
+            # WRITE BOTH SCHEMA LAYERS
+            row[domain] = score
+            row[f"{domain}__score"] = score
+            row[f"{domain}__sim"] = round(sim, 4)
+            row[f"{domain}__snippet"] = snippet
+            row[f"{domain}__reason"] = reason
 
-        if sim >= SIM_MENTION:
-            score = 1
-            reason = "scored"
-            if sim >= SIM_HIGH or has_evidence(sentences, idx):
-                score = 2
+            total += score
 
-        # WRITE BOTH SCHEMA LAYERS
-        row[domain] = score
-        row[f"{domain}__score"] = score
-        row[f"{domain}__sim"] = round(sim, 4)
-        row[f"{domain}__snippet"] = snippet
-        row[f"{domain}__reason"] = reason
+        row["Total_Score"] = total
+        row["Processed_On"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        row["Status"] = "OK"
+        stamp(row, config_fp)
 
-        total += score
+        journal.append(row)
+        store.renew()  # keep the lease alive through long batches
+        saved += 1
 
-    row["Total_Score"] = total
-    row["Processed_On"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    row["Status"] = "OK"
+    # =========================
+    # COMMIT (APPEND-ONLY)
+    # =========================
+    journal.compact(store, folder=PDF_FOLDER)
+    journal.close()
+finally:
+    # quarantined / unscored PDFs go back to the pool
+    store.release()
 
-    rows.append(row)
+log(f"Saved {saved} rows safely")
 
 # =========================
-# SAFE SAVE (ATOMIC)
+# OPTIONAL EXPORT
 # =========================
-df_new = pd.DataFrame(rows)
-
-for col in df_new.columns:
-    df_new[col] = df_new[col].map(excel_safe)
-
-df_final = pd.concat([df_existing, df_new], ignore_index=True)
-
-tmp_path = EXCEL_PATH.replace(".xlsx", "_TMP.xlsx")
-df_final.to_excel(tmp_path, index=False)
-os.replace(tmp_path, EXCEL_PATH)
-
-df_final.to_csv(CSV_SHADOW, index=False)
+if EXPORT_EXCEL:
+    df_final = sanitize_frame(store.to_frame())
+    write_excel(df_final, EXCEL_PATH, sanitize=False)
+    df_final.to_csv(CSV_SHADOW, index=False)
 
-log(f"Saved {len(df_new)} rows safely")
 log("SAFE TO CLOSE — RESUME READY")
@@ -4,6 +4,9 @@ import pandas as pd
 from datetime import datetime
 from colorama import init
 
+from corpus_index import CorpusIndex
+from results_store import store_path_for
+
 # =========================
 # ANSI / HACKER CONSOLE
 # =========================
@@ -35,12 +38,6 @@ OUTPUT_REPORT = r"C:\Users\lenin\OneDrive\Desktop\BSE_Scraper\ISO_Unprocessed_Fo
 
 FAILED_STATUSES = {"PDF_READ_FAILED", "NO_TEXT"}
 
-# =========================
-# HELPERS
-# =========================
-def normalize(name: str) -> str:
-    return os.path.basename(str(name)).strip().lower()
-
 # =========================
 # ENTRY POINT
 # =========================
@@ -48,7 +45,7 @@ phase("booting forensic subsystem")
 
 hacker("Initializing read-only diagnostics", "BOOT", GREEN)
 
-if not os.path.exists(EXCEL_MAIN):
+if not os.path.exists(EXCEL_MAIN) and not os.path.exists(store_path_for(EXCEL_MAIN)):
     hacker("Master Excel not found — aborting mission", "ABORT", RED)
     sys.exit(1)
 
@@ -57,72 +54,46 @@ if not os.path.exists(PDF_FOLDER):
     sys.exit(1)
 
 # =========================
-# LOAD EXCEL
+# RECONCILIATION INDEX
 # =========================
-phase("syncing excel intelligence")
+phase("syncing corpus index")
 
-df = pd.read_excel(EXCEL_MAIN, engine="openpyxl")
-hacker(f"Excel index loaded :: {len(df)} records", "SYNC", GREEN)
+index = CorpusIndex(PDF_FOLDER, EXCEL_MAIN, hash_files=False)  # reconciliation is by name; no content hashes needed
+added, changed, removed = index.refresh()
 
-excel_files = df.get("File", pd.Series()).dropna().astype(str)
-excel_norm = set(normalize(f) for f in excel_files)
-
-# =========================
-# LOAD PDFs
-# =========================
-phase("scanning filesystem")
-
-pdfs = [f for f in os.listdir(PDF_FOLDER) if f.lower().endswith(".pdf")]
-pdf_norm_map = {normalize(f): f for f in pdfs}
-
-hacker(f"PDF payloads discovered :: {len(pdfs)}", "SCAN", GREEN)
+hacker(f"Result index loaded :: {len(index.stored)} records", "SYNC", GREEN)
+hacker(f"PDF payloads discovered :: {len(index.files())} (+{added} ~{changed} -{removed})", "SCAN", GREEN)
 
 # =========================
 # FORENSIC ANALYSIS
 # =========================
 phase("correlating targets")
 
-records = []
-
-# ---- PDFs never processed ----
-for norm, actual in pdf_norm_map.items():
-    if norm not in excel_norm:
-        records.append({
-            "File": actual,
-            "Status": "NOT_IN_EXCEL",
-            "Reason": "PDF exists on disk but has never been processed"
-        })
-
-# ---- Excel rows with failures or missing PDFs ----
-for _, row in df.iterrows():
-    file = str(row.get("File", "")).strip()
-    norm = normalize(file)
-    status = str(row.get("Status", "OK")).strip()
-
-    if not file:
-        continue
-
-    if norm not in pdf_norm_map:
-        records.append({
-            "File": file,
-            "Status": "PDF_MISSING_ON_DISK",
-            "Reason": "Excel entry exists but PDF file is missing"
-        })
-        continue
-
-    if status in FAILED_STATUSES:
-        records.append({
-            "File": file,
-            "Status": status,
-            "Reason": "Previously attempted and failed — intentionally not retried"
-        })
+REASONS = {
+    "NOT_IN_EXCEL": "PDF exists on disk but has never been processed",
+    "PDF_MISSING_ON_DISK": "Excel entry exists but PDF file is missing",
+}
+FAILED_REASON = "Previously attempted and failed — intentionally not retried"
+
+never = index.not_processed()
+gone = index.missing_on_disk()
+failed = index.with_status(FAILED_STATUSES)
+
+report_df = pd.concat([
+    pd.DataFrame({"File": never["name"], "Status": "NOT_IN_EXCEL", "Reason": REASONS["NOT_IN_EXCEL"]}),
+    pd.DataFrame({"File": gone["File"].astype(str).str.strip(), "Status": "PDF_MISSING_ON_DISK",
+                  "Reason": REASONS["PDF_MISSING_ON_DISK"]}),
+    pd.DataFrame({"File": failed["File"].astype(str).str.strip(),
+                  "Status": failed["Status"].astype(str).str.strip(), "Reason": FAILED_REASON}),
+], ignore_index=True)
+index.close()
 
 # =========================
 # RESULTS
 # =========================
 phase("intel summary")
 
-report_df = pd.DataFrame(records).drop_duplicates(subset=["File"])
+report_df = report_df.drop_duplicates(subset=["File"])
 
 if report_df.empty:
     hacker("No anomalies detected — dataset is clean", "OK", GREEN)
@@ -2,7 +2,7 @@
 delete_processed_pdfs.py
 
 Deletes PDFs from a folder if their filenames already exist
-in the ISO Data Collection Excel file.
+in the ISO Data Collection results (store, or the Excel file).
 
 SAFE:
 - Excel is READ-ONLY
@@ -10,7 +10,8 @@ SAFE:
 """
 
 import os
-import pandas as pd
+
+from corpus_index import CorpusIndex
 
 # =========================
 # CONFIG
@@ -21,34 +22,17 @@ EXCEL_PATH = r"C:\Users\lenin\OneDrive\Desktop\BSE_Scraper\ISO Data Collection.x
 DRY_RUN = True  # <-- SET TO False TO ACTUALLY DELETE
 
 # =========================
-# LOAD EXCEL
-# =========================
-print("[INFO] Loading Excel...")
-df = pd.read_excel(EXCEL_PATH)
-
-if "File" not in df.columns:
-    raise RuntimeError("Excel does not contain a 'File' column")
-
-processed_files = set(
-    df["File"]
-    .dropna()
-    .astype(str)
-    .str.strip()
-)
-
-print(f"[INFO] Processed files in Excel: {len(processed_files)}")
-
-# =========================
-# SCAN PDF FOLDER
+# RECONCILE (ONE SCAN + ONE RESULTS READ)
 # =========================
-pdfs = [
-    f for f in os.listdir(PDF_FOLDER)
-    if f.lower().endswith(".pdf")
-]
+print("[INFO] Syncing corpus index...")
+index = CorpusIndex(PDF_FOLDER, EXCEL_PATH, hash_files=False)
+index.refresh()
 
-print(f"[INFO] PDFs found in folder: {len(pdfs)}")
+print(f"[INFO] Processed files in results: {len(index.stored)}")
+print(f"[INFO] PDFs found in folder: {len(index.files())}")
 
-to_delete = [f for f in pdfs if f in processed_files]
+to_delete = list(index.processed_on_disk()["rel_path"])
+index.close()
 
 print(f"[INFO] PDFs eligible for deletion: {len(to_delete)}\n")
 
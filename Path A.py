@@ -3,8 +3,8 @@
 --------------------------------------------------
 MODE        : ACCURACY-FIRST
 SOURCE      : ORIGINAL PDFs ONLY
-BATCH SIZE  : 20
-RESUME      : AUTOMATIC
+BATCH SIZE  : 20 (--batch-size N, --all)
+RESUME      : AUTOMATIC (JOURNALED PER PDF)
 SCHEMA      : HARD-LOCKED
 ZERO FILL   : NEVER
 """
@@ -15,15 +15,15 @@ ZERO FILL   : NEVER
 print("\n[⚡] >>> PATH A2 REBUILD ENGINE INITIALIZING <<<\n")
 
 import os
-import re
-import fitz
+import argparse
 import pandas as pd
 import numpy as np
-from datetime import datetime
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
-import nltk
-from nltk.tokenize import sent_tokenize
+
+from rebuild_engine import analyze_pdf, path_a_fields
+from rebuild_merge import load_previous, restore, upsert, batches
+from warm_start import MODEL_NAME, ensure_nltk, domain_matrix, get_encoder
+from evidence_index import SentenceStore
+from journal import Journal, journal_path_for
 
 # =========================
 # CONFIG — EDIT ONLY IF NEEDED
@@ -31,6 +31,8 @@ from nltk.tokenize import sent_tokenize
 PDF_FOLDER = r"C:\Users\lenin\OneDrive\Desktop\BSE_Scraper\Company_PDF"
 INPUT_EXCEL = r"C:\Users\lenin\OneDrive\Desktop\BSE_Scraper\ISO Data Collection Path A.xlsx"
 OUTPUT_EXCEL = r"C:\Users\lenin\OneDrive\Desktop\BSE_Scraper\ISO Data Collection Path A_REBUILT.xlsx"
+SENTENCE_STORE = r"C:\Users\lenin\OneDrive\Desktop\BSE_Scraper\sentence_store"
+JOURNAL_PATH = journal_path_for(OUTPUT_EXCEL)
 
 BATCH_SIZE = 20
 
@@ -56,56 +58,23 @@ ISO_DOMAINS = {
 }
 ISO_KEYS = list(ISO_DOMAINS.keys())
 
+parser = argparse.ArgumentParser(description="Path A rebuild engine")
+parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Rows per save")
+parser.add_argument("--all", action="store_true", help="Process every remaining row (saving after each batch)")
+args = parser.parse_args()
+
 # =========================
 # NLP INIT
 # =========================
 print("[⚡] Loading NLTK tokenizer")
-nltk.download("punkt", quiet=True)
+ensure_nltk("punkt")
 
-print("[⚡] Loading embedding model (offline)")
-model = SentenceTransformer(
-    "all-mpnet-base-v2",
-    local_files_only=True,
-    device="cpu"
-)
-iso_embeddings = model.encode(list(ISO_DOMAINS.values()), show_progress_bar=False)
+print("[⚡] Loading embedding model (daemon or offline)")
+model = get_encoder(MODEL_NAME)
+iso_matrix = domain_matrix(ISO_DOMAINS.values(), model)
+sentence_store = SentenceStore(SENTENCE_STORE)
 print("[⚡] Embedding model ONLINE\n")
 
-# =========================
-# HELPERS
-# =========================
-def extract_text(pdf_path):
-    try:
-        doc = fitz.open(pdf_path)
-        chunks = []
-        for page in doc:
-            try:
-                chunks.append(page.get_text("text") or "")
-            except Exception:
-                pass
-        doc.close()
-        text = "\n".join(chunks)
-        return text.strip() if len(text.strip()) > 50 else None
-    except Exception:
-        return None
-
-def split_sentences(txt):
-    txt = re.sub(r"\s+", " ", txt)
-    return [s for s in sent_tokenize(txt) if len(s.strip()) > 15]
-
-def has_evidence(sents, idx):
-    keywords = [
-        "implemented", "established", "maintained", "audit",
-        "certified", "monitored", "trained", "reviewed",
-        "tested", "assessed"
-    ]
-    lo = max(0, idx - WINDOW)
-    hi = min(len(sents) - 1, idx + WINDOW)
-    return any(
-        any(k in sents[i].lower() for k in keywords)
-        for i in range(lo, hi + 1)
-    )
-
 # =========================
 # LOAD INPUT
 # =========================
@@ -135,81 +104,61 @@ df["Status"] = ""
 df["Processed_On"] = ""
 
 # =========================
-# RESUME LOGIC
+# RESUME LOGIC (KEYED MERGE)
 # =========================
-if os.path.exists(OUTPUT_EXCEL):
-    prev = pd.read_excel(OUTPUT_EXCEL)
-    done_files = set(prev.loc[prev["Status"] == "OK", "File"])
-    df.loc[df["File"].isin(done_files), prev.columns] = prev.set_index("File").loc[
-        df["File"], prev.columns
-    ].values
+prev = load_previous(OUTPUT_EXCEL)
+df = restore(df, prev, FINAL_COLUMNS)
+done_files = set(prev.index[prev["Status"] == "OK"]) if prev is not None else set()
+if prev is not None:
     print(f"[⚡] Resume detected :: {len(done_files)} rows already completed")
-else:
-    done_files = set()
+
+# rows scored after the last Excel save (crash recovery)
+journal = Journal(JOURNAL_PATH)
+replayed = journal.replay()
+if replayed:
+    df = upsert(df, replayed, append=False)
+    done_files.update(rec["File"] for rec in replayed)
+    print(f"[🛠] Journal replayed :: {len(replayed)} rows recovered")
 
 # =========================
-# SELECT BATCH
+# SELECT WORK
 # =========================
-remaining = df[~df["File"].isin(done_files)]
-batch = remaining.head(BATCH_SIZE)
+remaining = df.loc[~df["File"].isin(done_files), ["File", "Company", "Year"]].drop_duplicates("File")
+work = list(remaining.itertuples(index=False))
+if not args.all:
+    work = work[:args.batch_size]
 
 print(f"[⚡] Remaining rows :: {len(remaining)}")
-print(f"[⚡] Processing batch :: {len(batch)} rows\n")
+print(f"[⚡] Processing :: {len(work)} rows in batches of {args.batch_size}\n")
 
 # =========================
-# REBUILD LOOP
+# REBUILD LOOP (ONE BULK UPSERT + SAVE PER BATCH)
 # =========================
 processed = 0
 
-for idx, row in batch.iterrows():
-    pdf_name = row["File"]
-    pdf_path = os.path.join(PDF_FOLDER, pdf_name)
-
-    print(f"[⚡] Scanning PDF :: {pdf_name}")
-
-    if not os.path.exists(pdf_path):
-        df.at[idx, "Status"] = "PDF_MISSING"
-        continue
-
-    text = extract_text(pdf_path)
-    if not text:
-        df.at[idx, "Status"] = "NO_TEXT"
-        continue
-
-    sentences = split_sentences(text)
-    if not sentences:
-        df.at[idx, "Status"] = "NO_SENTENCES"
-        continue
-
-    sent_emb = model.encode(sentences, show_progress_bar=False)
-    sims = cosine_similarity(sent_emb, iso_embeddings)
-
-    scores = {}
-    for j, key in enumerate(ISO_KEYS):
-        best_idx = int(np.argmax(sims[:, j]))
-        best_sim = sims[best_idx, j]
-
-        score = 0
-        if best_sim >= SIM_MENTION:
-            score = 1
-            if best_sim >= SIM_HIGH or has_evidence(sentences, best_idx):
-                score = 2
-
-        scores[key] = score
-        df.at[idx, key] = score
-
-    df.at[idx, "Total_Score"] = sum(scores.values())
-    df.at[idx, "Status"] = "OK"
-    df.at[idx, "Processed_On"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-    processed += 1
-
-# =========================
-# SAVE
-# =========================
-df.to_excel(OUTPUT_EXCEL, index=False)
+for batch in batches(work, args.batch_size):
+    updates = []
+    for pdf_name, company, year in batch:
+        print(f"[⚡] Scanning PDF :: {pdf_name}")
+
+        analysis = analyze_pdf(
+            os.path.join(PDF_FOLDER, pdf_name), model, iso_matrix, sentence_store, company, year,
+            window=WINDOW, sim_mention=SIM_MENTION, sim_high=SIM_HIGH
+        )
+        update = {"File": pdf_name, **path_a_fields(analysis, ISO_KEYS)}
+        updates.append(update)
+        if analysis.status != "OK":
+            continue
+
+        # failures are simply retried next run; only OK rows need journaling
+        journal.append(update)
+        processed += 1
+
+    df = upsert(df, updates, append=False)
+    df[FINAL_COLUMNS].to_excel(OUTPUT_EXCEL, index=False)
+    journal.clear()
+    print(f"\n[💾] Batch committed safely ({len(batch)} rows)\n")
 
-print("\n[💾] Batch committed safely")
 print(f"[⚡] Rows processed this run :: {processed}")
 print(f"[⚠️] Rows remaining :: {len(remaining) - processed}")
 print("\n[⚡] SAFE TO CLOSE — RE-RUN TO CONTINUE\n")
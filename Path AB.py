@@ -0,0 +1,157 @@
+"""
+⚡ ISO27001 PATH A + B — SINGLE-PASS REBUILD ENGINE ⚡
+---------------------------------------------------
+MODE        : ONE ENCODE PER PDF, TWO OUTPUTS
+PATH A      : 0/1/2 GRADES (SIM_MENTION / SIM_HIGH / EVIDENCE WINDOW)
+PATH B      : BEST-SENTENCE EVIDENCE ≥ SIM_THRESHOLD, NEVER OVERWRITTEN
+BATCH SIZE  : 20 (--batch-size N, --all)
+RESUME      : AUTOMATIC (BOTH OUTPUTS)
+"""
+
+# =========================
+# BOOT SEQUENCE
+# =========================
+print("\n[⚡] >>> PATH A+B SINGLE-PASS ENGINE INITIALIZING <<<\n")
+
+import os
+import argparse
+import pandas as pd
+import numpy as np
+
+from iso_scoring import ISO_DOMAINS, ISO_KEYS
+from rebuild_engine import analyze_pdf, path_a_fields, path_b_fields
+from rebuild_merge import load_previous, restore, upsert, batches
+from warm_start import MODEL_NAME, ensure_nltk, domain_matrix, get_encoder
+from evidence_index import SentenceStore
+
+# =========================
+# CONFIG — EDIT ONLY IF NEEDED
+# =========================
+WORK_DIR = r"C:\Users\lenin\OneDrive\Desktop\BSE_Scraper"
+PDF_FOLDER = os.path.join(WORK_DIR, "Company_PDF")
+SENTENCE_STORE = os.path.join(WORK_DIR, "sentence_store")
+
+A_INPUT = os.path.join(WORK_DIR, "ISO Data Collection Path A.xlsx")
+A_OUTPUT = os.path.join(WORK_DIR, "ISO Data Collection Path A_REBUILT.xlsx")
+B_INPUT = os.path.join(WORK_DIR, "ISO Data Collection Path B.xlsx")
+B_OUTPUT = os.path.join(WORK_DIR, "ISO Data Collection Path B_PATCHED.xlsx")
+
+BATCH_SIZE = 20
+
+# Path A
+SIM_MENTION = 0.60
+SIM_HIGH = 0.72
+WINDOW = 1
+
+# Path B
+SIM_THRESHOLD = 0.55
+
+parser = argparse.ArgumentParser(description="Single-pass Path A + B rebuild")
+parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="PDFs per save")
+parser.add_argument("--all", action="store_true", help="Process every remaining PDF (saving after each batch)")
+args = parser.parse_args()
+
+# =========================
+# NLP INIT
+# =========================
+print("[⚡] Loading NLTK tokenizer")
+ensure_nltk("punkt")
+
+print("[⚡] Loading embedding model (daemon or offline)")
+model = get_encoder(MODEL_NAME)
+iso_matrix = domain_matrix(ISO_DOMAINS.values(), model)
+sentence_store = SentenceStore(SENTENCE_STORE)
+print("[⚡] Embedding model ONLINE\n")
+
+# =========================
+# LOAD PATH A (SCHEMA LOCK)
+# =========================
+A_COLUMNS = ["Year", "Company", "File"] + ISO_KEYS + ["Total_Score", "Status", "Processed_On"]
+
+df_a = pd.read_excel(A_INPUT)[["Year", "Company", "File"]].copy()
+for k in ISO_KEYS:
+    df_a[k] = np.nan
+df_a["Total_Score"] = np.nan
+df_a["Status"] = ""
+df_a["Processed_On"] = ""
+
+prev_a = load_previous(A_OUTPUT)
+df_a = restore(df_a, prev_a, A_COLUMNS)
+a_done = set(prev_a.index[prev_a["Status"] == "OK"]) if prev_a is not None else set()
+print(f"[⚡] Path A :: {len(df_a)} rows, {len(a_done)} already completed")
+
+# =========================
+# LOAD PATH B (FORENSIC COLUMNS)
+# =========================
+df_b = pd.read_excel(B_INPUT)
+for k in ISO_KEYS:
+    if f"{k}_Evidence" not in df_b.columns:
+        df_b[f"{k}_Evidence"] = ""
+    if f"{k}_Sim" not in df_b.columns:
+        df_b[f"{k}_Sim"] = np.nan
+
+prev_b = load_previous(B_OUTPUT)
+df_b = restore(df_b, prev_b)
+b_done = set(prev_b.index[prev_b["Status"].notna()]) if prev_b is not None else set()
+print(f"[⚡] Path B :: {len(df_b)} rows, {len(b_done)} already patched")
+
+# =========================
+# SELECT WORK (UNION, ONE PASS PER PDF)
+# =========================
+evidence_cols = [f"{k}_Evidence" for k in ISO_KEYS]
+has_evidence = df_b[evidence_cols].apply(lambda c: c.astype("string").str.strip().fillna("").ne(""))
+
+a_todo = df_a.loc[~df_a["File"].isin(a_done), "File"]
+b_todo = df_b.loc[~df_b["File"].isin(b_done) & ~has_evidence.all(axis=1), "File"]
+a_set, b_set = set(a_todo), set(b_todo)
+
+work = list(dict.fromkeys(list(a_todo) + list(b_todo)))
+remaining = len(work)
+if not args.all:
+    work = work[:args.batch_size]
+
+meta = pd.concat([df_b[["File", "Company", "Year"]], df_a[["File", "Company", "Year"]]]) \
+    .drop_duplicates("File", keep="last").set_index("File")
+existing = {
+    f: {k for k, has in zip(ISO_KEYS, flags) if has}
+    for f, flags in zip(df_b["File"], has_evidence.to_numpy())
+    if f in b_set
+}
+
+print(f"[⚡] PDFs needing work :: {remaining} (A {len(a_set)}, B {len(b_set)}, both {len(a_set & b_set)})")
+print(f"[⚡] Processing :: {len(work)} PDFs in batches of {args.batch_size}\n")
+
+# =========================
+# SINGLE-PASS LOOP (BULK UPSERT + SAVE BOTH PER BATCH)
+# =========================
+a_rows, b_rows = 0, 0
+
+for batch in batches(work, args.batch_size):
+    a_updates, b_updates = [], []
+    for pdf_name in batch:
+        print(f"[⚡] Scanning PDF :: {pdf_name}")
+        analysis = analyze_pdf(
+            os.path.join(PDF_FOLDER, pdf_name), model, iso_matrix, sentence_store,
+            meta.at[pdf_name, "Company"], meta.at[pdf_name, "Year"],
+            window=WINDOW, sim_mention=SIM_MENTION, sim_high=SIM_HIGH
+        )
+        ok = analysis.status == "OK"
+
+        if pdf_name in a_set:
+            a_updates.append({"File": pdf_name, **path_a_fields(analysis, ISO_KEYS)})
+            a_rows += ok
+        if pdf_name in b_set and ok:
+            b_updates.append({"File": pdf_name,
+                              **path_b_fields(analysis, ISO_KEYS, SIM_THRESHOLD, existing[pdf_name])})
+            b_rows += 1
+
+    df_a = upsert(df_a, a_updates, append=False)
+    df_b = upsert(df_b, b_updates, append=False)
+    df_a[A_COLUMNS].to_excel(A_OUTPUT, index=False)
+    df_b.to_excel(B_OUTPUT, index=False)
+    print(f"\n[💾] Both outputs committed safely ({len(batch)} PDFs)\n")
+
+print(f"[⚡] Path A rows rebuilt :: {a_rows}")
+print(f"[⚡] Path B rows patched :: {b_rows}")
+print(f"[⚠️] PDFs remaining :: {remaining - len(work)}")
+print("\n[⚡] SAFE TO CLOSE — RE-RUN TO CONTINUE\n")
@@ -3,7 +3,7 @@
 ----------------------------------------------------
 MODE        : FORENSIC / EXPLANATORY
 SCORES      : READ-ONLY
-BATCH SIZE  : 20
+BATCH SIZE  : 20 (--batch-size N, --all)
 RESUME      : AUTOMATIC
 DATA LOSS   : IMPOSSIBLE
 """
@@ -14,15 +14,13 @@ DATA LOSS   : IMPOSSIBLE
 print("\n[⚡] >>> PATH B1 FORENSIC ENGINE INITIALIZING <<<\n")
 
 import os
-import re
-import fitz
+import argparse
 import pandas as pd
 import numpy as np
-from datetime import datetime
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
-import nltk
-from nltk.tokenize import sent_tokenize
+
+from rebuild_engine import analyze_pdf, path_b_fields
+from rebuild_merge import load_previous, restore, upsert, batches
+from warm_start import MODEL_NAME, ensure_nltk, domain_matrix, get_encoder
 
 # =========================
 # CONFIG
@@ -52,42 +50,21 @@ ISO_DOMAINS = {
 }
 ISO_KEYS = list(ISO_DOMAINS.keys())
 
+parser = argparse.ArgumentParser(description="Path B forensic evidence engine")
+parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Rows per save")
+parser.add_argument("--all", action="store_true", help="Process every row needing repair (saving after each batch)")
+args = parser.parse_args()
+
 # =========================
 # NLP INIT
 # =========================
 print("[⚡] Loading NLTK resources")
-nltk.download("punkt", quiet=True)
-
-print("[⚡] Loading embedding model (offline)")
-model = SentenceTransformer(
-    "all-mpnet-base-v2",
-    local_files_only=True,
-    device="cpu"
-)
-iso_embeddings = model.encode(list(ISO_DOMAINS.values()), show_progress_bar=False)
-print("[⚡] Embedding model ONLINE\n")
-
-# =========================
-# HELPERS
-# =========================
-def extract_text(pdf_path):
-    try:
-        doc = fitz.open(pdf_path)
-        chunks = []
-        for page in doc:
-            try:
-                chunks.append(page.get_text("text") or "")
-            except Exception:
-                pass
-        doc.close()
-        text = "\n".join(chunks)
-        return text.strip() if len(text.strip()) > 50 else None
-    except Exception:
-        return None
+ensure_nltk("punkt")
 
-def split_sentences(txt):
-    txt = re.sub(r"\s+", " ", txt)
-    return [s for s in sent_tokenize(txt) if len(s.strip()) > 15]
+print("[⚡] Loading embedding model (daemon or offline)")
+model = get_encoder(MODEL_NAME)
+iso_matrix = domain_matrix(ISO_DOMAINS.values(), model)
+print("[⚡] Embedding model ONLINE\n")
 
 # =========================
 # LOAD INPUT
@@ -107,80 +84,56 @@ for key in ISO_KEYS:
         df[sim_col] = np.nan
 
 # =========================
-# RESUME LOGIC
+# RESUME LOGIC (KEYED MERGE)
 # =========================
-if os.path.exists(OUTPUT_EXCEL):
-    prev = pd.read_excel(OUTPUT_EXCEL)
-    done = set(prev.loc[prev["Status"].notna(), "File"])
-    df.loc[df["File"].isin(done), prev.columns] = prev.set_index("File").loc[
-        df["File"], prev.columns
-    ].values
+prev = load_previous(OUTPUT_EXCEL)
+df = restore(df, prev)
+done = set(prev.index[prev["Status"].notna()]) if prev is not None else set()
+if prev is not None:
     print(f"[⚡] Resume detected :: {len(done)} rows already patched")
-else:
-    done = set()
 
 # =========================
 # SELECT ROWS NEEDING FORENSICS
 # =========================
-needs_fix = df[
-    (~df["File"].isin(done)) &
-    (
-        df[[f"{k}_Evidence" for k in ISO_KEYS]].eq("").any(axis=1)
-    )
-]
+evidence_cols = [f"{k}_Evidence" for k in ISO_KEYS]
+has_evidence = df[evidence_cols].apply(lambda c: c.astype("string").str.strip().fillna("").ne(""))
 
-batch = needs_fix.head(BATCH_SIZE)
+needs_fix = df.loc[~df["File"].isin(done) & ~has_evidence.all(axis=1), "File"].drop_duplicates()
+work = list(needs_fix) if args.all else list(needs_fix.head(args.batch_size))
+
+# keys that already carry evidence, per File (never overwritten)
+work_set = set(work)
+existing = {
+    f: {k for k, has in zip(ISO_KEYS, flags) if has}
+    for f, flags in zip(df["File"], has_evidence.to_numpy())
+    if f in work_set
+}
 
 print(f"[⚡] Rows needing forensic repair :: {len(needs_fix)}")
-print(f"[⚡] Processing batch :: {len(batch)} rows\n")
+print(f"[⚡] Processing :: {len(work)} rows in batches of {args.batch_size}\n")
 
 # =========================
-# FORENSIC LOOP
+# FORENSIC LOOP (ONE BULK UPSERT + SAVE PER BATCH)
 # =========================
 patched = 0
 
-for idx, row in batch.iterrows():
-    pdf_name = row["File"]
-    pdf_path = os.path.join(PDF_FOLDER, pdf_name)
-
-    print(f"[⚡] Extracting evidence :: {pdf_name}")
+for batch in batches(work, args.batch_size):
+    updates = []
+    for pdf_name in batch:
+        print(f"[⚡] Extracting evidence :: {pdf_name}")
 
-    if not os.path.exists(pdf_path):
-        continue
+        analysis = analyze_pdf(os.path.join(PDF_FOLDER, pdf_name), model, iso_matrix)
+        if analysis.status != "OK":
+            continue
 
-    text = extract_text(pdf_path)
-    if not text:
-        continue
+        fields = path_b_fields(analysis, ISO_KEYS, SIM_THRESHOLD, existing[pdf_name])
+        updates.append({"File": pdf_name, **fields})
+        patched += 1
 
-    sentences = split_sentences(text)
-    if not sentences:
-        continue
-
-    sent_emb = model.encode(sentences, show_progress_bar=False)
-    sims = cosine_similarity(sent_emb, iso_embeddings)
-
-    for j, key in enumerate(ISO_KEYS):
-        ev_col = f"{key}_Evidence"
-        sim_col = f"{key}_Sim"
-
-        if isinstance(row[ev_col], str) and row[ev_col].strip():
-            continue  # already has evidence
-
-        best_idx = int(np.argmax(sims[:, j]))
-        best_sim = sims[best_idx, j]
-
-        if best_sim >= SIM_THRESHOLD:
-            df.at[idx, ev_col] = sentences[best_idx][:500]
-            df.at[idx, sim_col] = round(float(best_sim), 4)
-
-    patched += 1
-
-# =========================
-# SAVE
-# =========================
-df.to_excel(OUTPUT_EXCEL, index=False)
+    df = upsert(df, updates, append=False)
+    df.to_excel(OUTPUT_EXCEL, index=False)
+    print(f"\n[💾] Forensic batch committed safely ({len(batch)} rows)\n")
 
-print("\n[💾] Forensic batch committed safely")
 print(f"[⚡] Rows patched this run :: {patched}")
 print(f"[⚠️] Rows remaining :: {len(needs_fix) - patched}")
 print("\n[⚡] SAFE TO CLOSE — RE-RUN TO CONTINUE\n")
@@ -0,0 +1,106 @@
+"""
+⚡ INTEGRITY RULES BENCHMARK ⚡
+-----------------------------
+Original Quality Control row loop (iterrows × 14 domains) against the
+vectorized qa_rules engine on a synthetic master sheet with planted
+defects. Issue counts per type must agree.
+
+  python "QA rules benchmark.py" --rows 100000
+"""
+
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from iso_scoring import ISO_KEYS
+from qa_rules import VALID_STATUSES, run_rules
+
+ROWS = 100_000
+SEED = 7
+
+# =========================
+# SYNTHETIC MASTER
+# =========================
+def make_frame(n, seed=SEED):
+    rng = np.random.default_rng(seed)
+    scores = rng.integers(0, 3, (n, len(ISO_KEYS))).astype(float)
+    scores[rng.random(scores.shape) < 0.01] = np.nan
+    scores[rng.random(scores.shape) < 0.002] = 3
+
+    df = pd.DataFrame(scores, columns=ISO_KEYS)
+    df.insert(0, "File", [f"{2019 + i % 6}_{i // 6}.pdf" for i in range(n)])
+    df.insert(0, "Year", 2019 + np.arange(n) % 6)
+    df.insert(0, "Company", [f"Company {i // 6}" for i in range(n)])
+    df["File"] = df["File"].where(rng.random(n) > 0.005, "dup.pdf")
+
+    total = np.nansum(scores, axis=1)
+    total[rng.random(n) < 0.01] += 1
+    df["Total_Score"] = total
+    df["Status"] = rng.choice(["OK", "OK", "OK", "NO_TEXT", "PDF_READ_FAILED", "TIMEOUT"], n)
+    df["Processed_On"] = "2024-01-01 00:00:00"
+    return df
+
+# =========================
+# ORIGINAL ROW LOOP
+# =========================
+def legacy(df):
+    issues = []
+    for _, row in df.iterrows():
+        file = str(row.get("File", "")).strip()
+        status = str(row.get("Status", "")).strip()
+        total = row.get("Total_Score")
+        domain_vals = []
+        for k in ISO_KEYS:
+            v = row.get(k)
+            if pd.isna(v):
+                issues.append({"Issue_Type": "MISSING_DOMAIN_SCORE", "File": file, "Domain": k})
+            else:
+                domain_vals.append(v)
+                if v not in (0, 1, 2):
+                    issues.append({"Issue_Type": "INVALID_DOMAIN_VALUE", "File": file, "Domain": k, "Value": v})
+        if domain_vals:
+            expected = sum(domain_vals)
+            if total != expected:
+                issues.append({"Issue_Type": "TOTAL_SCORE_MISMATCH", "File": file,
+                               "Expected": expected, "Actual": total})
+        if status == "OK" and total == 0:
+            issues.append({"Issue_Type": "OK_WITH_ZERO_SCORE", "File": file})
+        if status != "OK" and any(v > 0 for v in domain_vals):
+            issues.append({"Issue_Type": "FAILED_WITH_SCORES", "File": file, "Status": status})
+        if status not in VALID_STATUSES:
+            issues.append({"Issue_Type": "UNKNOWN_STATUS", "File": file, "Status": status})
+    return pd.DataFrame(issues)
+
+def engine(df):
+    rules = ["MISSING_DOMAIN_SCORE", "INVALID_DOMAIN_VALUE", "TOTAL_SCORE_MISMATCH",
+             "OK_WITH_ZERO_SCORE", "FAILED_WITH_SCORES", "UNKNOWN_STATUS"]
+    return run_rules(df, ISO_KEYS, rules=rules)
+
+# =========================
+# RUN
+# =========================
+parser = argparse.ArgumentParser(description="Row loop vs vectorized integrity rules")
+parser.add_argument("--rows", type=int, default=ROWS)
+args = parser.parse_args()
+
+df = make_frame(args.rows)
+
+t0 = time.perf_counter()
+old = legacy(df)
+t_old = time.perf_counter() - t0
+
+t0 = time.perf_counter()
+new = engine(df)
+t_new = time.perf_counter() - t0
+
+counts = pd.concat([old["Issue_Type"].value_counts().rename("loop"),
+                    new["Issue_Type"].value_counts().rename("rules")], axis=1).fillna(0).astype(int)
+
+print(f"Rows              : {args.rows}")
+print(f"Original loop     : {t_old:8.2f} s")
+print(f"Rules engine      : {t_new:8.2f} s")
+print(f"Speed-up          : {t_old / t_new:8.1f}x")
+print(f"Issue agreement   : {'yes' if (counts['loop'] == counts['rules']).all() else 'NO'}\n")
+print(counts.to_string())
@@ -1,9 +1,16 @@
 import os
 import sys
+import time
+import argparse
 import pandas as pd
 from datetime import datetime
 from colorama import init
 
+from iso_scoring import ISO_KEYS
+from qa_rules import RULES
+from qa_audit import AuditState, audit_state_path_for
+from results_store import ResultsStore, store_path_for
+
 # =========================
 # NEON CONSOLE
 # =========================
@@ -31,13 +38,12 @@ def phase(msg):
 # =========================
 EXCEL_MAIN = r"C:\Users\lenin\OneDrive\Desktop\BSE_Scraper\ISO Data Collection.xlsx"
 QA_REPORT  = r"C:\Users\lenin\OneDrive\Desktop\BSE_Scraper\ISO_Data_Integrity_Report.xlsx"
+QA_STATE   = audit_state_path_for(QA_REPORT)
+STORE_PATH = store_path_for(EXCEL_MAIN)
 
-ISO_KEYS = [
-    "A.5","A.6","A.7","A.8","A.9","A.10","A.11",
-    "A.12","A.13","A.14","A.15","A.16","A.17","A.18"
-]
-
-VALID_STATUSES = {"OK", "PDF_READ_FAILED", "NO_TEXT"}
+parser = argparse.ArgumentParser(description="Incremental ISO data integrity audit")
+parser.add_argument("--full", action="store_true", help="Re-validate every row, not only changed ones")
+args = parser.parse_args()
 
 # =========================
 # ENTRY POINT
@@ -46,8 +52,8 @@ phase("initializing integrity scanner")
 
 cyber("Booting audit engine", "BOOT", GREEN)
 
-if not os.path.exists(EXCEL_MAIN):
-    cyber("Master Excel not found — aborting scan", "ABORT", RED)
+if not os.path.exists(EXCEL_MAIN) and not os.path.exists(STORE_PATH):
+    cyber("Master Excel / results store not found — aborting scan", "ABORT", RED)
     sys.exit(1)
 
 # =========================
@@ -55,126 +61,43 @@ if not os.path.exists(EXCEL_MAIN):
 # =========================
 phase("syncing primary datastore")
 
-df = pd.read_excel(EXCEL_MAIN, engine="openpyxl")
-cyber(f"Records loaded :: {len(df)}", "SYNC", GREEN)
-
-issues = []
-
-# =========================
-# STRUCTURE CHECK
-# =========================
-phase("verifying schema integrity")
-
-required_cols = {"Company","Year","File","Status","Total_Score","Processed_On"} | set(ISO_KEYS)
-missing = required_cols - set(df.columns)
-
-if missing:
-    cyber(f"Missing columns detected :: {missing}", "FAULT", RED)
-    issues.append({
-        "Issue_Type": "MISSING_COLUMNS",
-        "Details": ", ".join(sorted(missing))
-    })
+if os.path.exists(STORE_PATH):
+    store = ResultsStore(STORE_PATH)
+    df = store.to_frame()
+    store.close()
+    cyber(f"Records loaded from results store :: {len(df)}", "SYNC", GREEN)
 else:
-    cyber("Schema integrity verified", "OK", GREEN)
+    df = pd.read_excel(EXCEL_MAIN, engine="openpyxl")
+    cyber(f"Records loaded :: {len(df)}", "SYNC", GREEN)
 
 # =========================
-# DUPLICATE FILE CHECK
+# RULE ENGINE (INCREMENTAL)
 # =========================
-phase("scanning duplicate payloads")
-
-dupes = df[df.duplicated(subset=["File"], keep=False)]
-for f in dupes["File"].unique():
-    issues.append({
-        "Issue_Type": "DUPLICATE_FILE",
-        "File": f
-    })
+phase("evaluating integrity rules")
 
-cyber(f"Duplicate files flagged :: {dupes['File'].nunique()}", "SCAN", YELLOW)
+state = AuditState(QA_STATE)
+t0 = time.perf_counter()
+summary = state.audit(df, ISO_KEYS, full=args.full)
+qa_df = state.open_issues()
+state.close()
 
-# =========================
-# ROW-LEVEL VALIDATION
-# =========================
-phase("validating record payloads")
-
-for _, row in df.iterrows():
-    file = str(row.get("File", "")).strip()
-    status = str(row.get("Status", "")).strip()
-    total = row.get("Total_Score")
-
-    domain_vals = []
-
-    for k in ISO_KEYS:
-        v = row.get(k)
-        if pd.isna(v):
-            issues.append({
-                "Issue_Type": "MISSING_DOMAIN_SCORE",
-                "File": file,
-                "Domain": k
-            })
-        else:
-            domain_vals.append(v)
-            if v not in (0,1,2):
-                issues.append({
-                    "Issue_Type": "INVALID_DOMAIN_VALUE",
-                    "File": file,
-                    "Domain": k,
-                    "Value": v
-                })
-
-    if domain_vals:
-        expected = sum(domain_vals)
-        if total != expected:
-            issues.append({
-                "Issue_Type": "TOTAL_SCORE_MISMATCH",
-                "File": file,
-                "Expected": expected,
-                "Actual": total
-            })
-
-    if status == "OK" and total == 0:
-        issues.append({
-            "Issue_Type": "OK_WITH_ZERO_SCORE",
-            "File": file
-        })
-
-    if status != "OK" and any(v > 0 for v in domain_vals):
-        issues.append({
-            "Issue_Type": "FAILED_WITH_SCORES",
-            "File": file,
-            "Status": status
-        })
-
-    if status not in VALID_STATUSES:
-        issues.append({
-            "Issue_Type": "UNKNOWN_STATUS",
-            "File": file,
-            "Status": status
-        })
-
-# =========================
-# OUTLIER ANALYSIS
-# =========================
-phase("detecting temporal score drift")
+cyber(f"Files re-validated :: {summary['changed']} (removed {summary['removed']})", "SCAN", CYAN)
+cyber(f"{len(RULES)} rules evaluated in {time.perf_counter() - t0:.2f}s", "SCAN", GREEN)
+cyber(f"Issues :: +{summary['new']} new, -{summary['resolved']} resolved, {summary['open']} open", "SCAN", YELLOW)
 
-grp = df[df["Status"] == "OK"].groupby(["Company","Year"])["Total_Score"]
+schema = qa_df[qa_df["Issue_Type"] == "MISSING_COLUMNS"]
+if len(schema):
+    cyber(f"Missing columns detected :: {schema['Details'].iloc[0]}", "FAULT", RED)
+else:
+    cyber("Schema integrity verified", "OK", GREEN)
 
-for (company, year), scores in grp:
-    if scores.max() - scores.min() >= 10:
-        issues.append({
-            "Issue_Type": "COMPANY_YEAR_SCORE_VARIANCE",
-            "Company": company,
-            "Year": year,
-            "Min": int(scores.min()),
-            "Max": int(scores.max())
-        })
+cyber(f"Duplicate files flagged :: {(qa_df['Issue_Type'] == 'DUPLICATE_FILE').sum()}", "SCAN", YELLOW)
 
 # =========================
 # RESULTS
 # =========================
 phase("integrity verdict")
 
-qa_df = pd.DataFrame(issues)
-
 if qa_df.empty:
     cyber("No anomalies detected — dataset integrity intact", "CLEAN", GREEN)
 else:
@@ -187,10 +110,11 @@ else:
 # =========================
 phase("writing forensic artifact")
 
-qa_df["Checked_On"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-qa_df.to_excel(QA_REPORT, index=False, engine="openpyxl")
-
-cyber("Integrity report written successfully", "WRITE", GREEN)
+if summary["new"] or summary["resolved"] or not os.path.exists(QA_REPORT):
+    qa_df.to_excel(QA_REPORT, index=False, engine="openpyxl")
+    cyber("Integrity report written successfully", "WRITE", GREEN)
+else:
+    cyber("Open issue set unchanged — report left as is", "SKIP", DIM)
 cyber(QA_REPORT, "PATH", BLUE)
 
 phase("scan complete — system stable")
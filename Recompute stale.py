@@ -0,0 +1,120 @@
+"""
+⚡ ISO27001 SELECTIVE RECOMPUTE ⚡
+--------------------------------
+Rescore only the rows whose config fingerprint differs from the current
+ISO Maker configuration (model revision, domain descriptions, thresholds,
+evidence keywords, extractor / segmenter versions). Rows without a
+fingerprint count as stale. Only rows produced by the ISO Maker pipeline
+are judged and rescored; rows of other producers (OG scrapper) have no
+rescoring path here and are skipped. With --drift, rescore the files
+queued by the score-drift checks instead (score_drift.DriftState).
+
+  python "Recompute stale.py" --dry-run
+  python "Recompute stale.py" --limit 200
+  python "Recompute stale.py" --drift
+"""
+
+import os
+import argparse
+from collections import Counter
+
+from tqdm import tqdm
+
+from iso_scoring import ISO_DOMAINS, ISO_KEYS, SIM_MENTION, SIM_HIGH, WINDOW
+from iso_pipeline import score_pdf, pipeline_config, normalize_filename
+from provenance import ISO_MAKER, fingerprint, producer_of
+from results_store import ResultsStore, store_path_for
+from journal import WorkerJournal
+from evidence_index import SentenceStore
+from warm_start import MODEL_NAME, ensure_nltk, domain_matrix, get_encoder
+from score_drift import DriftState, drift_state_path_for
+from company_registry import scorer_registry
+
+# =========================
+# CONFIG
+# =========================
+WORK_DIR = r"C:\Users\lenin\OneDrive\Desktop\BSE_Scraper"
+PDF_FOLDER = os.path.join(WORK_DIR, "Company_PDF")
+EXCEL_MAIN = os.path.join(WORK_DIR, "ISO Data Collection.xlsx")
+SENTENCE_STORE = os.path.join(WORK_DIR, "sentence_store")
+COMMIT_EVERY = 20
+
+parser = argparse.ArgumentParser(description="Rescore rows produced by an outdated config")
+parser.add_argument("--dry-run", action="store_true", help="Only report what is stale")
+parser.add_argument("--limit", type=int, help="Rescore at most this many PDFs")
+parser.add_argument("--drift", action="store_true", help="Rescore the score-drift re-extraction queue")
+args = parser.parse_args()
+
+store = ResultsStore(store_path_for(EXCEL_MAIN))
+config = pipeline_config(ISO_DOMAINS, MODEL_NAME, SIM_MENTION, SIM_HIGH, WINDOW)
+current = store.register_config(fingerprint(config), config)
+
+# =========================
+# WHAT IS STALE
+# =========================
+print(f"[⚡] Current fingerprint :: {current}")
+for fp, n in sorted(store.fingerprints().items(), key=lambda kv: -kv[1]):
+    known = store.config(fp) if fp else None
+    if fp == current:
+        label = "current"
+    elif known is not None and producer_of(known) != ISO_MAKER:
+        label = f"{producer_of(known)}, skipped"
+    else:
+        label = "unstamped" if fp is None else "stale"
+    print(f"    {str(fp):<18} {n:>7} rows  ({label})")
+
+available = {normalize_filename(f): f for f in os.listdir(PDF_FOLDER) if f.lower().endswith(".pdf")}
+if args.drift:
+    drift = DriftState(drift_state_path_for(store.path))
+    drift.refresh(store)
+    stale_files = drift.queued()
+    drift.close()
+else:
+    stale_files = store.stale(current, producer=ISO_MAKER)
+
+# rows of another pipeline are never overwritten with ISO Maker rows
+owners = store.producers()
+foreign = [f for f in stale_files if owners.get(normalize_filename(f), ISO_MAKER) != ISO_MAKER]
+if foreign:
+    print(f"[⚠️] Skipped {len(foreign)} row(s) produced by another pipeline")
+    foreign = set(foreign)
+    stale_files = [f for f in stale_files if f not in foreign]
+stale = [available[k] for k in map(normalize_filename, stale_files) if k in available]
+missing = len(stale_files) - len(stale)
+
+print(f"[⚡] {'Drift-queued' if args.drift else 'Stale'} rows with a PDF :: {len(stale)}  (no PDF on disk: {missing})")
+if args.limit:
+    stale = stale[:args.limit]
+
+if args.dry_run or not stale:
+    raise SystemExit(0)
+
+# =========================
+# RESCORE
+# =========================
+ensure_nltk("punkt")
+model = get_encoder(MODEL_NAME)
+iso_matrix = domain_matrix(ISO_DOMAINS.values(), model)
+sentence_store = SentenceStore(SENTENCE_STORE)
+registry = scorer_registry()
+journal = WorkerJournal(store.path)
+journal.recover(store)
+
+statuses = Counter()
+for i, pdf in enumerate(tqdm(stale, desc="Recomputing"), 1):
+    row = score_pdf(os.path.join(PDF_FOLDER, pdf), model, iso_matrix, ISO_KEYS, sentence_store,
+                    sim_mention=SIM_MENTION, sim_high=SIM_HIGH, window=WINDOW, fingerprint=current, registry=registry)
+    journal.append(row)
+    statuses[row["Status"]] += 1
+    if i % COMMIT_EVERY == 0:
+        journal.compact(store, folder=PDF_FOLDER)
+
+journal.compact(store, folder=PDF_FOLDER)
+journal.close()
+print(f"[💾] Recomputed {len(stale)} rows :: {dict(statuses)}")
+
+if args.drift:
+    drift = DriftState(drift_state_path_for(store.path))
+    _, suspects = drift.refresh(store)
+    print(f"[📈] Drift queue :: {len(drift.queued())} still pending, {len(suspects)} new flag(s)")
+    drift.close()
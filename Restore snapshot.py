@@ -0,0 +1,54 @@
+"""
+⚡ ISO27001 SNAPSHOT RESTORE ⚡
+-----------------------------
+List the incremental results-store snapshots or rebuild the store as it
+was at any point in time.
+
+  python "Restore snapshot.py" --list
+  python "Restore snapshot.py" --at "2025-11-02 18:30"
+  python "Restore snapshot.py" --at "2025-11-02 18:30" --excel
+"""
+
+import os
+import argparse
+
+from results_store import ResultsStore, store_path_for
+from snapshots import Snapshots, snapshot_dir_for
+
+# =========================
+# CONFIG
+# =========================
+EXCEL_MAIN = r"C:\Users\lenin\OneDrive\Desktop\BSE_Scraper\ISO Data Collection.xlsx"
+STORE_PATH = store_path_for(EXCEL_MAIN)
+
+parser = argparse.ArgumentParser(description="Restore the ISO results store from a snapshot")
+parser.add_argument("--list", action="store_true", help="List retained snapshots")
+parser.add_argument("--at", help="Restore the newest snapshot taken at or before this time (default: latest)")
+parser.add_argument("--out", help="Restored store path (default: <store>_restored_<time>.sqlite)")
+parser.add_argument("--excel", action="store_true", help="Also export the restored rows to a workbook")
+args = parser.parse_args()
+
+snapshots = Snapshots(snapshot_dir_for(STORE_PATH))
+
+if args.list:
+    for m in snapshots.manifests():
+        print(f"{m['created']}  rows={m['rows']:>7}  seq={m['seq']:>7}  segments={len(m['segments'])}")
+    raise SystemExit(0)
+
+manifest = snapshots.at(args.at) if args.at else snapshots.latest()
+if manifest is None:
+    raise SystemExit("[❌] No snapshot at or before that time")
+
+out = args.out or STORE_PATH.replace(".sqlite", f"_restored_{manifest['created'].replace(':', '')}.sqlite")
+if os.path.exists(out):
+    raise SystemExit(f"[❌] {out} already exists — refusing to overwrite")
+
+store = ResultsStore(out)
+print(f"[⚡] Restoring snapshot {manifest['created']} ({len(manifest['segments'])} segments)")
+print(f"[💾] {snapshots.restore(store, manifest)} records → {out}")
+
+if args.excel:
+    excel = out.replace(".sqlite", ".xlsx")
+    print(f"[📤] {store.export_excel(excel)} rows → {excel}")
+
+store.close()
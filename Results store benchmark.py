@@ -0,0 +1,73 @@
+"""
+⚡ RESULTS COMMIT BENCHMARK ⚡
+-----------------------------
+Commit latency of one 20-row batch as the table grows:
+  • Excel master : read_excel + concat + drop_duplicates + to_excel
+  • Store        : ResultsStore.commit (append-only SQLite)
+Synthetic OG-schema rows (14 domains × score/sim/snippet/reason).
+"""
+
+import os
+import time
+import random
+import tempfile
+
+import pandas as pd
+
+from iso_scoring import ISO_KEYS
+from results_store import ResultsStore
+
+# =========================
+# CONFIG
+# =========================
+BATCH = 20
+CHECKPOINTS = [0, 500, 1000, 2000, 4000]
+SEED = 7
+
+random.seed(SEED)
+WORDS = "the company has implemented access control policies and audits".split()
+
+def make_rows(start, n):
+    rows = []
+    for i in range(start, start + n):
+        row = {"Company": f"CO{i % 500}", "Year": str(2016 + i % 10), "File": f"CO{i % 500}_{i}.pdf"}
+        for k in ISO_KEYS:
+            row[f"{k}__score"] = random.randint(0, 2)
+            row[f"{k}__sim"] = round(random.random(), 4)
+            row[f"{k}__snippet"] = " ".join(random.choices(WORDS, k=30))
+            row[f"{k}__reason"] = "semantic"
+        row["Total_Score"] = sum(row[f"{k}__score"] for k in ISO_KEYS)
+        row["Status"] = "OK"
+        rows.append(row)
+    return rows
+
+tmp = tempfile.mkdtemp()
+excel_path = os.path.join(tmp, "bench.xlsx")
+store = ResultsStore(os.path.join(tmp, "bench.sqlite"))
+
+print(f"{'rows in table':>14} | {'excel commit':>13} | {'store commit':>13}")
+print("-" * 48)
+
+filled = 0
+for target in CHECKPOINTS:
+    if target > filled:
+        seed_rows = make_rows(filled, target - filled)
+        pd.DataFrame(seed_rows).to_excel(excel_path, index=False)
+        store.commit(seed_rows)
+        filled = target
+
+    batch = make_rows(filled, BATCH)
+
+    t0 = time.perf_counter()
+    master = pd.read_excel(excel_path) if os.path.exists(excel_path) else pd.DataFrame()
+    master = pd.concat([master, pd.DataFrame(batch)], ignore_index=True)
+    master.drop_duplicates(subset=["File"], keep="last", inplace=True)
+    master.to_excel(excel_path, index=False)
+    t_excel = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    store.commit(batch)
+    t_store = time.perf_counter() - t0
+
+    filled += BATCH
+    print(f"{target:>14} | {t_excel * 1000:>10.1f} ms | {t_store * 1000:>10.2f} ms")
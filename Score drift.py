@@ -0,0 +1,71 @@
+"""
+⚡ SCORE DRIFT REPORT ⚡
+-----------------------
+Year-over-year deltas, cohort z-scores and sudden jumps over the results
+store (score_drift.py). Only rows committed since the last run are read;
+flags stay open until the underlying rows change, and jump / extraction
+change suspects are queued for "Recompute stale.py --drift".
+
+  python "Score drift.py"
+  python "Score drift.py" --sectors sectors.xlsx --full
+"""
+
+import os
+import argparse
+
+import pandas as pd
+
+from results_store import ResultsStore, store_path_for
+from score_drift import DriftState, drift_state_path_for, company_years, yoy
+
+# =========================
+# CONFIG
+# =========================
+EXCEL_MAIN = r"C:\Users\lenin\OneDrive\Desktop\BSE_Scraper\ISO Data Collection.xlsx"
+DRIFT_REPORT = r"C:\Users\lenin\OneDrive\Desktop\BSE_Scraper\ISO_Score_Drift_Report.xlsx"
+
+parser = argparse.ArgumentParser(description="Score drift and outlier analytics")
+parser.add_argument("--sectors", help="Excel with Company and Sector columns (cohorts become Sector × Year; kept for later runs)")
+parser.add_argument("--full", action="store_true", help="Rebuild the compact copy from the whole store")
+parser.add_argument("--no-queue", action="store_true", help="Report only, queue nothing for re-extraction")
+args = parser.parse_args()
+
+store_path = store_path_for(EXCEL_MAIN)
+if not os.path.exists(store_path):
+    raise SystemExit(f"[⚠️] Results store not found :: {store_path}")
+store = ResultsStore(store_path)
+
+sectors = None
+if args.sectors:
+    s = pd.read_excel(args.sectors)
+    sectors = dict(zip(s["Company"].astype(str).str.strip(), s["Sector"]))
+
+drift = DriftState(drift_state_path_for(store_path), sectors=sectors)
+if args.full:
+    drift.reset()
+
+# =========================
+# REFRESH
+# =========================
+pulled, fresh = drift.refresh(store, enqueue=not args.no_queue)
+open_flags = drift.open_flags()
+queued = drift.queued()
+
+print(f"[⚡] Rows read since last run :: {pulled}")
+print(f"[⚡] New flags               :: {len(fresh)}")
+for flag, n in open_flags["Flag"].value_counts().items():
+    print(f"    {flag:<18} {n:>6} open")
+print(f"[⚡] Queued for re-extraction :: {len(queued)}")
+
+# =========================
+# REPORT
+# =========================
+deltas = yoy(company_years(drift.frame()))
+with pd.ExcelWriter(DRIFT_REPORT) as writer:
+    open_flags.drop(columns="Queue_Files").to_excel(writer, sheet_name="Flags", index=False)
+    deltas[deltas["Prev_Year"].notna()].to_excel(writer, sheet_name="YoY", index=False)
+    pd.DataFrame({"File": queued}).to_excel(writer, sheet_name="Queue", index=False)
+print(f"[💾] Drift report written :: {DRIFT_REPORT}")
+
+drift.close()
+store.close()
@@ -0,0 +1,32 @@
+"""
+⚡ ISO27001 RESIDENT ENCODER DAEMON ⚡
+------------------------------------
+Loads mpnet ONCE and keeps it resident. Scoring scripts started while this
+is running connect to it (warm_start.get_encoder) and skip the model load.
+
+  python "Scoring daemon.py"            # CPU
+  python "Scoring daemon.py" --device cuda
+
+Clients authenticate with ISO_DAEMON_KEY, or the per-user key file
+warm_start creates on first use; they only use a daemon serving the
+model (and device) they asked for.
+"""
+
+import argparse
+
+from warm_start import MODEL_NAME, DAEMON_ADDRESS, ensure_nltk, load_model, serve_encoder
+
+parser = argparse.ArgumentParser(description="Resident sentence encoder for the ISO scorers")
+parser.add_argument("--model", default=MODEL_NAME)
+parser.add_argument("--device", default="cpu")
+args = parser.parse_args()
+
+print("\n[⚡] >>> RESIDENT ENCODER DAEMON INITIALIZING <<<\n")
+
+ensure_nltk("punkt")
+
+print(f"[⚡] Loading embedding model ({args.device})")
+model = load_model(args.model, args.device)
+
+print(f"[⚡] Listening on {DAEMON_ADDRESS[0]}:{DAEMON_ADDRESS[1]} — Ctrl+C to stop\n")
+serve_encoder(args.model, args.device)
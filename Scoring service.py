@@ -0,0 +1,59 @@
+"""
+⚡ ISO27001 SCORING SERVICE ⚡
+----------------------------
+Loads the model and opens the results store ONCE, then scores PDFs submitted
+by the batch scripts (or "Submit PDFs.py") until stopped.
+
+  python "Scoring service.py" --workers 2
+"""
+
+import os
+import argparse
+
+from iso_scoring import ISO_DOMAINS, ISO_KEYS
+from evidence_index import SentenceStore
+from warm_start import MODEL_NAME, ensure_nltk, domain_matrix, get_encoder
+from scoring_service import SERVICE_HOST, SERVICE_PORT, ScoringService, serve
+from results_store import open_store, store_path_for
+from journal import WorkerJournal
+from iso_pipeline import pipeline_config
+from provenance import fingerprint
+from company_registry import scorer_registry
+
+# =========================
+# CONFIG
+# =========================
+WORK_DIR = r"C:\Users\lenin\OneDrive\Desktop\BSE_Scraper"
+EXCEL_MAIN = os.path.join(WORK_DIR, "ISO Data Collection.xlsx")
+SENTENCE_STORE = os.path.join(WORK_DIR, "sentence_store")
+
+parser = argparse.ArgumentParser(description="Persistent ISO scoring service")
+parser.add_argument("--workers", type=int, default=2, help="PDFs processed concurrently")
+parser.add_argument("--port", type=int, default=SERVICE_PORT)
+args = parser.parse_args()
+
+print("\n[⚡] >>> ISO SCORING SERVICE INITIALIZING <<<\n")
+
+ensure_nltk("punkt")
+
+print("[⚡] Loading embedding model (daemon or offline)")
+model = get_encoder(MODEL_NAME, use_daemon=False)
+iso_matrix = domain_matrix(ISO_DOMAINS.values(), model)
+
+print("[⚡] Opening results store")
+store = open_store(EXCEL_MAIN)
+journal = WorkerJournal(store_path_for(EXCEL_MAIN))
+recovered = journal.recover(store)
+if recovered:
+    print(f"[🛠] Recovered {recovered} rows from journal")
+print(f"[⚡] {len(store)} files already processed")
+
+config = pipeline_config(ISO_DOMAINS, MODEL_NAME)
+fp = store.register_config(fingerprint(config), config)
+print(f"[⚡] Config fingerprint :: {fp}")
+
+service = ScoringService(model, iso_matrix, store, ISO_KEYS, SentenceStore(SENTENCE_STORE), args.workers,
+                         journal=journal, fingerprint=fp, registry=scorer_registry())
+
+print(f"[⚡] Listening on http://{SERVICE_HOST}:{args.port} — Ctrl+C to stop\n")
+serve(service, port=args.port)
@@ -2,19 +2,21 @@
 # ISO27001 OG SCRAPPER — FINAL CPU-SAFE COLAB VERSION
 # ============================================================
 
-import os, re, time, unicodedata
+import os, re, time
 import fitz
 import torch
-import pandas as pd
-import numpy as np
 from tqdm import tqdm
 from datetime import datetime
 from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 import nltk
 from nltk.tokenize import sent_tokenize
 from openpyxl.utils.exceptions import IllegalCharacterError
 
+from iso_scoring import normalize_rows, evidence_hits, score_document
+from results_store import open_store
+from company_registry import split_name, scorer_registry, company_code
+from excel_export import control_re, sanitize_frame, write_excel
+
 # =========================
 # CONFIG
 # =========================
@@ -56,15 +58,6 @@ def log(msg):
     with open(LOG_FILE, "a", encoding="utf-8") as f:
         f.write(f"{ts} {msg}\n")
 
-# =========================
-# EXCEL SAFE STRING
-# =========================
-def excel_safe(val):
-    if not isinstance(val, str):
-        return val
-    val = unicodedata.normalize("NFKD", val)
-    return "".join(c for c in val if unicodedata.category(c)[0] != "C")
-
 # =========================
 # QUARANTINE
 # =========================
@@ -92,12 +85,6 @@ def split_sentences(text):
     text = re.sub(r"\n+", " ", text)
     return [s for s in sent_tokenize(text) if len(s.strip()) > 10][:MAX_SENTENCES]
 
-def has_evidence(sents, idx):
-    words = ["implemented","established","maintained","audit","certified",
-             "monitored","trained","reviewed","tested","assessed"]
-    lo, hi = max(0, idx-WINDOW), min(len(sents)-1, idx+WINDOW)
-    return any(any(w in sents[i].lower() for w in words) for i in range(lo, hi+1))
-
 # =========================
 # ISO DESCRIPTIONS (UNCHANGED)
 # =========================
@@ -139,21 +126,16 @@ ISO_KEYS = list(iso_descriptions.keys())
 # =========================
 log("Loading embedding model (CPU)")
 model = SentenceTransformer("all-mpnet-base-v2", device="cpu")
-iso_embeddings = model.encode(list(iso_descriptions.values()), show_progress_bar=False)
+iso_matrix = normalize_rows(model.encode(list(iso_descriptions.values()), show_progress_bar=False))
 log("Model ready")
 
 # =========================
-# LOAD EXCEL / RESUME
+# RESULTS STORE / RESUME
 # =========================
-if os.path.exists(EXCEL_PATH):
-    df_existing = pd.read_excel(EXCEL_PATH)
-    processed = set(df_existing["File"].astype(str))
-else:
-    df_existing = pd.DataFrame()
-    processed = set()
+store = open_store(EXCEL_PATH)
+registry = scorer_registry()  # Company → registry code, when the company list exists
 
-pdfs = sorted(f for f in os.listdir(PDF_FOLDER) if f.lower().endswith(".pdf"))
-pending = [p for p in pdfs if p not in processed][:BATCH_SIZE]
+pending = sorted(store.pending(PDF_FOLDER))[:BATCH_SIZE]
 
 log(f"Processing {len(pending)} PDFs")
 
@@ -179,21 +161,19 @@ for i, pdf in enumerate(tqdm(pending, desc="Scoring PDFs")):
             continue
 
         sent_emb = model.encode(sentences, batch_size=EMBED_BATCH, show_progress_bar=False)
-        sim = cosine_similarity(sent_emb, iso_embeddings)
+        result = score_document(sent_emb, iso_matrix, hits=evidence_hits(sentences), window=WINDOW,
+                                sim_mention=SIM_MENTION, sim_high=SIM_HIGH)
 
-        base, year = os.path.splitext(pdf)[0].split("_",1) if "_" in pdf else (pdf,"")
-        row = {"Company": base, "Year": year, "File": pdf}
+        year, base = split_name(pdf)
+        year = year or ""
+        row = {"Company": base, "Code": company_code(registry, base), "Year": year, "File": pdf}
         total = 0
 
         for j, key in enumerate(ISO_KEYS):
-            idx = int(np.argmax(sim[:,j]))
-            score = 0
-            if sim[idx,j] >= SIM_MENTION:
-                score = 1
-                if sim[idx,j] >= SIM_HIGH or has_evidence(sentences, idx):
-                    score = 2
+            idx = int(result.best_idx[j])
+            score = int(result.scores[j])
             row[f"{key}__score"] = score
-            row[f"{key}__sim"] = round(float(sim[idx,j]),4)
+            row[f"{key}__sim"] = round(float(result.best_sim[j]),4)
             row[f"{key}__snippet"] = sentences[idx][:200]
             row[f"{key}__reason"] = "semantic"
             total += score
@@ -209,12 +189,16 @@ for i, pdf in enumerate(tqdm(pending, desc="Scoring PDFs")):
 # =========================
 # SAVE
 # =========================
-df_new = pd.DataFrame(rows).applymap(excel_safe)
-df_final = pd.concat([df_existing, df_new], ignore_index=True)
+store.commit(rows, folder=PDF_FOLDER)
+log(f"Committed {len(rows)} rows to results store")
+
+# workbook for download from the VM — one write per run, no re-read
+# NFKD + every Unicode control/format char removed, as the old excel_safe did
+df_final = sanitize_frame(store.to_frame(), pattern=control_re(), normalize="NFKD")
 
 for attempt in range(WRITE_RETRIES):
     try:
-        df_final.to_excel(EXCEL_PATH, index=False)
+        write_excel(df_final, EXCEL_PATH, sanitize=False)
         log("Excel saved successfully")
         break
     except (IllegalCharacterError, PermissionError) as e:
@@ -223,4 +207,5 @@ for attempt in range(WRITE_RETRIES):
 else:
     raise RuntimeError("Excel write failed after retries")
 
+log(f"[⚡] Download {os.path.basename(store.path)} and run \"Merge results.py\" to fold this run into the main store")
 log("[⚡] SAFE TO CLOSE — RESUME READY")
@@ -0,0 +1,52 @@
+r"""
+⚡ ISO27001 SCORING SERVICE CLIENT ⚡
+-----------------------------------
+Thin client: hands PDFs / folders to a running "Scoring service.py" and
+streams results back. No model, no results load on this side.
+
+  python "Submit PDFs.py" "C:\path\to\Company_PDF"
+  python "Submit PDFs.py" 2019_ABC.pdf 2020_ABC.pdf --rescore
+  python "Submit PDFs.py" --view missing          # catalog view, no copying
+"""
+
+import os
+import sys
+import argparse
+
+from scoring_service import service_available, submit, stream_results, job_status
+from corpus_catalog import VIEWS, CorpusCatalog
+
+SOURCE_ROOT = r"C:\Users\lenin\OneDrive\Desktop\NSE Scraper"
+EXCEL_MAIN = r"C:\Users\lenin\OneDrive\Desktop\BSE_Scraper\ISO Data Collection.xlsx"
+
+parser = argparse.ArgumentParser(description="Submit PDFs to the ISO scoring service")
+parser.add_argument("paths", nargs="*", help="PDF files and/or folders")
+parser.add_argument("--view", choices=sorted(VIEWS), help="Submit a corpus catalog view of SOURCE_ROOT")
+parser.add_argument("--rescore", action="store_true", help="Score even if already in the results store")
+args = parser.parse_args()
+
+if args.view:
+    catalog = CorpusCatalog(SOURCE_ROOT, EXCEL_MAIN)
+    args.paths += list(catalog.paths(args.view).values())
+    catalog.close()
+if not args.paths:
+    parser.error("give PDF paths / folders or --view")
+
+if not service_available():
+    print("[❌] Scoring service not running — start \"Scoring service.py\" first")
+    sys.exit(1)
+
+job = submit([os.path.abspath(p) for p in args.paths], skip_processed=not args.rescore)
+print(f"[⚡] Job {job['job_id']} :: {job['total']} PDFs queued")
+if job.get("held"):
+    print(f"[🔒] {job['held']} PDFs skipped — claimed by another scorer")
+print()
+
+for row in stream_results(job["job_id"]):
+    print(f"[✔] {row['File']:<50} {row['Status']:<16} total={row.get('Total_Score')}")
+
+final = job_status(job["job_id"])
+if final.get("state") == "failed":
+    print(f"\n[⚠️] Job failed :: {final.get('error')} (rows stay in the service journal)")
+    sys.exit(1)
+print(f"\n[💾] {final['done']} rows committed to the results store, {final['errors']} errors")
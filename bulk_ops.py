@@ -0,0 +1,360 @@
+"""
+BULK FILE OPERATIONS
+--------------------
+Plan → execute → verify for corpus reorganisation (copies, renames).
+
+• Plan        → every copy / rename decided up front; missing sources and
+                existing targets are skipped with a reason, never clobbered
+• copies      → thread pool; reflink (copy-on-write clone) where the
+                filesystem supports it, else hardlink, else copy2 (or a
+                symlink when asked for) — always
+                into "<dst>.part" then os.replace, so a crash never leaves
+                a half-written target
+• renames     → serial, in plan order
+• journal     → fsync'd JSONL (journal.Journal): "start" before and "done"
+                after every operation, each tagged with its run id, so a
+                re-run resumes where it stopped; "done" is only trusted
+                while the operation's end state still holds on disk — a
+                copy whose source was replaced since is re-run in place
+• rollback()  → undoes the completed operations of the last run, newest first
+• report      → counts, bytes, throughput, methods, verified final state
+
+    plan = Plan()
+    plan.copy(src, dst)
+    BulkRunner(journal_path).run(plan)
+"""
+
+import os
+import time
+import uuid
+import shutil
+from collections import Counter, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from journal import Journal
+
+WORKERS = 8
+LINK_MODES = ("auto", "reflink", "hardlink", "symlink", "copy")
+FICLONE = 0x40049409  # Linux ioctl: clone src extents into dst (btrfs / xfs)
+
+Op = namedtuple("Op", ["kind", "src", "dst"])
+
+def ops_journal_path_for(name, folder):
+    """Journal for one reorganisation job, e.g. `<folder>/.Folder mover.ops.jsonl`."""
+    return os.path.join(folder, f".{name}.ops.jsonl")
+
+# =========================
+# PLAN
+# =========================
+class Plan:
+    def __init__(self):
+        self.ops = []
+        self._targets = set()
+
+    def copy(self, src, dst):
+        self._add(Op("copy", src, dst))
+
+    def rename(self, src, dst):
+        self._add(Op("rename", src, dst))
+
+    def _add(self, op):
+        self.ops.append(op)
+        self._targets.add(os.path.normcase(op.dst))
+
+    def claimed(self, dst):
+        """True when an earlier op in this plan already writes `dst`."""
+        return os.path.normcase(dst) in self._targets
+
+    def __len__(self):
+        return len(self.ops)
+
+# =========================
+# TRANSFER METHODS
+# =========================
+def _reflink(src, dst):
+    if fcntl is None:
+        raise OSError("reflink unsupported on this platform")
+    with open(src, "rb") as s, open(dst, "wb") as d:
+        fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+    shutil.copystat(src, dst)
+
+def _transfer(src, dst, mode):
+    """Materialize src at dst; returns the method that worked."""
+    tmp = dst + ".part"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    methods = {"auto": ("reflink", "hardlink", "copy")}.get(mode, (mode,))
+    for method in methods:
+        try:
+            if method == "reflink":
+                _reflink(src, tmp)
+            elif method == "hardlink":
+                os.link(src, tmp)
+            elif method == "symlink":
+                os.symlink(os.path.abspath(src), tmp)
+            else:
+                shutil.copy2(src, tmp)
+            os.replace(tmp, dst)
+            return method
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            if method == methods[-1]:
+                raise
+
+# =========================
+# RUNNER
+# =========================
+class BulkRunner:
+    def __init__(self, journal_path, workers=WORKERS, link=LINK_MODES[0], log=print):
+        if link not in LINK_MODES:
+            raise ValueError(f"link must be one of {LINK_MODES}")
+        self.journal_path = journal_path
+        self.workers = workers
+        self.link = link
+        self.log = log
+
+    def _states(self, journal, run=False):
+        """
+        (kind, src, dst) → last journaled state; with run=True only the
+        last run's operations (rollback / verify scope).
+        """
+        records = [r for r in journal.replay() if "kind" in r]
+        if run and records:
+            last = records[-1].get("run")
+            records = [r for r in records if r.get("run") == last]
+        return {(r["kind"], r["src"], r["dst"]): r["state"] for r in records}
+
+    @staticmethod
+    def _run_id(journal):
+        """Continue the last run when it never finished, else start a new one."""
+        records = journal.replay()
+        if records and records[-1].get("state") != "end":
+            last = next((r["run"] for r in reversed(records) if r.get("run")), None)
+            if last:
+                return last
+        return uuid.uuid4().hex[:12]
+
+    @staticmethod
+    def _landed(op):
+        """op's end state holds on disk — for copies, dst is (a link to / a copy of) the current src."""
+        if not os.path.exists(op.dst):
+            return False
+        if op.kind == "rename":
+            return not os.path.exists(op.src)
+        if not os.path.exists(op.src):
+            return False
+        if os.path.samefile(op.src, op.dst):  # hardlink, or symlink to src
+            return True
+        if os.path.islink(op.dst):
+            return False  # symlink to some other file
+        s, d = os.stat(op.src), os.stat(op.dst)
+        # copy2 / reflink keep mtime, so a replaced source shows up even at the same size
+        return s.st_size == d.st_size and int(s.st_mtime) == int(d.st_mtime)
+
+    def run(self, plan, dry_run=False):
+        """Execute (or with dry_run, only classify) the plan. Returns a report dict."""
+        journal = Journal(self.journal_path)
+        states = self._states(journal)
+        run = self._run_id(journal)
+        # targets this journal wrote as copies — ours to overwrite when stale
+        ours = {dst for (kind, _, dst), state in states.items() if kind == "copy" and state in ("done", "start")}
+        status, methods = Counter(), Counter()
+        todo, skipped = [], []
+
+        for op in plan.ops:
+            state = states.get(tuple(op))
+            if state == "done" and self._landed(op):
+                status["resumed"] += 1
+            elif state == "start" and self._landed(op):
+                # crashed after the filesystem change but before "done" was journaled
+                journal.append({**op._asdict(), "state": "done", "method": "resumed", "run": run})
+                status["resumed"] += 1
+            elif not os.path.exists(op.src):
+                skipped.append((op, "missing source"))
+            elif op.kind == "copy" and op.dst in ours and os.path.lexists(op.dst):
+                # our own earlier copy / link, but the source changed (or moved) since: replace it
+                todo.append(op)
+                status["replaced"] += 1
+            elif os.path.exists(op.dst):
+                skipped.append((op, "target exists"))
+            else:
+                todo.append(op)
+        status["skipped"] = len(skipped)
+
+        if dry_run:
+            journal.close()
+            return self._report(plan, status, methods, 0, 0.0, skipped, todo)
+
+        t0 = time.perf_counter()
+        nbytes = 0
+
+        def do(op):
+            journal.append({**op._asdict(), "state": "start", "run": run})
+            try:
+                if op.kind == "copy":
+                    os.makedirs(os.path.dirname(op.dst) or ".", exist_ok=True)
+                    method = _transfer(op.src, op.dst, self.link)
+                else:
+                    os.rename(op.src, op.dst)
+                    method = "rename"
+            except OSError as e:
+                journal.append({**op._asdict(), "state": "failed", "error": str(e), "run": run})
+                return op, None, str(e)
+            journal.append({**op._asdict(), "state": "done", "method": method, "run": run})
+            return op, method, None
+
+        copies = [op for op in todo if op.kind == "copy"]
+        renames = [op for op in todo if op.kind == "rename"]
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            results = list(pool.map(do, copies))
+        results += [do(op) for op in renames]
+
+        failed = []
+        for op, method, error in results:
+            if error:
+                failed.append((op, error))
+                status["failed"] += 1
+                continue
+            status["done"] += 1
+            methods[method] += 1
+            if op.kind == "copy":
+                nbytes += os.path.getsize(op.dst)
+
+        elapsed = time.perf_counter() - t0
+        journal.append({"state": "end", "run": run})
+        journal.close()
+        return self._report(plan, status, methods, nbytes, elapsed, skipped + failed)
+
+    def rollback(self):
+        """Undo the last run's completed, not yet undone operations (newest first)."""
+        journal = Journal(self.journal_path)
+        records = journal.replay()
+        run = next((r.get("run") for r in reversed(records) if "kind" in r), None)
+        states = self._states(journal, run=True)
+        undone = Counter()
+        for (kind, src, dst), state in reversed(list(states.items())):
+            if state != "done":
+                continue
+            try:
+                if kind == "copy" and os.path.lexists(dst):
+                    os.remove(dst)
+                elif kind == "rename" and os.path.exists(dst) and not os.path.exists(src):
+                    os.rename(dst, src)
+                else:
+                    continue
+            except OSError as e:
+                self.log(f"[⚠️] Rollback failed :: {dst} ({e})")
+                continue
+            journal.append({"kind": kind, "src": src, "dst": dst, "state": "undone", "run": run})
+            undone[kind] += 1
+        journal.append({"state": "end", "run": run})
+        journal.close()
+        return dict(undone)
+
+    def prune(self, keep):
+        """
+        Remove targets of this journal's completed copies that are not in
+        `keep` (dst paths) — only symlinks, and hardlinks whose data still
+        has another link, so no file's last copy is ever deleted. Returns
+        how many were removed.
+        """
+        journal = Journal(self.journal_path)
+        states = self._states(journal)
+        run = self._run_id(journal)
+        keep = {os.path.normcase(os.path.abspath(k)) for k in keep}
+        removed = 0
+        for (kind, src, dst), state in states.items():
+            if kind != "copy" or state != "done" or os.path.normcase(os.path.abspath(dst)) in keep:
+                continue
+            try:
+                linked = os.path.islink(dst) or os.stat(dst).st_nlink > 1
+                if not linked:
+                    continue
+                os.remove(dst)
+            except OSError:
+                continue
+            journal.append({"kind": kind, "src": src, "dst": dst, "state": "pruned", "run": run})
+            removed += 1
+        journal.close()
+        return removed
+
+    # =========================
+    # REPORT
+    # =========================
+    def verify(self):
+        """Completed ops of the last run whose expected end state does not hold on disk."""
+        journal = Journal(self.journal_path)
+        states = self._states(journal, run=True)
+        journal.close()
+        bad = []
+        for (kind, src, dst), state in states.items():
+            if state != "done":
+                continue
+            op = Op(kind, src, dst)
+            if kind == "copy" and os.path.exists(src):
+                ok = self._landed(op)
+            else:
+                ok = os.path.exists(dst) and (kind == "copy" or not os.path.exists(src))
+            if not ok:
+                bad.append(op)
+        return bad
+
+    def _report(self, plan, status, methods, nbytes, elapsed, problems, pending=()):
+        return {
+            "planned": len(plan),
+            "status": dict(status),
+            "methods": dict(methods),
+            "bytes": nbytes,
+            "seconds": elapsed,
+            "mb_per_s": nbytes / 1e6 / elapsed if elapsed else 0.0,
+            "files_per_s": status["done"] / elapsed if elapsed else 0.0,
+            "problems": problems,
+            "pending": list(pending),
+            "unverified": [] if pending else self.verify(),
+        }
+
+def print_report(report, log=print, limit=20):
+    s = report["status"]
+    log(f"Planned operations : {report['planned']}")
+    log(f"Done               : {s.get('done', 0)}  (resumed {s.get('resumed', 0)})")
+    log(f"Skipped / failed   : {s.get('skipped', 0)} / {s.get('failed', 0)}")
+    if s.get("replaced"):
+        log(f"Replaced           : {s['replaced']} (source changed since the last run)")
+    if report["pending"]:
+        log(f"Would run          : {len(report['pending'])} (dry run)")
+    if report["methods"]:
+        log(f"Methods            : {', '.join(f'{k} {v}' for k, v in report['methods'].items())}")
+    if report["seconds"]:
+        log(f"Throughput         : {report['bytes'] / 1e6:.1f} MB in {report['seconds']:.2f}s "
+            f"({report['mb_per_s']:.1f} MB/s, {report['files_per_s']:.1f} files/s)")
+    log(f"Final state        : {'verified' if not report['unverified'] else str(len(report['unverified'])) + ' op(s) NOT in expected state'}")
+    for op, reason in report["problems"][:limit]:
+        log(f"   - {op.kind} {os.path.basename(op.src)} → {os.path.basename(op.dst)} :: {reason}")
+    if len(report["problems"]) > limit:
+        log("   ...")
+
+# =========================
+# CLI GLUE
+# =========================
+def add_arguments(parser):
+    parser.add_argument("--dry-run", action="store_true", help="Plan and report, touch nothing")
+    parser.add_argument("--rollback", action="store_true", help="Undo the journaled operations")
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--link", choices=LINK_MODES, default=LINK_MODES[0],
+                        help="How copies are made (auto = reflink, then hardlink, then copy)")
+
+def execute(plan_fn, journal_path, args, log=print):
+    """Shared --rollback / --dry-run / run flow for the reorganisation scripts."""
+    runner = BulkRunner(journal_path, workers=args.workers, link=args.link, log=log)
+    if args.rollback:
+        log(f"[🛠] Rolled back :: {runner.rollback() or 'nothing'}")
+        return None
+    report = runner.run(plan_fn(), dry_run=args.dry_run)
+    print_report(report, log)
+    return report
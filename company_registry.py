@@ -0,0 +1,269 @@
+"""
+COMPANY REGISTRY
+----------------
+One indexed table of company identities, shared by the renaming tools,
+the scorers and the reconciliation index.
+
+• companies → scrip code (key), canonical name, ISIN
+• aliases   → every known spelling (code, current and former names, ISIN,
+              folder names), normalized, each pointing at one code
+• resolve(token) → code in one key lookup, whatever the token is
+• split_name / parse → (year, token) for both "<year>_<company>.pdf"
+  (scraper) and "<company>_<year>.pdf" (ISO Maker) file names
+• render(code, year) → the canonical file name; rename(code, new) is a
+  metadata update — the old name stays an alias, so old files still resolve
+• imported from "All company list.xlsx" (code, name[, ISIN]), only again
+  when the Excel changes
+• scorers stamp a "Code" column next to Company (scorer_registry +
+  company_code), so results join the registry on the key
+
+    registry = open_registry(EXCEL_COMPANIES)
+    year, code, name = registry.parse("2019_500325.pdf")
+    registry.render(code, year)          # "2019_Reliance Industries Ltd.pdf"
+"""
+
+import os
+import re
+import sqlite3
+from collections import namedtuple
+
+import pandas as pd
+
+YEAR_FIRST_RE = re.compile(r"^(?P<year>(?:19|20)\d{2})[_\s-]+(?P<token>.+)$")
+YEAR_LAST_RE = re.compile(r"^(?P<token>.+?)[_\s-]+(?P<year>(?:19|20)\d{2})$")
+UNSAFE_RE = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+
+COMPANY_LIST = os.environ.get("ISO_COMPANY_LIST", r"C:\Users\lenin\OneDrive\Desktop\All company list.xlsx")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS companies (
+    code TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    isin TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_companies_isin ON companies(isin);
+
+CREATE TABLE IF NOT EXISTS aliases (
+    alias TEXT PRIMARY KEY,
+    code  TEXT NOT NULL,
+    kind  TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_aliases_code ON aliases(code);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+Company = namedtuple("Company", ["code", "name", "isin"])
+Parsed = namedtuple("Parsed", ["year", "code", "name"])
+
+def registry_path_for(excel_path):
+    """`All company list.xlsx` → `All company list.registry.sqlite`."""
+    return os.path.splitext(excel_path)[0] + ".registry.sqlite"
+
+def norm(token):
+    """Alias key: casefolded, punctuation and runs of spaces collapsed."""
+    return " ".join(re.sub(r"[^\w&]+", " ", str(token).casefold()).split())
+
+def clean_code(code):
+    """Scrip codes as text; Excel's 500325.0 → "500325"."""
+    code = str(code).strip()
+    return code[:-2] if code.endswith(".0") and code[:-2].isdigit() else code
+
+def safe_name(name):
+    """Company name usable as a file / folder name on Windows."""
+    return " ".join(UNSAFE_RE.sub(" ", str(name)).split()).rstrip(". ")
+
+def split_name(name):
+    """
+    (year, token) from a PDF name in either order — "<year>_<token>.pdf" or
+    "<token>_<year>.pdf". year is None when neither end is a year.
+    """
+    stem = os.path.splitext(os.path.basename(str(name)).strip())[0].strip()
+    m = YEAR_FIRST_RE.match(stem) or YEAR_LAST_RE.match(stem)
+    if not m:
+        return None, stem
+    return m.group("year"), m.group("token").strip()
+
+
+class CompanyRegistry:
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self._aliases = None
+
+    def close(self):
+        self.conn.close()
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM companies").fetchone()[0]
+
+    def __contains__(self, token):
+        return self.resolve(token) is not None
+
+    # =========================
+    # WRITE
+    # =========================
+    def _upsert(self, code, name, isin=None, extra=()):
+        code, name = clean_code(code), str(name).strip()
+        isin = str(isin).strip().upper() if isin is not None and str(isin).strip() not in ("", "nan") else None
+        prev = self.conn.execute("SELECT name FROM companies WHERE code = ?", (code,)).fetchone()
+        self.conn.execute(
+            """INSERT INTO companies (code, name, isin) VALUES (?, ?, ?)
+               ON CONFLICT(code) DO UPDATE SET name = excluded.name,
+                                               isin = COALESCE(excluded.isin, companies.isin)""",
+            (code, name, isin))
+        aliases = [(code, "code"), (name, "name"), (safe_name(name), "name")]
+        if isin:
+            aliases.append((isin, "isin"))
+        if prev and prev[0] != name:
+            aliases.append((prev[0], "former"))
+        aliases += [(a, "manual") for a in extra]
+        self.conn.executemany("INSERT OR REPLACE INTO aliases (alias, code, kind) VALUES (?, ?, ?)",
+                              [(norm(a), code, kind) for a, kind in aliases if norm(a)])
+
+    def upsert(self, code, name, isin=None, aliases=()):
+        with self.conn:
+            self._upsert(code, name, isin, aliases)
+        self._aliases = None
+
+    def rename(self, code, new_name):
+        """New canonical name for `code`; the current one is kept as an alias."""
+        current = self.get(code)
+        if current is None:
+            raise KeyError(code)
+        self.upsert(current.code, new_name)
+
+    def add_alias(self, alias, code, kind="manual"):
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO aliases (alias, code, kind) VALUES (?, ?, ?)",
+                              (norm(alias), clean_code(code), kind))
+        self._aliases = None
+
+    def import_frame(self, df, code_col=0, name_col=1, isin_col=None):
+        """Columns by position or label; one transaction. Returns the row count."""
+        pick = lambda c: df.iloc[:, c] if isinstance(c, int) else df[c]
+        codes, names = pick(code_col), pick(name_col)
+        isins = pick(isin_col) if isin_col is not None else [None] * len(df)
+        n = 0
+        with self.conn:
+            for code, name, isin in zip(codes, names, isins):
+                if pd.isna(code) or pd.isna(name) or not str(name).strip():
+                    continue
+                self._upsert(code, name, None if pd.isna(isin) else isin)
+                n += 1
+        self._aliases = None
+        return n
+
+    def import_excel(self, excel_path, force=False):
+        """
+        Load "All company list.xlsx" (first column code, second name, any
+        column headed ISIN). Skipped when the file is unchanged since the
+        last import; returns the number of rows imported.
+        """
+        st = os.stat(excel_path)
+        stamp = f"{st.st_size}:{st.st_mtime}"
+        if not force and self.meta("excel_stamp") == stamp and len(self):
+            return 0
+        df = pd.read_excel(excel_path, dtype=str)
+        isin = next((c for c in df.columns if "isin" in str(c).lower()), None)
+        n = self.import_frame(df, 0, 1, isin)
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('excel_stamp', ?)", (stamp,))
+        return n
+
+    def meta(self, key, default=None):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    # =========================
+    # LOOKUP
+    # =========================
+    @property
+    def aliases(self):
+        """{normalized alias: code}, read once and cached until the next write."""
+        if self._aliases is None:
+            self._aliases = dict(self.conn.execute("SELECT alias, code FROM aliases"))
+        return self._aliases
+
+    def resolve(self, token):
+        """Code for a code / name / former name / ISIN / alias, else None."""
+        return self.aliases.get(norm(token))
+
+    def get(self, token):
+        code = self.resolve(token)
+        if code is None:
+            return None
+        row = self.conn.execute("SELECT code, name, isin FROM companies WHERE code = ?", (code,)).fetchone()
+        return Company(*row) if row else None
+
+    def name(self, token):
+        company = self.get(token)
+        return company.name if company else None
+
+    def mapping(self):
+        """{code: canonical name}."""
+        return dict(self.conn.execute("SELECT code, name FROM companies"))
+
+    def frame(self):
+        return pd.read_sql_query("SELECT code, name, isin FROM companies ORDER BY code", self.conn)
+
+    def attach(self, df, column="Company", out="Code"):
+        """Copy of df with `out` = code resolved from `column` (one dict lookup per row)."""
+        df = df.copy()
+        df[out] = df[column].map(lambda v: None if pd.isna(v) else self.aliases.get(norm(v)))
+        return df
+
+    # =========================
+    # FILE NAMES
+    # =========================
+    def parse(self, filename):
+        """Parsed(year, code, name); code is None when the company is unknown."""
+        year, token = split_name(filename)
+        company = self.get(token)
+        if company is None:
+            return Parsed(year, None, token)
+        return Parsed(year, company.code, company.name)
+
+    def render(self, code, year, style="name"):
+        """Canonical "<year>_<name>.pdf" (or "<year>_<code>.pdf" with style="code")."""
+        company = self.get(code)
+        if company is None:
+            raise KeyError(code)
+        return f"{year}_{company.code if style == 'code' else safe_name(company.name)}.pdf"
+
+    def folder(self, code):
+        """Canonical per-company folder name in the scraper tree."""
+        company = self.get(code)
+        if company is None:
+            raise KeyError(code)
+        return safe_name(company.name)
+
+def open_registry(excel_path):
+    """Registry next to the company list, refreshed from it when the Excel changed."""
+    registry = CompanyRegistry(registry_path_for(excel_path))
+    if os.path.exists(excel_path):
+        registry.import_excel(excel_path)
+    return registry
+
+def scorer_registry(excel_path=COMPANY_LIST):
+    """
+    Registry the scorers resolve Company through, or None when neither the
+    company list nor its registry exists. The alias map is loaded here, so
+    company_code() is a dict lookup safe from worker threads.
+    """
+    if not (os.path.exists(excel_path) or os.path.exists(registry_path_for(excel_path))):
+        return None
+    registry = open_registry(excel_path)
+    registry.aliases
+    return registry
+
+def company_code(registry, token):
+    """Registry code for a file-name company token; None without a registry or match."""
+    if registry is None or not token:
+        return None
+    return registry.resolve(token)
@@ -0,0 +1,110 @@
+"""
+CORPUS CATALOG
+--------------
+Flat, filtered views over the PDFs where they already live
+(NSE Scraper/<company>/<year>_<company>.pdf) — nothing is copied.
+
+• built on corpus_index.CorpusIndex (recursive scandir + one results read)
+• views     → "all", "unprocessed", "missing" (fills a company-year with no
+              result yet), "failed" (stored with a failure status); new
+              views register in VIEWS
+• paths()   → {flat name: real path}, accepted directly by the scorers
+              (ISO Maker CATALOG_VIEW, Submit PDFs --view, store.commit folder=)
+• materialize() → the same view as a generated hardlink / symlink tree,
+              via bulk_ops (journaled, reversible); stale links this view
+              created are pruned, nothing else in the folder is touched
+• flat-name collisions (same file name in two company folders) keep the
+  first path in sorted order and are reported by collisions()
+"""
+
+import os
+
+import numpy as np
+
+from corpus_index import CorpusIndex
+from bulk_ops import Plan, BulkRunner, ops_journal_path_for
+
+FAILED_STATUSES = {"PDF_READ_FAILED", "NO_TEXT", "NO_SENTENCES"}
+
+# =========================
+# VIEWS (frame → bool mask over on-disk rows)
+# =========================
+def _all(catalog, f):
+    return f["On_Disk"]
+
+def _unprocessed(catalog, f):
+    return f["On_Disk"] & ~f["In_Results"]
+
+def _missing(catalog, f):
+    covered = catalog.covered()
+    pairs = zip(f["company"].fillna("").str.lower(), f["year"].fillna(""))
+    return f["On_Disk"] & ~f["In_Results"] & np.array([p not in covered for p in pairs], dtype=bool)
+
+def _failed(catalog, f):
+    return f["On_Disk"] & f["Status"].astype(str).str.strip().isin(FAILED_STATUSES)
+
+VIEWS = {
+    "all": _all,
+    "unprocessed": _unprocessed,
+    "missing": _missing,
+    "failed": _failed,
+}
+
+
+class CorpusCatalog:
+    def __init__(self, source_root, results=None, index_path=None):
+        self.source_root = source_root
+        self.index = CorpusIndex(source_root, results, path=index_path, hash_files=False, recursive=True)
+        self.index.refresh()
+
+    def close(self):
+        self.index.close()
+
+    def covered(self):
+        """{(company lower, year)} that already have a result."""
+        res = self.index.stored[["Company", "Year"]].dropna().astype(str)
+        return set(zip(res["Company"].str.strip().str.lower(), res["Year"].str.strip()))
+
+    def collisions(self):
+        files = self.index.files()
+        return files[files["norm"].duplicated(keep=False)].sort_values("norm")
+
+    # =========================
+    # VIEWS
+    # =========================
+    def view(self, name="all"):
+        """Rows of the reconciled frame in view `name`, sorted by flat name."""
+        if name not in VIEWS:
+            raise ValueError(f"unknown view {name!r} (known: {', '.join(VIEWS)})")
+        f = self.index.frame()
+        return f[VIEWS[name](self, f)].sort_values("name")
+
+    def paths(self, name="all"):
+        """{flat file name: real path} for view `name`."""
+        v = self.view(name)
+        return dict(zip(v["name"], v["path"]))
+
+    def __iter__(self):
+        return iter(self.paths().values())
+
+    # =========================
+    # LINK TREES
+    # =========================
+    def materialize(self, name, dest, mode="hardlink", workers=8, prune=True):
+        """
+        Generate `dest` as a flat tree of links for view `name`; links whose
+        source was replaced or moved since the last run are re-made.
+        Returns the bulk_ops report (plus "pruned").
+        """
+        os.makedirs(dest, exist_ok=True)
+        wanted = self.paths(name)
+
+        plan = Plan()
+        for flat, src in wanted.items():
+            plan.copy(src, os.path.join(dest, flat))
+        # one journal per generated tree: only links it created are ever pruned
+        runner = BulkRunner(ops_journal_path_for("view", dest), workers=workers, link=mode)
+        pruned = runner.prune([op.dst for op in plan.ops]) if prune else 0
+        report = runner.run(plan)
+        report["pruned"] = pruned
+        return report
@@ -0,0 +1,208 @@
+"""
+CORPUS RECONCILIATION INDEX
+---------------------------
+One shared view of "what is on disk" against "what has been scored".
+
+• one os.scandir pass over the PDF folder (optionally recursive)
+• one read of the results store (or the master Excel when there is none)
+• per file: name, normalized name, size, mtime, sha256, company / year
+  parsed from the file name (company_registry.split_name), and the stored Status
+• persisted in a small SQLite file; refresh() only re-stats the folder and
+  re-hashes files whose size / mtime changed (hashes already recorded by
+  the results store are reused)
+
+    index = CorpusIndex(PDF_FOLDER, EXCEL_MAIN)
+    index.not_processed()      # on disk, never scored
+    index.missing_on_disk()    # scored, PDF gone
+    index.with_status({"NO_TEXT"})
+"""
+
+import os
+import sqlite3
+
+import pandas as pd
+
+from company_registry import split_name
+from results_store import KEY_COLUMNS, ResultsStore, content_hash, file_key, store_path_for
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    rel_path TEXT PRIMARY KEY,
+    name     TEXT NOT NULL,
+    norm     TEXT NOT NULL,
+    size     INTEGER,
+    mtime    REAL,
+    sha256   TEXT,
+    company  TEXT,
+    year     TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_files_norm ON files(norm);
+"""
+
+COLUMNS = ["rel_path", "name", "norm", "size", "mtime", "sha256", "company", "year"]
+
+def index_path_for(folder):
+    """`...\\Company_PDF` → `...\\Company_PDF.index.sqlite` next to the folder."""
+    return os.path.normpath(folder) + ".index.sqlite"
+
+def parse_name(name):
+    """(year, company) from "<year>_<company>.pdf" or "<company>_<year>.pdf", else (None, None)."""
+    year, company = split_name(name)
+    return (year, company) if year else (None, None)
+
+def _scan(root, recursive):
+    """Yield (rel_path, DirEntry) for every PDF under `root`."""
+    stack = [root]
+    while stack:
+        folder = stack.pop()
+        with os.scandir(folder) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        stack.append(entry.path)
+                elif entry.name.lower().endswith(".pdf"):
+                    yield os.path.relpath(entry.path, root), entry
+
+
+class CorpusIndex:
+    def __init__(self, folder, results=None, path=None, hash_files=True, recursive=False):
+        """
+        `results` is the master Excel path (its .sqlite store is preferred
+        when present), a ResultsStore, or None for a disk-only index.
+        """
+        self.folder = folder
+        self.results = results
+        self.hash_files = hash_files
+        self.recursive = recursive
+        self.path = path or index_path_for(folder)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self._results = None
+        self._frame = None
+        self._names = None
+
+    def close(self):
+        self.conn.close()
+
+    # =========================
+    # RESULTS (ONE READ)
+    # =========================
+    def _load_results(self):
+        """Latest result per normalized File as a DataFrame indexed by norm."""
+        cols = ["norm"] + KEY_COLUMNS + ["size", "mtime", "sha256"]
+        src = self.results
+        if src is None:
+            return pd.DataFrame(columns=cols).set_index("norm")
+
+        if isinstance(src, ResultsStore):
+            rows = src.summary()
+        elif os.path.exists(store_path_for(src)):
+            store = ResultsStore(store_path_for(src))
+            rows = store.summary()
+            store.close()
+        else:
+            df = pd.read_excel(src, dtype={"Year": str})
+            df = df.reindex(columns=KEY_COLUMNS)
+            df = df[df["File"].notna()]
+            df.insert(0, "norm", df["File"].map(file_key))
+            df["size"] = df["mtime"] = df["sha256"] = None
+            return df.drop_duplicates("norm", keep="last").set_index("norm")
+        return pd.DataFrame(rows, columns=cols).set_index("norm")
+
+    @property
+    def stored(self):
+        if self._results is None:
+            self._results = self._load_results()
+        return self._results
+
+    # =========================
+    # FILESYSTEM (INCREMENTAL)
+    # =========================
+    def refresh(self):
+        """
+        Re-stat the folder in one scandir pass and update the index.
+        Returns (added, changed, removed) counts.
+        """
+        known = {r[0]: r for r in self.conn.execute("SELECT rel_path, size, mtime, sha256 FROM files")}
+        stored = self.stored
+        seen, upserts, added, changed = set(), [], 0, 0
+
+        for rel, entry in _scan(self.folder, self.recursive):
+            seen.add(rel)
+            st = entry.stat()
+            prev = known.get(rel)
+            if prev is not None and (prev[1], prev[2]) == (st.st_size, st.st_mtime) \
+                    and (prev[3] or not self.hash_files):
+                continue
+
+            norm = file_key(entry.name)
+            sha = None
+            if self.hash_files:
+                hit = stored.loc[norm] if norm in stored.index else None
+                if hit is not None and (hit["size"], hit["mtime"]) == (st.st_size, st.st_mtime) and hit["sha256"]:
+                    sha = hit["sha256"]
+                else:
+                    try:
+                        sha = content_hash(entry.path)
+                    except OSError:
+                        sha = None
+            year, company = parse_name(entry.name)
+            upserts.append((rel, entry.name, norm, st.st_size, st.st_mtime, sha, company, year))
+            added += prev is None
+            changed += prev is not None
+
+        removed = set(known) - seen
+        with self.conn:
+            self.conn.executemany(f"INSERT OR REPLACE INTO files VALUES ({', '.join('?' * len(COLUMNS))})",
+                                  upserts)
+            self.conn.executemany("DELETE FROM files WHERE rel_path = ?", [(r,) for r in removed])
+        self._frame = self._names = None
+        return added, changed, len(removed)
+
+    def files(self):
+        """Every indexed PDF on disk as a DataFrame."""
+        return pd.read_sql_query(f"SELECT {', '.join(COLUMNS)} FROM files", self.conn)
+
+    # =========================
+    # RECONCILED VIEW
+    # =========================
+    def frame(self):
+        """
+        Outer join of disk and results on the normalized name.
+        On_Disk / In_Results flag which side each row came from.
+        """
+        if self._frame is None:
+            disk = self.files().sort_values("rel_path").drop_duplicates("norm").set_index("norm")
+            res = self.stored[KEY_COLUMNS]
+            out = disk.join(res, how="outer")
+            out["On_Disk"] = out.index.isin(disk.index)
+            out["In_Results"] = out.index.isin(res.index)
+            out["path"] = [os.path.join(self.folder, r) if isinstance(r, str) else None
+                           for r in out["rel_path"]]
+            self._frame = out.rename_axis("norm").reset_index()
+        return self._frame
+
+    def not_processed(self):
+        f = self.frame()
+        return f[f["On_Disk"] & ~f["In_Results"]]
+
+    def missing_on_disk(self):
+        f = self.frame()
+        return f[f["In_Results"] & ~f["On_Disk"]]
+
+    def processed_on_disk(self):
+        f = self.frame()
+        return f[f["On_Disk"] & f["In_Results"]]
+
+    def with_status(self, statuses):
+        f = self.processed_on_disk()
+        return f[f["Status"].astype(str).str.strip().isin(set(statuses))]
+
+    def lookup(self, company, year):
+        """Path of "<year>_<company>.pdf" (parsed, case-insensitive) or None."""
+        if self._names is None:
+            f = self.frame()
+            f = f[f["On_Disk"] & f["company"].notna()]
+            self._names = dict(zip(zip(f["company"].str.lower(), f["year"]), f["path"]))
+        return self._names.get((str(company).strip().lower(), str(year).strip()))
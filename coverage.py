@@ -0,0 +1,185 @@
+"""
+COMPANY × YEAR COVERAGE
+-----------------------
+Bit-packed coverage matrix built in one pass over (Company, Year) pairs.
+
+• matrix  → bool[companies, years], one vectorized scatter (no per-company filter)
+• masks   → uint64 words per company, bit i of word w = years[64 w + i]
+  present (one word up to 64 years)
+• years far outside the expected window (typos like 2202 or 202) are
+  dropped with a warning instead of widening the matrix to span them
+• missing / gaps / completeness tiers are whole-matrix NumPy ops
+• complete_for(start, end) → companies with every year in the window,
+  answered from the masks alone (one AND + compare), no rescan
+• save / load as .npz so later queries skip the results read entirely;
+  an optional watermark (e.g. the store's max_seq) is saved alongside so
+  callers can tell when the cache is stale
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+
+# completeness ratio (over the expected window) → tier, checked top-down
+TIERS = [(1.0, "COMPLETE"), (0.8, "HIGH"), (0.5, "PARTIAL"), (0.0, "SPARSE")]
+
+YEAR_MARGIN = 10  # observed years kept this far outside the expected window
+PLAUSIBLE_YEARS = (1950, 2100)  # bounds when no window is given
+
+
+class Coverage:
+    def __init__(self, companies, years, matrix, expected=None, watermark=None):
+        self.companies = np.asarray(companies, dtype=object)
+        self.years = np.asarray(years, dtype=np.int64)
+        self.matrix = np.asarray(matrix, dtype=bool)
+        if expected is None:
+            expected = (int(self.years.min()), int(self.years.max())) if len(self.years) else (0, -1)
+        self.expected = tuple(expected)
+        self.watermark = watermark  # state of the results this was built from, if known
+        self.masks = self._pack(self.matrix)
+
+    # =========================
+    # BUILD
+    # =========================
+    @classmethod
+    def from_pairs(cls, companies, years, expected=None):
+        """
+        `companies` / `years` are parallel sequences (years as int or str).
+        `expected` = (first, last) year window; the matrix spans it plus any
+        year observed within YEAR_MARGIN of it (PLAUSIBLE_YEARS without a
+        window). Years beyond that are dropped with a warning.
+        """
+        company = pd.Series(companies).astype("string").str.strip()
+        year = pd.Series(years)
+        if not pd.api.types.is_numeric_dtype(year):
+            year = year.astype("string").str.strip()
+        year = pd.to_numeric(year, errors="coerce")
+
+        rows, names = pd.factorize(company, sort=True)
+        keep = rows >= 0
+        rows, year = rows[keep], year[keep]
+
+        lo, hi = ((expected[0] - YEAR_MARGIN, expected[1] + YEAR_MARGIN) if expected else PLAUSIBLE_YEARS)
+        outside = (year.notna() & ((year < lo) | (year > hi))).to_numpy()
+        if outside.any():
+            bad = sorted(set(year[outside].astype(int)))
+            warnings.warn(f"coverage: ignoring {int(outside.sum())} row(s) with years outside "
+                          f"{lo}–{hi}: {bad[:10]}{' ...' if len(bad) > 10 else ''}")
+            rows, year = rows[~outside], year[~outside]
+
+        bounds = list(year.dropna().astype(int).agg(["min", "max"])) if year.notna().any() else []
+        bounds += list(expected or [])
+        lo, hi = (min(bounds), max(bounds)) if bounds else (0, -1)
+        span = np.arange(lo, hi + 1, dtype=np.int64)
+
+        matrix = np.zeros((len(names), len(span)), dtype=bool)
+        has_year = year.notna().to_numpy()
+        matrix[rows[has_year], year[has_year].astype(int).to_numpy() - lo] = True
+        return cls(np.asarray(names, dtype=object), span, matrix, expected)
+
+    @classmethod
+    def from_frame(cls, df, expected=None, company="Company", year="Year"):
+        return cls.from_pairs(df[company], df[year], expected)
+
+    @staticmethod
+    def _pack(matrix):
+        """uint64[rows, words]: bit i of word w = column 64 w + i."""
+        words = max(1, -(-matrix.shape[1] // 64))
+        padded = np.zeros((matrix.shape[0], words * 64), dtype=np.uint64)
+        padded[:, :matrix.shape[1]] = matrix
+        weights = np.left_shift(np.uint64(1), np.arange(64, dtype=np.uint64))
+        return (padded.reshape(matrix.shape[0], words, 64) * weights).sum(axis=2, dtype=np.uint64)
+
+    # =========================
+    # WINDOWS
+    # =========================
+    def _window(self, start=None, end=None):
+        start = self.expected[0] if start is None else int(start)
+        end = self.expected[1] if end is None else int(end)
+        cols = (self.years >= start) & (self.years <= end)
+        return cols, end - start + 1
+
+    def window_mask(self, start=None, end=None):
+        cols, _ = self._window(start, end)
+        return self._pack(cols[None, :])[0]
+
+    def complete_for(self, start=None, end=None):
+        """Companies with a result for every year in [start, end]."""
+        cols, width = self._window(start, end)
+        if cols.sum() < width:  # window reaches outside the matrix → nobody can be complete
+            return []
+        want = self.window_mask(start, end)
+        return list(self.companies[((self.masks & want) == want).all(axis=1)])
+
+    # =========================
+    # METRICS
+    # =========================
+    def missing(self, start=None, end=None):
+        """bool[companies, window years] — True where a company-year is missing."""
+        cols, _ = self._window(start, end)
+        return ~self.matrix[:, cols], self.years[cols]
+
+    def gaps(self):
+        """Interior holes: missing years between a company's first and last present year."""
+        present = self.matrix
+        seen_before = np.logical_or.accumulate(present, axis=1)
+        seen_after = np.logical_or.accumulate(present[:, ::-1], axis=1)[:, ::-1]
+        return ~present & seen_before & seen_after
+
+    def completeness(self, start=None, end=None):
+        cols, width = self._window(start, end)
+        return self.matrix[:, cols].sum(axis=1) / width
+
+    def tiers(self, start=None, end=None):
+        ratio = self.completeness(start, end)
+        out = np.full(len(ratio), TIERS[-1][1], dtype=object)
+        for threshold, name in reversed(TIERS):
+            out[ratio >= threshold] = name
+        return out
+
+    # =========================
+    # REPORT
+    # =========================
+    def to_frame(self, start=None, end=None):
+        """One row per company: present / missing / gap years, completeness, tier."""
+        miss, window_years = self.missing(start, end)
+        gaps = self.gaps()
+        labels = self.years.astype(str)
+        window_labels = window_years.astype(str)
+
+        def join(mask, names):
+            return [", ".join(names[row]) for row in mask]
+
+        return pd.DataFrame({
+            "Company": self.companies,
+            "Years_Present": join(self.matrix, labels),
+            "Missing_Years": join(miss, window_labels),
+            "Missing_Count": miss.sum(axis=1),
+            "Gap_Years": join(gaps, labels),
+            "Completeness": np.round(self.completeness(start, end), 3),
+            "Tier": self.tiers(start, end),
+        })
+
+    def missing_report(self, start=None, end=None):
+        """Companies missing at least one year of the window, worst first."""
+        df = self.to_frame(start, end)
+        df = df[df["Missing_Count"] > 0]
+        return df.sort_values(by=["Missing_Count", "Company"], ascending=[False, True])
+
+    # =========================
+    # PERSISTENCE
+    # =========================
+    def save(self, path, watermark=None):
+        if watermark is not None:
+            self.watermark = str(watermark)
+        np.savez_compressed(path, companies=self.companies.astype(str), years=self.years,
+                            matrix=self.matrix, expected=np.asarray(self.expected),
+                            watermark=np.asarray(self.watermark or ""))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            watermark = str(data["watermark"]) if "watermark" in data.files else ""
+            return cls(data["companies"].astype(object), data["years"], data["matrix"],
+                       tuple(int(y) for y in data["expected"]), watermark or None)
@@ -0,0 +1,291 @@
+"""
+PDF CORPUS DEDUPLICATION
+------------------------
+Find duplicate annual reports by content, not by name.
+
+• exact: size prefilter → partial hash (head + tail) → full sha256,
+  each stage only for files still colliding, hashed in a thread pool
+• near : MinHash over word shingles of the first pages' text, LSH banding
+  for candidates, kept when the estimated Jaccard ≥ NEAR_THRESHOLD; only
+  files naming the same company-year become aliases — other near matches
+  (a template reused across years or companies) are "similar", report-only
+• groups collapse to one canonical file + aliases (already-scored first,
+  then names without a "_1" style copy suffix, then shortest / oldest)
+• ContentIndex answers "is this file already here?" for copy tools
+"""
+
+import os
+import re
+import hashlib
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from company_registry import split_name
+
+try:
+    import fitz
+except ImportError:
+    fitz = None
+
+PARTIAL_BYTES = 64 * 1024
+WORKERS = 8
+
+NEAR_THRESHOLD = 0.90
+NEAR_PAGES = 20
+SHINGLE = 5
+PERMUTATIONS = 128
+BANDS = 32
+
+COPY_SUFFIX_RE = re.compile(r"_\d+$")
+SIMILAR = "similar"  # near match across company-years: reported, never aliased
+_PRIME = (1 << 61) - 1
+
+# =========================
+# HASH CASCADE
+# =========================
+def partial_hash(path, chunk=PARTIAL_BYTES):
+    """sha256 of the first and last `chunk` bytes (whole file when smaller)."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        h.update(f.read(chunk))
+        size = os.fstat(f.fileno()).st_size
+        if size > 2 * chunk:
+            f.seek(-chunk, os.SEEK_END)
+        h.update(f.read(chunk))
+    return h.hexdigest()
+
+def full_hash(path, chunk=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def _refine(groups, fn, workers):
+    """Split every group of paths by fn(path), in parallel; drop singletons."""
+    todo = [p for g in groups for p in g]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        keys = dict(zip(todo, pool.map(_safe(fn), todo)))
+    out = []
+    for g in groups:
+        buckets = {}
+        for p in g:
+            if keys[p] is not None:
+                buckets.setdefault(keys[p], []).append(p)
+        out += [b for b in buckets.values() if len(b) > 1]
+    return out
+
+def _safe(fn):
+    def call(path):
+        try:
+            return fn(path)
+        except OSError:
+            return None
+    return call
+
+def exact_groups(paths, workers=WORKERS, known=None):
+    """
+    Groups of byte-identical files. `known` ({path: sha256}) skips hashing
+    files whose full hash is already recorded elsewhere.
+    """
+    by_size = {}
+    for p in paths:
+        try:
+            by_size.setdefault(os.path.getsize(p), []).append(p)
+        except OSError:
+            continue
+    groups = [g for g in by_size.values() if len(g) > 1]
+    groups = _refine(groups, partial_hash, workers)
+
+    known = known or {}
+    return _refine(groups, lambda p: known.get(p) or full_hash(p), workers)
+
+# =========================
+# NEAR DUPLICATES (MINHASH)
+# =========================
+def page_text(path, pages=NEAR_PAGES):
+    if fitz is None:
+        raise RuntimeError("PyMuPDF (fitz) is required for near-duplicate detection")
+    try:
+        with fitz.open(path) as doc:
+            return " ".join(doc[i].get_text("text") or "" for i in range(min(pages, len(doc))))
+    except Exception:
+        return ""
+
+def _perms(n=PERMUTATIONS, seed=1):
+    rng = np.random.default_rng(seed)
+    return (rng.integers(1, 1 << 31, n, dtype=np.uint64),
+            rng.integers(0, _PRIME, n, dtype=np.uint64))
+
+def minhash(text, perms=None, k=SHINGLE):
+    """MinHash signature (uint64[PERMUTATIONS]) of the text's k-word shingles; None if too short."""
+    words = re.findall(r"\w+", text.lower())
+    if len(words) < k:
+        return None
+    shingles = {" ".join(words[i:i + k]) for i in range(len(words) - k + 1)}
+    x = np.fromiter((zlib.crc32(s.encode()) for s in shingles), dtype=np.uint64, count=len(shingles))
+    a, b = perms or _perms()
+    # a < 2**31 and crc32 < 2**32, so a * x + b never overflows uint64
+    return ((np.outer(a, x) + b[:, None]) % _PRIME).min(axis=1)
+
+def near_groups(paths, threshold=NEAR_THRESHOLD, bands=BANDS, workers=WORKERS, pages=NEAR_PAGES):
+    """
+    Groups of near-identical reports as [(paths, min_similarity)].
+    Candidates come from LSH bands; pairs are kept at estimated
+    Jaccard ≥ threshold and merged transitively.
+    """
+    perms = _perms()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        sigs = dict(zip(paths, pool.map(lambda p: minhash(page_text(p, pages), perms), paths)))
+    sigs = {p: s for p, s in sigs.items() if s is not None}
+
+    names = list(sigs)
+    if len(names) < 2:
+        return []
+    matrix = np.stack([sigs[p] for p in names])
+    rows = matrix.shape[1] // bands
+
+    buckets = {}
+    for band in range(bands):
+        chunk = matrix[:, band * rows:(band + 1) * rows]
+        for i, key in enumerate(map(bytes, chunk)):
+            buckets.setdefault((band, key), []).append(i)
+
+    parent = list(range(len(names)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    checked, pairs = set(), []
+    for members in buckets.values():
+        for x, i in enumerate(members):
+            for j in members[x + 1:]:
+                if (i, j) in checked:
+                    continue
+                checked.add((i, j))
+                s = float((matrix[i] == matrix[j]).mean())
+                if s >= threshold:
+                    pairs.append((i, j, s))
+                    parent[find(j)] = find(i)
+
+    groups, sims = {}, {}
+    for i in range(len(names)):
+        groups.setdefault(find(i), []).append(names[i])
+    for i, _, s in pairs:
+        root = find(i)
+        sims[root] = min(sims.get(root, 1.0), s)
+    return [(g, sims[root]) for root, g in groups.items() if len(g) > 1]
+
+# =========================
+# CANONICAL + ALIASES
+# =========================
+def canonical(paths, processed=()):
+    """Pick the file to keep: already scored, then no copy suffix, then shortest name, then oldest."""
+    processed = set(processed)
+
+    def rank(p):
+        name = os.path.basename(p)
+        stem = os.path.splitext(name)[0]
+        try:
+            mtime = os.path.getmtime(p)
+        except OSError:
+            mtime = float("inf")
+        return (name.strip().lower() not in processed, bool(COPY_SUFFIX_RE.search(stem)), len(name), mtime)
+    return min(paths, key=rank)
+
+def report_key(path):
+    """(year, company) a PDF name stands for, ignoring "_1" copy suffixes; None if unparsable."""
+    stem = os.path.splitext(os.path.basename(path))[0].strip()
+    year, company = split_name(stem)
+    if year is None:
+        year, company = split_name(COPY_SUFFIX_RE.sub("", stem))
+    else:
+        company = COPY_SUFFIX_RE.sub("", company)
+    return (year, company.casefold()) if year and company else None
+
+def split_near(groups):
+    """
+    Near groups → (same company-year groups, cross company-year groups).
+    Only the first are safe to alias; the second are kept for review.
+    """
+    same, similar = [], []
+    for members, sim in groups:
+        by_key = {}
+        for p in members:
+            by_key.setdefault(report_key(p) or ("?", p), []).append(p)
+        same += [(g, sim) for g in by_key.values() if len(g) > 1]
+        if len(by_key) > 1:
+            similar.append((members, sim))
+    return same, similar
+
+def collapse(groups, processed=(), kind="exact"):
+    """[(alias, canonical, kind, similarity)] for every non-canonical member."""
+    out = []
+    for g in groups:
+        members, sim = g if kind != "exact" else (g, 1.0)
+        keep = canonical(members, processed)
+        out += [(p, keep, kind, sim) for p in members if p != keep]
+    return out
+
+def find_duplicates(folder, near=False, processed=(), workers=WORKERS, known=None):
+    """
+    Alias rows for every duplicate PDF in `folder` (exact first, then near
+    among the rest). Rows of kind SIMILAR are for review only.
+    """
+    paths = [e.path for e in os.scandir(folder) if e.is_file() and e.name.lower().endswith(".pdf")]
+    aliases = collapse(exact_groups(paths, workers, known), processed)
+    if near:
+        aliased = {a for a, *_ in aliases}
+        rest = [p for p in paths if p not in aliased]
+        same, similar = split_near(near_groups(rest, workers=workers))
+        near_aliases = collapse(same, processed, kind="near")
+        aliased = {a for a, *_ in near_aliases}
+        aliases += near_aliases
+        aliases += collapse([([p for p in g if p not in aliased], sim) for g, sim in similar],
+                            processed, kind=SIMILAR)
+    return aliases
+
+# =========================
+# COPY-TIME LOOKUP
+# =========================
+class ContentIndex:
+    """
+    Byte-identity lookup over a folder for copy tools. Sizes are read once;
+    partial / full hashes only when a size actually collides, then cached.
+    """
+
+    def __init__(self, folder=None):
+        self.by_size = {}
+        self._partial = {}
+        self._full = {}
+        if folder and os.path.isdir(folder):
+            for e in os.scandir(folder):
+                if e.is_file():
+                    self.add(e.path, e.stat().st_size)
+
+    def add(self, path, size=None):
+        size = os.path.getsize(path) if size is None else size
+        self.by_size.setdefault(size, []).append(path)
+
+    def _hash(self, cache, fn, path):
+        if path not in cache:
+            cache[path] = fn(path)
+        return cache[path]
+
+    def find(self, path):
+        """An already indexed file with the same bytes as `path`, or None."""
+        candidates = self.by_size.get(os.path.getsize(path), [])
+        if not candidates:
+            return None
+        head = self._hash(self._partial, partial_hash, path)
+        for other in candidates:
+            if other == path or self._hash(self._partial, partial_hash, other) != head:
+                continue
+            if self._hash(self._full, full_hash, other) == self._hash(self._full, full_hash, path):
+                return other
+        return None
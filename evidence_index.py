@@ -0,0 +1,253 @@
+"""
+CORPUS EVIDENCE INDEX
+---------------------
+Corpus-wide sentence vector index built from the embeddings the scorers
+already compute.
+
+• SentenceStore : one .npz per report (float16 unit vectors + sentences)
+• SentenceText  : sentences as one UTF-8 buffer + offsets, so storage is
+                  the text itself, not len × the longest sentence
+• EvidenceIndex : FAISS / hnswlib when installed, exact NumPy otherwise
+• Queries       : top-k sentences for a domain across all companies/years,
+                  nearest evidence for one company
+"""
+
+import os
+import json
+
+import numpy as np
+
+from iso_scoring import normalize_rows
+
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+HNSW_MIN_ROWS = 50_000  # below this, exact search is already milliseconds
+
+# =========================
+# SENTENCE TEXT
+# =========================
+class SentenceText:
+    """Read-only sequence of sentences stored as one UTF-8 buffer + offsets."""
+
+    def __init__(self, buffer, offsets):
+        self.buffer = np.asarray(buffer, dtype=np.uint8)
+        self.offsets = np.asarray(offsets, dtype=np.int64)  # len + 1 entries
+
+    @classmethod
+    def from_strings(cls, sentences):
+        encoded = [str(t).encode("utf-8") for t in sentences]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        return cls(np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets)
+
+    @classmethod
+    def concat(cls, parts):
+        parts = list(parts)
+        starts = np.cumsum([0] + [len(p.buffer) for p in parts[:-1]])
+        offsets = [np.zeros(1, dtype=np.int64)] + [p.offsets[1:] + s for p, s in zip(parts, starts)]
+        return cls(np.concatenate([p.buffer for p in parts]), np.concatenate(offsets))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        i = int(i)
+        return self.buffer[self.offsets[i]:self.offsets[i + 1]].tobytes().decode("utf-8")
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+# =========================
+# SENTENCE STORE
+# =========================
+class SentenceStore:
+    """Per-report sentence embeddings written by the scorers."""
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, file):
+        stem = os.path.splitext(os.path.basename(str(file)))[0].strip().lower()
+        return os.path.join(self.root, f"{stem}.npz")
+
+    def save(self, file, company, year, sentences, embeddings):
+        path = self._path(file)
+        tmp = path + ".tmp.npz"
+        text = SentenceText.from_strings(sentences)
+        np.savez_compressed(
+            tmp,
+            embeddings=normalize_rows(embeddings).astype(np.float16),
+            text=text.buffer,
+            offsets=text.offsets,
+            meta=np.array(json.dumps({"File": str(file), "Company": str(company), "Year": str(year)})),
+        )
+        os.replace(tmp, path)
+
+    def has(self, file):
+        return os.path.exists(self._path(file))
+
+    def iter_documents(self):
+        for name in sorted(os.listdir(self.root)):
+            if not name.endswith(".npz") or name.endswith(".tmp.npz"):
+                continue
+            with np.load(os.path.join(self.root, name)) as data:
+                meta = json.loads(str(data["meta"]))
+                if "text" in data:
+                    sentences = SentenceText(data["text"], data["offsets"])
+                else:  # written before SentenceText
+                    sentences = SentenceText.from_strings(data["sentences"])
+                yield meta, sentences, data["embeddings"]
+
+# =========================
+# INDEX
+# =========================
+class EvidenceIndex:
+    def __init__(self, vectors, doc_ids, sent_ids, sentences, docs, domain_matrix=None, domain_keys=None):
+        self.vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        self.doc_ids = doc_ids
+        self.sent_ids = sent_ids
+        self.sentences = sentences  # SentenceText
+        self.docs = docs  # list of {"File", "Company", "Year"}
+        self.domain_matrix = domain_matrix
+        self.domain_keys = list(domain_keys) if domain_keys is not None else []
+
+        companies = np.array([str(d["Company"]) for d in docs])
+        self._doc_company = companies
+        self._ann = self._build_ann()
+
+    # ---------- construction ----------
+    @classmethod
+    def build(cls, store, domain_matrix=None, domain_keys=None):
+        vecs, doc_ids, sent_ids, sents, docs = [], [], [], [], []
+        for meta, sentences, emb in store.iter_documents():
+            d = len(docs)
+            docs.append(meta)
+            vecs.append(emb)
+            sents.append(sentences)
+            doc_ids.append(np.full(len(sentences), d, dtype=np.int32))
+            sent_ids.append(np.arange(len(sentences), dtype=np.int32))
+
+        if not docs:
+            raise ValueError("Sentence store is empty — run a scorer first")
+
+        return cls(
+            np.concatenate(vecs),
+            np.concatenate(doc_ids),
+            np.concatenate(sent_ids),
+            SentenceText.concat(sents),
+            docs,
+            domain_matrix,
+            domain_keys,
+        )
+
+    def _build_ann(self):
+        n, dim = self.vectors.shape
+        if faiss is not None:
+            index = faiss.IndexFlatIP(dim) if n < HNSW_MIN_ROWS else faiss.IndexHNSWFlat(dim, 32, faiss.METRIC_INNER_PRODUCT)
+            index.add(self.vectors)
+            return ("faiss", index)
+        if hnswlib is not None and n >= HNSW_MIN_ROWS:
+            index = hnswlib.Index(space="ip", dim=dim)
+            index.init_index(max_elements=n, ef_construction=200, M=32)
+            index.add_items(self.vectors, np.arange(n))
+            index.set_ef(128)
+            return ("hnswlib", index)
+        return ("numpy", None)
+
+    @property
+    def backend(self):
+        return self._ann[0]
+
+    # ---------- persistence ----------
+    def save(self, path):
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, "vectors.npy"), self.vectors.astype(np.float16))
+        np.save(os.path.join(path, "doc_ids.npy"), self.doc_ids)
+        np.save(os.path.join(path, "sent_ids.npy"), self.sent_ids)
+        np.save(os.path.join(path, "sentence_text.npy"), self.sentences.buffer)
+        np.save(os.path.join(path, "sentence_offsets.npy"), self.sentences.offsets)
+        if self.domain_matrix is not None:
+            np.save(os.path.join(path, "domains.npy"), self.domain_matrix)
+        with open(os.path.join(path, "docs.json"), "w", encoding="utf-8") as f:
+            json.dump({"docs": self.docs, "domain_keys": self.domain_keys}, f)
+
+    @classmethod
+    def load(cls, path):
+        with open(os.path.join(path, "docs.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        domains = os.path.join(path, "domains.npy")
+        if os.path.exists(os.path.join(path, "sentence_text.npy")):
+            sentences = SentenceText(np.load(os.path.join(path, "sentence_text.npy")),
+                                     np.load(os.path.join(path, "sentence_offsets.npy")))
+        else:  # saved before SentenceText
+            sentences = SentenceText.from_strings(np.load(os.path.join(path, "sentences.npy")))
+        return cls(
+            np.load(os.path.join(path, "vectors.npy")),
+            np.load(os.path.join(path, "doc_ids.npy")),
+            np.load(os.path.join(path, "sent_ids.npy")),
+            sentences,
+            meta["docs"],
+            np.load(domains) if os.path.exists(domains) else None,
+            meta["domain_keys"],
+        )
+
+    # ---------- queries ----------
+    def _rows(self, rows, sims):
+        out = []
+        for r, s in zip(rows, sims):
+            doc = self.docs[int(self.doc_ids[r])]
+            out.append({
+                "Company": doc["Company"],
+                "Year": doc["Year"],
+                "File": doc["File"],
+                "Sentence_Index": int(self.sent_ids[r]),
+                "Sentence": self.sentences[r],
+                "Sim": round(float(s), 4),
+            })
+        return out
+
+    @staticmethod
+    def _exact(vectors, query, k):
+        sims = vectors @ query
+        k = min(k, len(sims))
+        top = np.argpartition(-sims, k - 1)[:k]
+        top = top[np.argsort(-sims[top])]
+        return top, sims[top]
+
+    def search(self, query, k=10, company=None):
+        """Top-k sentences for a query vector, optionally within one company."""
+        query = normalize_rows(query)[0]
+
+        if company is not None:
+            docs = np.flatnonzero(self._doc_company == str(company))
+            subset = np.flatnonzero(np.isin(self.doc_ids, docs))
+            if not len(subset):
+                return []
+            top, sims = self._exact(self.vectors[subset], query, k)
+            return self._rows(subset[top], sims)
+
+        kind, index = self._ann
+        if kind == "faiss":
+            sims, rows = index.search(query[None, :], k)
+            keep = rows[0] >= 0
+            return self._rows(rows[0][keep], sims[0][keep])
+        if kind == "hnswlib":
+            rows, dist = index.knn_query(query, k=k)
+            return self._rows(rows[0], 1.0 - dist[0])
+        top, sims = self._exact(self.vectors, query, k)
+        return self._rows(top, sims)
+
+    def top_k_for_domain(self, key, k=10, company=None):
+        """Ranked evidence for an ISO domain key such as "A.9"."""
+        if self.domain_matrix is None or key not in self.domain_keys:
+            raise KeyError(f"Domain {key!r} not in index")
+        return self.search(self.domain_matrix[self.domain_keys.index(key)], k, company)
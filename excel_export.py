@@ -0,0 +1,155 @@
+"""
+STREAMING EXCEL EXPORT
+----------------------
+One fast path for every Excel deliverable.
+
+• sanitize_frame → vectorized regex over string columns only (no per-cell
+  map/applymap), cells clipped to Excel's 32,767-char limit
+• write_excel    → xlsxwriter constant_memory when installed, otherwise
+  openpyxl write_only; rows streamed in chunks, never a full object copy
+• outputs beyond one sheet's row limit are split across sheets
+• atomic replace, so a crash never leaves a half-written workbook
+"""
+
+import os
+import re
+import sys
+import unicodedata
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
+
+# =========================
+# CONFIG
+# =========================
+EXCEL_MAX_ROWS = 1_048_576 - 1   # minus the header row
+EXCEL_MAX_CHARS = 32_767
+CHUNK_ROWS = 5_000
+
+# characters openpyxl refuses (same set as its ILLEGAL_CHARACTERS_RE) + lone surrogates
+ILLEGAL_RE = re.compile(r"[\x00-\x08\x0B\x0C\x0E-\x1F\uD800-\uDFFF\uFFFE\uFFFF]")
+
+@lru_cache(maxsize=1)
+def control_re():
+    """Every assigned Unicode 'C*' character (control, format, surrogate, private use)."""
+    ranges, start, prev = [], None, None
+    for cp in range(sys.maxunicode + 1):
+        if unicodedata.category(chr(cp)) in ("Cc", "Cf", "Cs", "Co"):
+            if start is None:
+                start = cp
+            elif cp != prev + 1:
+                ranges.append((start, prev))
+                start = cp
+            prev = cp
+        elif start is not None:
+            ranges.append((start, prev))
+            start = None
+    if start is not None:
+        ranges.append((start, prev))
+    body = "".join(
+        re.escape(chr(a)) if a == b else f"{re.escape(chr(a))}-{re.escape(chr(b))}" for a, b in ranges
+    )
+    return re.compile(f"[{body}]")
+
+# =========================
+# SANITIZE
+# =========================
+def _string_columns(df):
+    return [c for c in df.columns if df[c].dtype == object or pd.api.types.is_string_dtype(df[c])]
+
+def sanitize_frame(df, pattern=ILLEGAL_RE, normalize=None, max_chars=EXCEL_MAX_CHARS):
+    """
+    Strip `pattern` from every string cell, column at a time. Non-string
+    cells in object columns pass through untouched.
+    """
+    df = df.copy()
+    for col in _string_columns(df):
+        s = df[col]
+        if pd.api.types.infer_dtype(s, skipna=True) not in ("string", "empty"):
+            # mixed object column (ints, bools, datetimes next to text): clean only the strings
+            is_text = s.map(lambda v: isinstance(v, str)).to_numpy(dtype=bool)
+            if not is_text.any():
+                continue
+            s = s.copy()
+            s[is_text] = _clean(s[is_text].astype("string"), pattern, normalize, max_chars).astype(object)
+            df[col] = s
+            continue
+        cleaned = _clean(s, pattern, normalize, max_chars)
+        df[col] = cleaned.where(cleaned.notna(), s)
+    return df
+
+def _clean(s, pattern, normalize, max_chars):
+    text = s.str.normalize(normalize) if normalize else s
+    cleaned = text.str.replace(pattern, "", regex=True)
+    return cleaned.str.slice(0, max_chars) if max_chars else cleaned
+
+# =========================
+# WRITE
+# =========================
+def _chunks(df, size=CHUNK_ROWS):
+    """Rows as plain Python tuples (NaN/NaT → None), a chunk at a time."""
+    for start in range(0, len(df), size):
+        part = df.iloc[start:start + size].astype(object)
+        part = part.where(part.notna(), None)
+        yield from part.itertuples(index=False, name=None)
+
+def _sheet_names(n_rows, base, max_rows):
+    n = max(1, -(-n_rows // max_rows))
+    return [base if i == 0 else f"{base} ({i + 1})" for i in range(n)]
+
+def _plain(v):
+    if isinstance(v, np.generic):
+        return v.item()
+    if isinstance(v, pd.Timestamp):
+        return v.to_pydatetime()
+    return v
+
+def write_excel(df, path, sheet_name="Results", max_rows=EXCEL_MAX_ROWS, sanitize=True, engine=None):
+    """
+    Stream `df` to `path`. Returns the number of data rows written.
+
+    engine: "xlsxwriter" | "openpyxl" | None (xlsxwriter when installed).
+    """
+    if sanitize:
+        df = sanitize_frame(df)
+    engine = engine or ("xlsxwriter" if xlsxwriter is not None else "openpyxl")
+    header = [str(c) for c in df.columns]
+    sheets = _sheet_names(len(df), sheet_name, max_rows)
+
+    tmp = os.path.splitext(path)[0] + "_TMP.xlsx"
+    rows = _chunks(df)
+
+    if engine == "xlsxwriter":
+        wb = xlsxwriter.Workbook(tmp, {"constant_memory": True, "strings_to_urls": False,
+                                       "strings_to_formulas": False, "nan_inf_to_errors": True,
+                                       "default_date_format": "yyyy-mm-dd hh:mm:ss"})
+        for name in sheets:
+            ws = wb.add_worksheet(name[:31])
+            ws.write_row(0, 0, header)
+            for r in range(1, max_rows + 1):
+                row = next(rows, None)
+                if row is None:
+                    break
+                ws.write_row(r, 0, [_plain(v) for v in row])
+        wb.close()
+    else:
+        from openpyxl import Workbook
+        wb = Workbook(write_only=True)
+        for name in sheets:
+            ws = wb.create_sheet(name[:31])
+            ws.append(header)
+            for _ in range(max_rows):
+                row = next(rows, None)
+                if row is None:
+                    break
+                ws.append([_plain(v) for v in row])
+        wb.save(tmp)
+
+    os.replace(tmp, path)
+    return len(df)
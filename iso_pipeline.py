@@ -0,0 +1,144 @@
+"""
+ISO27001 PDF PIPELINE
+---------------------
+PDF → text → sentences → scored row, exactly as `ISO Maker.py` does it,
+shared by the batch script and the scoring service so both write
+identical rows.
+"""
+
+import os
+import re
+import io
+import sys
+import logging
+import contextlib
+from datetime import datetime
+
+from iso_scoring import SIM_MENTION, SIM_HIGH, WINDOW, EVIDENCE_KEYWORDS, evidence_hits, score_document
+from provenance import scoring_config, stamp
+from company_registry import split_name, company_code
+
+logger = logging.getLogger("iso_pipeline")
+
+# =========================
+# NAMES
+# =========================
+def normalize_filename(f):
+    return os.path.basename(str(f)).strip().lower()
+
+def parse_name(pdf):
+    """`Company_Year.pdf` or `Year_Company.pdf` → (company, year)."""
+    year, company = split_name(pdf)
+    return company, year or ""
+
+# =========================
+# QUIET MuPDF
+# =========================
+@contextlib.contextmanager
+def suppress_mupdf():
+    stderr = sys.stderr
+    try:
+        sys.stderr = io.StringIO()
+        yield
+    finally:
+        sys.stderr = stderr
+
+def extract_text(pdf_path):
+    import fitz  # PyMuPDF
+
+    try:
+        with suppress_mupdf():
+            doc = fitz.open(pdf_path)
+
+        try:
+            doc.set_option("widget.update-appearance", False)
+        except Exception:
+            pass
+
+        text = []
+        for page in doc:
+            try:
+                text.append(page.get_text("text") or "")
+            except Exception:
+                try:
+                    text.append(page.get_text("raw") or "")
+                except Exception:
+                    pass
+        doc.close()
+        return "\n".join(text)
+
+    except Exception as e:
+        logger.warning(f"❌ PDF FAILED: {os.path.basename(pdf_path)} | {e}")
+        return None
+
+# =========================
+# NLP HELPERS
+# =========================
+def split_sentences(txt):
+    from nltk.tokenize import sent_tokenize
+
+    txt = re.sub(r"\n+", " ", txt)
+    return [s for s in sent_tokenize(txt) if len(s.strip()) > 10]
+
+# =========================
+# PROVENANCE
+# =========================
+def pipeline_config(descriptions, model, sim_mention=SIM_MENTION, sim_high=SIM_HIGH, window=WINDOW,
+                    keywords=EVIDENCE_KEYWORDS):
+    """Scoring config of score_pdf below, for provenance.fingerprint."""
+    return scoring_config(
+        descriptions,
+        {"sim_mention": sim_mention, "sim_high": sim_high, "window": window, "min_sentence_chars": 10},
+        keywords,
+        model,
+    )
+
+# =========================
+# SCORING
+# =========================
+def score_pdf(path, encoder, domain_matrix, keys, sentence_store=None,
+              sim_mention=SIM_MENTION, sim_high=SIM_HIGH, window=WINDOW, fingerprint=None, registry=None):
+    """
+    One ISO Maker result row for the PDF at `path`. "Code" is the company
+    resolved through `registry` (None without one or without a match).
+    """
+    pdf = os.path.basename(path)
+    company, year = parse_name(pdf)
+    row = {
+        "Company": company,
+        "Code": company_code(registry, company),
+        "Year": year,
+        "File": pdf,
+        "Processed_On": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    if fingerprint:
+        stamp(row, fingerprint)
+
+    text = extract_text(path)
+    if text is None:
+        row.update({"Total_Score": 0, "Status": "PDF_READ_FAILED"})
+        return row
+
+    sentences = split_sentences(text)
+    if not sentences:
+        row.update({"Total_Score": 0, "Status": "NO_TEXT"})
+        return row
+
+    sent_emb = encoder.encode(sentences, show_progress_bar=False)
+    if sentence_store is not None:
+        sentence_store.save(pdf, company, year, sentences, sent_emb)
+
+    result = score_document(
+        sent_emb,
+        domain_matrix,
+        hits=evidence_hits(sentences),
+        window=window,
+        sim_mention=sim_mention,
+        sim_high=sim_high,
+    )
+
+    row["Status"] = "OK"
+    for j, key in enumerate(keys):
+        row[key] = int(result.scores[j])
+    row["Total_Score"] = int(result.scores.sum())
+    return row
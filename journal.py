@@ -0,0 +1,179 @@
+"""
+WRITE-AHEAD JOURNAL
+-------------------
+Crash-safe, per-PDF persistence for the batch scorers.
+
+• append(row)    → one JSON line, flushed and fsync'd before returning
+• compact(store) → journal rows committed to the results store in one
+                   transaction, then the journal is truncated
+• replay()       → rows that were scored but never compacted (startup)
+• a torn last line from a crash mid-write is skipped, never fatal
+
+Lost work after a crash is at most the PDF being scored at the time.
+Replaying a row that did reach the store before the crash is harmless:
+the store keeps the latest row per File.
+
+Scorers sharing one store each write their own WorkerJournal
+(`<store>.journal.<worker>.jsonl`, held under a lock file while the
+process lives), so no process ever truncates rows another one appended.
+recover() commits the journals of workers that died.
+"""
+
+import os
+import glob
+import json
+import uuid
+import socket
+import threading
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+    import fcntl
+
+from results_store import _plain
+
+
+def journal_path_for(store_path, worker=None):
+    """
+    `ISO Data Collection.sqlite` → `ISO Data Collection.journal.jsonl`, or
+    `ISO Data Collection.journal.<worker>.jsonl` for one worker process.
+    """
+    stem = os.path.splitext(store_path)[0] + ".journal"
+    return f"{stem}.{worker}.jsonl" if worker else f"{stem}.jsonl"
+
+def _try_lock(path):
+    """Open + exclusively lock `path` without waiting; the handle, or None when another process holds it."""
+    fh = open(path, "a+b")
+    try:
+        if msvcrt is not None:
+            fh.seek(0)
+            msvcrt.locking(fh.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        fh.close()
+        return None
+    return fh
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class Journal:
+    def __init__(self, path, fsync=True):
+        self.path = path
+        self.fsync = fsync
+        self.lock = threading.Lock()
+        self.fh = open(path, "ab")
+        if self.fh.tell() and not self._ends_with_newline():
+            self.fh.write(b"\n")  # fence off a torn tail so the next row parses
+            self.fh.flush()
+
+    def _ends_with_newline(self):
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def close(self):
+        self.fh.close()
+
+    # =========================
+    # WRITE
+    # =========================
+    def append(self, row):
+        line = json.dumps({k: _plain(v) for k, v in row.items()}, ensure_ascii=False)
+        with self.lock:
+            self.fh.write(line.encode("utf-8") + b"\n")
+            self.fh.flush()
+            if self.fsync:
+                os.fsync(self.fh.fileno())
+
+    def clear(self):
+        with self.lock:
+            self._truncate()
+
+    def _truncate(self):
+        self.fh.truncate(0)
+        self.fh.flush()
+        os.fsync(self.fh.fileno())
+
+    # =========================
+    # READ
+    # =========================
+    def replay(self):
+        """Rows currently in the journal, in append order."""
+        with self.lock:
+            return self._read()
+
+    def _read(self):
+        rows = []
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    continue  # torn write from a crash
+        return rows
+
+    def __len__(self):
+        return len(self.replay())
+
+    # =========================
+    # COMPACTION
+    # =========================
+    def compact(self, store, **commit_kwargs):
+        """Commit every journaled row to `store`, then truncate. Returns the row count."""
+        with self.lock:
+            rows = self._read()
+            if rows:
+                store.commit(rows, **commit_kwargs)
+            self._truncate()
+        return len(rows)
+
+
+class WorkerJournal(Journal):
+    """This process's journal for a shared results store."""
+
+    def __init__(self, store_path, fsync=True):
+        self.store_path = store_path
+        worker = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        path = journal_path_for(store_path, worker)
+        self.lock_fh = _try_lock(path + ".lock")  # released by the OS if this process dies
+        super().__init__(path, fsync)
+
+    def close(self):
+        super().close()
+        if os.path.exists(self.path) and not os.path.getsize(self.path):
+            _remove(self.path)
+        self.lock_fh.close()
+        _remove(self.path + ".lock")
+
+    def recover(self, store):
+        """
+        Commit the rows of workers that died before compacting (and of the
+        old shared journal), then delete their files. Returns the row count.
+        Their PDFs' size/mtime are not known here, so none are recorded.
+        """
+        stem = os.path.splitext(self.store_path)[0] + ".journal"
+        recovered = 0
+        for path in sorted(glob.glob(glob.escape(stem) + ".*jsonl")):
+            if path == self.path:
+                continue
+            held = _try_lock(path + ".lock")
+            if held is None:
+                continue  # a live worker owns it
+            try:
+                if os.path.exists(path):
+                    orphan = Journal(path, fsync=False)
+                    recovered += orphan.compact(store)
+                    orphan.close()
+                    _remove(path)
+            finally:
+                held.close()
+                _remove(path + ".lock")
+        return recovered
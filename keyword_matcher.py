@@ -0,0 +1,92 @@
+"""
+KEYWORD MATCHER
+---------------
+One compiled alternation regex per keyword set, tagging every sentence with
+its keyword hits in a single pass over the document.
+
+Semantics match the original `k in sentence.lower()` scans exactly:
+• sentences are lower-cased once
+• keywords overlapping or nested inside longer keywords are still reported
+  (the longest keyword wins at each position, and every shorter keyword it
+  contains is credited with it)
+"""
+
+import re
+from bisect import bisect_right
+from functools import lru_cache
+
+import numpy as np
+
+SEPARATOR = "\x00"
+
+
+class KeywordMatcher:
+    def __init__(self, keywords):
+        """`keywords` is a list, or a dict of {group: [keywords]}."""
+        groups = keywords if isinstance(keywords, dict) else {None: list(keywords)}
+
+        vocab = []
+        for words in groups.values():
+            for w in words:
+                w = w.lower().strip()
+                if w and SEPARATOR not in w and w not in vocab:
+                    vocab.append(w)
+        self.keywords = vocab
+        self._index = {w: i for i, w in enumerate(vocab)}
+
+        self.groups = {}
+        for g, words in groups.items():
+            ids = {self._index.get(w.lower().strip()) for w in words} - {None}
+            self.groups[g] = np.array(sorted(ids), dtype=np.int64)
+
+        # every keyword credits the keywords it contains
+        self._implied = {
+            w: [self._index[k] for k in vocab if k in w] for w in vocab
+        }
+
+        alternation = "|".join(re.escape(w) for w in sorted(vocab, key=len, reverse=True))
+        self._regex = re.compile(f"(?=({alternation}))") if vocab else None
+
+    # =========================
+    # TAGGING
+    # =========================
+    def tag(self, sentences):
+        """Boolean (n_sentences, n_keywords) hit matrix, built in one regex pass."""
+        hits = np.zeros((len(sentences), len(self.keywords)), dtype=bool)
+        if not sentences or self._regex is None:
+            return hits
+
+        lowered = [s.lower() for s in sentences]
+        starts, pos = [], 0
+        for s in lowered:
+            starts.append(pos)
+            pos += len(s) + 1
+
+        # keywords never contain the separator, so matches cannot span sentences
+        text = SEPARATOR.join(lowered)
+        for m in self._regex.finditer(text):
+            row = bisect_right(starts, m.start()) - 1
+            hits[row, self._implied[m.group(1)]] = True
+        return hits
+
+    def group_hits(self, hits, group=None):
+        """Collapse a tag() matrix to one boolean per sentence for a keyword group."""
+        cols = self.groups[group]
+        if not len(cols):
+            return np.zeros(len(hits), dtype=bool)
+        return hits[:, cols].any(axis=1)
+
+    def any_hits(self, sentences, group=None):
+        """Boolean per sentence: True when any keyword of `group` occurs."""
+        return self.group_hits(self.tag(sentences), group)
+
+    def filter(self, sentences, group=None):
+        """Sentences containing at least one keyword of `group`."""
+        mask = self.any_hits(sentences, group)
+        return [s for s, keep in zip(sentences, mask) if keep]
+
+
+@lru_cache(maxsize=32)
+def matcher_for(keywords):
+    """Shared matcher per keyword tuple, compiled once per process."""
+    return KeywordMatcher(list(keywords))
@@ -0,0 +1,230 @@
+"""
+LONG-FORMAT RESULTS
+-------------------
+Normalized, typed view of the wide result sheets.
+
+• documents   one row per report — Company / Year / Status as categoricals
+• scores      (doc_id, domain) → int8 score, float32 sim
+• evidence    (doc_id, domain) → snippet text + reason, kept apart from
+              the numeric tables so analytics never touch the strings
+• to_wide()   rebuilds the ISO Maker, OG (two schema layers) or Path B
+              sheet on demand
+
+Recognized wide columns per domain X (X starts with "A.<n>"):
+  X, X__score, X__sim, X__snippet, X__reason   (ISO Maker / OG)
+  X_Evidence, X_Sim                            (Path B)
+"""
+
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401 — enables Parquet
+except ImportError:
+    pyarrow = None
+
+DOMAIN_RE = re.compile(r"^A\.\d+\b")
+
+OG_SUFFIXES = ("__score", "__sim", "__snippet", "__reason")
+PATH_B_SUFFIXES = ("_Evidence", "_Sim")
+LAYOUTS = ("iso", "og", "path_b")
+
+TABLES = ("documents", "scores", "evidence")
+
+# document columns that follow the domain block in every wide layout
+TRAILING = ("Total_Score", "Status", "Processed_On")
+
+# =========================
+# COLUMN PARSING
+# =========================
+def domain_of(column):
+    """Domain label a wide column belongs to, or None for document columns."""
+    col = str(column)
+    for suffix in OG_SUFFIXES + PATH_B_SUFFIXES:
+        if col.endswith(suffix):
+            col = col[: -len(suffix)]
+            break
+    return col if DOMAIN_RE.match(col) else None
+
+def _integers(values, dtype, files, column):
+    """
+    Numeric column as a nullable integer dtype; non-integer or out-of-range
+    values raise ValueError naming the File(s) and column instead of failing
+    inside astype().
+    """
+    values = pd.to_numeric(values, errors="coerce")
+    info = np.iinfo(dtype.lower())
+    bad = values.notna() & ((values % 1 != 0) | (values < info.min) | (values > info.max))
+    if bad.any():
+        where = [f"{f} = {v}" for f, v in zip(files[bad].astype(str), values[bad])][:5]
+        raise ValueError(f"{column}: {int(bad.sum())} value(s) that are not {dtype} scores — {', '.join(where)}")
+    return values.astype(dtype)
+
+def _first(df, *cols):
+    for c in cols:
+        if c in df.columns:
+            return df[c]
+    return None
+
+
+class LongResults:
+    def __init__(self, documents, scores, evidence):
+        self.documents = documents
+        self.scores = scores
+        self.evidence = evidence
+
+    # =========================
+    # WIDE → LONG
+    # =========================
+    @classmethod
+    def from_wide(cls, df):
+        df = df.reset_index(drop=True)
+        domains = list(dict.fromkeys(d for d in map(domain_of, df.columns) if d))
+        doc_cols = [c for c in df.columns if domain_of(c) is None]
+        doc_ids = np.arange(len(df), dtype=np.int32)
+        files = df["File"] if "File" in df.columns else pd.Series(df.index.astype(str), index=df.index)
+
+        documents = df[doc_cols].copy()
+        documents.insert(0, "doc_id", doc_ids)
+        for col in ("Company", "Year", "Status"):
+            if col in documents:
+                documents[col] = documents[col].astype("string").astype("category")
+        if "Total_Score" in documents:
+            documents["Total_Score"] = _integers(documents["Total_Score"], "Int16", files, "Total_Score")
+        if "Processed_On" in documents:
+            documents["Processed_On"] = pd.to_datetime(documents["Processed_On"], errors="coerce")
+
+        score_parts, evidence_parts = [], []
+        for d in domains:
+            score = _first(df, d, f"{d}__score")
+            sim = _first(df, f"{d}__sim", f"{d}_Sim")
+            score_parts.append(pd.DataFrame({
+                "doc_id": doc_ids,
+                "domain": d,
+                "score": _integers(score, "Int8", files, d) if score is not None
+                         else pd.array([pd.NA] * len(df), dtype="Int8"),
+                "sim": pd.to_numeric(sim, errors="coerce").astype(np.float32) if sim is not None
+                       else np.full(len(df), np.nan, dtype=np.float32),
+            }))
+
+            snippet = _first(df, f"{d}__snippet", f"{d}_Evidence")
+            if snippet is not None:
+                reason = _first(df, f"{d}__reason")
+                ev = pd.DataFrame({
+                    "doc_id": doc_ids,
+                    "domain": d,
+                    "snippet": snippet.astype("string"),
+                    "reason": reason.astype("string") if reason is not None else pd.NA,
+                    "layout": "og" if f"{d}__snippet" in df.columns else "path_b",
+                })
+                evidence_parts.append(ev[ev["snippet"].fillna("").str.len() > 0])
+
+        scores = pd.concat(score_parts, ignore_index=True) if score_parts else \
+            pd.DataFrame(columns=["doc_id", "domain", "score", "sim"])
+        scores = scores[scores["score"].notna() | scores["sim"].notna()].reset_index(drop=True)
+
+        evidence = pd.concat(evidence_parts, ignore_index=True) if evidence_parts else \
+            pd.DataFrame(columns=["doc_id", "domain", "snippet", "reason", "layout"])
+
+        domain_type = pd.CategoricalDtype(domains)
+        scores["domain"] = scores["domain"].astype(domain_type)
+        evidence["domain"] = evidence["domain"].astype(domain_type)
+        for col in ("reason", "layout"):
+            evidence[col] = evidence[col].astype("string").astype("category")
+        return cls(documents, scores, evidence)
+
+    @classmethod
+    def from_store(cls, store):
+        return cls.from_wide(store.to_frame())
+
+    # =========================
+    # LONG → WIDE
+    # =========================
+    @property
+    def domains(self):
+        return list(self.scores["domain"].cat.categories)
+
+    def to_wide(self, layout="iso"):
+        """Reproduce a wide sheet: "iso" (scores only), "og" or "path_b"."""
+        if layout not in LAYOUTS:
+            raise ValueError(f"layout must be one of {LAYOUTS}")
+
+        out = self.documents.copy()
+        for col in out.columns:
+            if isinstance(out[col].dtype, pd.CategoricalDtype):
+                out[col] = out[col].astype(object)
+        if "Processed_On" in out:
+            out["Processed_On"] = out["Processed_On"].dt.strftime("%Y-%m-%d %H:%M:%S")
+
+        score = self.scores.pivot(index="doc_id", columns="domain", values="score")
+        sim = self.scores.pivot(index="doc_id", columns="domain", values="sim")
+        ev = self.evidence.drop_duplicates(["doc_id", "domain"], keep="first")
+        snippet = ev.pivot(index="doc_id", columns="domain", values="snippet")
+        reason = ev.pivot(index="doc_id", columns="domain", values="reason")
+
+        # float32 → float64 with the float32 noise rounded away
+        sim = sim.astype(np.float64).round(6)
+
+        def col(frame, d):
+            if d not in frame.columns:
+                return pd.Series(np.nan, index=out.index)
+            return frame[d].reindex(out["doc_id"]).to_numpy()
+
+        new = {}
+        for d in self.domains:
+            new[d] = col(score, d)
+            if layout == "og":
+                new[f"{d}__score"] = col(score, d)
+                new[f"{d}__sim"] = col(sim, d)
+                new[f"{d}__snippet"] = col(snippet, d)
+                new[f"{d}__reason"] = col(reason, d)
+            elif layout == "path_b":
+                new[f"{d}_Evidence"] = col(snippet, d)
+                new[f"{d}_Sim"] = col(sim, d)
+
+        lead = [c for c in out.columns if c not in TRAILING and c != "doc_id"]
+        tail = [c for c in out.columns if c in TRAILING]
+        return pd.concat([out[lead], pd.DataFrame(new, index=out.index), out[tail]], axis=1)
+
+    # =========================
+    # ANALYTICS
+    # =========================
+    def domain_summary(self, by="Year"):
+        """Mean score per `by` group × domain, straight from the numeric table."""
+        merged = self.scores.merge(self.documents[["doc_id", by]], on="doc_id")
+        return merged.pivot_table(index=by, columns="domain", values="score",
+                                  aggfunc="mean", observed=True)
+
+    def nbytes(self):
+        return {t: int(getattr(self, t).memory_usage(deep=True).sum()) for t in TABLES}
+
+    # =========================
+    # PERSISTENCE
+    # =========================
+    def save(self, folder):
+        """Parquet when pyarrow is installed, compressed pickle otherwise."""
+        os.makedirs(folder, exist_ok=True)
+        for t in TABLES:
+            frame = getattr(self, t)
+            if pyarrow is not None:
+                frame.to_parquet(os.path.join(folder, f"{t}.parquet"), index=False)
+            else:
+                frame.to_pickle(os.path.join(folder, f"{t}.pkl.gz"))
+        return folder
+
+    @classmethod
+    def load(cls, folder):
+        tables = {}
+        for t in TABLES:
+            path = os.path.join(folder, f"{t}.parquet")
+            if os.path.exists(path):
+                tables[t] = pd.read_parquet(path)
+            else:
+                tables[t] = pd.read_pickle(os.path.join(folder, f"{t}.pkl.gz"))
+        return cls(**tables)
+
+    def disk_bytes(self, folder):
+        return sum(os.path.getsize(os.path.join(folder, f)) for f in os.listdir(folder))
@@ -0,0 +1,287 @@
+"""
+COMPANY NAME MATCHER
+--------------------
+Match free-text company names against a reference list (Top-2000 sheet,
+company registry) without scoring every pair in Python.
+
+• normalize → casefold, "&" → "and", punctuation dropped, legal suffixes
+  (LTD, LIMITED, PVT, PRIVATE, CO, CORP, INC, THE ...) removed
+• exact     → normalized-name dict join first; only the rest is scored
+• blocking  → inverted index on tokens (very common tokens skipped) plus
+  a name-prefix key; only pairs sharing a block are scored
+• scoring   → rapidfuzz process.cpdist (token_sort_ratio, all cores) when
+  installed, else TF-IDF over hashed character 3-grams (NumPy, chunked
+  over a thread pool); scores are 0-100 either way
+• top_k() for review, match() for decisions; DecisionCache keeps accepted
+  and manual (or rejected) decisions, so re-runs only score new names
+"""
+
+import os
+import re
+import zlib
+import sqlite3
+import hashlib
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+try:
+    from rapidfuzz import fuzz, process as rf_process
+except ImportError:
+    fuzz = rf_process = None
+
+LEGAL = {"ltd", "limited", "pvt", "private", "co", "company", "corp", "corporation",
+         "inc", "incorporated", "plc", "llp", "the"}
+TOP_K = 3
+THRESHOLDS = {"rapidfuzz": 90, "tfidf": 80}  # default auto-accept score per backend
+BLOCK_MAX_SHARE = 0.02  # tokens in more than this share of the reference do not block
+PREFIX = 4
+NGRAM = 3
+HASH_DIM = 1 << 12
+CHUNK = 4096
+WORKERS = os.cpu_count() or 4
+
+# =========================
+# NORMALIZATION
+# =========================
+def normalize(name):
+    """Comparable form of a company name: "The Tata Power Co. Ltd." → "tata power"."""
+    if name is None or (isinstance(name, float) and name != name):
+        return ""
+    words = re.sub(r"[^\w]+", " ", str(name).casefold().replace("&", " and ")).split()
+    kept = [w for w in words if w not in LEGAL]
+    return " ".join(kept or words)
+
+def _ngrams(text, n=NGRAM):
+    text = f" {text} "
+    return [text[i:i + n] for i in range(max(len(text) - n + 1, 1))]
+
+
+class NameMatcher:
+    def __init__(self, choices, keys=None, backend=None):
+        """
+        `choices` are the reference names, `keys` their codes (defaults to the
+        names). backend: "rapidfuzz" / "tfidf" / None (rapidfuzz when installed).
+        """
+        self.choices = [str(c) for c in choices]
+        self.keys = list(keys) if keys is not None else list(self.choices)
+        self.backend = backend or ("rapidfuzz" if rf_process is not None else "tfidf")
+        if self.backend == "rapidfuzz" and rf_process is None:
+            raise RuntimeError("rapidfuzz is not installed (pip install rapidfuzz)")
+        self.norms = [normalize(c) for c in self.choices]
+
+        self.exact_ids = {}
+        for i, n in enumerate(self.norms):
+            self.exact_ids.setdefault(n, i)
+
+        self.blocks = {}
+        for i, n in enumerate(self.norms):
+            for key in self._block_keys(n):
+                self.blocks.setdefault(key, []).append(i)
+        limit = max(1, int(BLOCK_MAX_SHARE * len(self.norms)))
+        self.blocks = {k: np.asarray(v, dtype=np.int64) for k, v in self.blocks.items()
+                       if k.startswith("^") or len(v) <= limit}
+
+        self._vectors = self._idf = None
+
+    @classmethod
+    def from_registry(cls, registry, backend=None):
+        """Reference = every company in a company_registry.CompanyRegistry, keyed by code."""
+        frame = registry.frame()
+        return cls(frame["name"], frame["code"], backend)
+
+    @property
+    def reference_id(self):
+        """Fingerprint of the reference list; cached auto decisions are tied to it."""
+        h = hashlib.sha256()
+        for key, name in zip(self.keys, self.choices):
+            h.update(f"{key}\x1f{name}\x1e".encode())
+        return h.hexdigest()[:16]
+
+    @staticmethod
+    def _block_keys(norm):
+        return set(norm.split()) | ({"^" + norm[:PREFIX]} if norm else set())
+
+    # =========================
+    # CANDIDATES
+    # =========================
+    def candidates(self, qnorms):
+        """Blocked candidate pairs as parallel arrays (query index, choice index)."""
+        qi, cj = [], []
+        for i, q in enumerate(qnorms):
+            hits = [self.blocks[k] for k in self._block_keys(q) if k in self.blocks]
+            if not hits:
+                continue
+            ids = np.unique(np.concatenate(hits))
+            qi.append(np.full(len(ids), i, dtype=np.int64))
+            cj.append(ids)
+        if not qi:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        return np.concatenate(qi), np.concatenate(cj)
+
+    # =========================
+    # SCORING
+    # =========================
+    def _embed(self, texts):
+        rows = np.zeros((len(texts), HASH_DIM), dtype=np.float32)
+        for r, t in enumerate(texts):
+            ids = [zlib.crc32(g.encode()) % HASH_DIM for g in _ngrams(t)]
+            rows[r] = np.bincount(ids, minlength=HASH_DIM)
+        return rows
+
+    def _tfidf(self, texts):
+        if self._vectors is None:
+            tf = self._embed(self.norms)
+            df = (tf > 0).sum(axis=0)
+            self._idf = (np.log((1 + len(tf)) / (1 + df)) + 1).astype(np.float32)
+            self._vectors = self._unit(tf * self._idf)
+        return self._unit(self._embed(texts) * self._idf)
+
+    @staticmethod
+    def _unit(m):
+        norms = np.linalg.norm(m, axis=1, keepdims=True)
+        return m / np.where(norms == 0, 1, norms)
+
+    def score_pairs(self, qnorms, qi, cj):
+        """0-100 similarity for every (query, choice) pair."""
+        if len(qi) == 0:
+            return np.empty(0, dtype=np.float32)
+        if self.backend == "rapidfuzz":
+            return rf_process.cpdist([qnorms[i] for i in qi], [self.norms[j] for j in cj],
+                                     scorer=fuzz.token_sort_ratio, workers=-1).astype(np.float32)
+
+        q = self._tfidf(qnorms)
+        c = self._vectors
+        spans = [(s, min(s + CHUNK, len(qi))) for s in range(0, len(qi), CHUNK)]
+
+        def run(span):
+            s, e = span
+            return np.einsum("ij,ij->i", q[qi[s:e]], c[cj[s:e]])
+
+        with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+            sims = np.concatenate(list(pool.map(run, spans)))
+        return np.clip(sims * 100, 0, 100).astype(np.float32)
+
+    # =========================
+    # RESULTS
+    # =========================
+    def top_k(self, names, k=TOP_K):
+        """Long frame: Query, Rank, Key, Candidate, Score — best k candidates per name."""
+        names = list(names)
+        qnorms = [normalize(n) for n in names]
+        qi, cj = self.candidates(qnorms)
+        scores = self.score_pairs(qnorms, qi, cj)
+
+        # exact normalized matches always rank first (the prefix block guarantees they are candidates)
+        exact = np.array([self.exact_ids.get(q, -1) for q in qnorms], dtype=np.int64)
+        is_exact = cj == exact[qi] if len(qi) else np.empty(0, dtype=bool)
+        scores = np.where(is_exact, np.float32(100), scores)
+
+        order = np.lexsort((cj, -scores, ~is_exact, qi))
+        qi, cj, scores = qi[order], cj[order], scores[order]
+        starts = np.r_[0, np.flatnonzero(qi[1:] != qi[:-1]) + 1] if len(qi) else np.empty(0, dtype=np.int64)
+        rank = np.arange(len(qi)) - np.repeat(starts, np.diff(np.r_[starts, len(qi)]))
+        sel = rank < k
+
+        return pd.DataFrame({
+            "Query": [names[i] for i in qi[sel]],
+            "Rank": rank[sel] + 1,
+            "Key": [self.keys[j] for j in cj[sel]],
+            "Candidate": [self.choices[j] for j in cj[sel]],
+            "Score": scores[sel].astype(float).round(1),
+        })
+
+    def match(self, names, threshold=None, cache=None):
+        """
+        One decision per name: Query, Key, Match, Score, Source
+        (cached / manual / exact / auto, or None below threshold).
+        """
+        threshold = THRESHOLDS[self.backend] if threshold is None else threshold
+        names = list(dict.fromkeys(n for n in names if normalize(n)))
+        ref = self.reference_id
+        known = cache.lookup(ref) if cache is not None else {}
+
+        rows, todo = {}, []
+        for n in names:
+            hit = known.get(normalize(n))
+            if hit is not None:
+                rows[n] = hit
+            else:
+                todo.append(n)
+
+        best = self.top_k(todo, k=1)
+        best = best.set_index("Query") if len(best) else best
+        new = {}
+        for n in todo:
+            if n in best.index:
+                b = best.loc[n]
+                source = "exact" if normalize(n) in self.exact_ids else "auto"
+                accepted = source == "exact" or b["Score"] >= threshold
+                new[n] = (b["Key"] if accepted else None, b["Candidate"] if accepted else None,
+                          round(float(b["Score"]), 1), source if accepted else None)
+            else:
+                new[n] = (None, None, 0.0, None)
+        if cache is not None:
+            cache.store(ref, {normalize(n): v for n, v in new.items() if v[3]})
+        rows.update(new)
+
+        out = pd.DataFrame({"Query": names}, dtype=object)
+        for c, col in enumerate(["Key", "Match", "Score", "Source"]):
+            out[col] = pd.Series([rows[n][c] for n in names], dtype=float if col == "Score" else object)
+        return out
+
+# =========================
+# DECISION CACHE
+# =========================
+CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS decisions (
+    query      TEXT NOT NULL,
+    reference  TEXT NOT NULL,
+    key        TEXT,
+    name       TEXT,
+    score      REAL,
+    source     TEXT NOT NULL,
+    decided_on TEXT,
+    PRIMARY KEY (query, reference)
+);
+"""
+
+def _plain(v):
+    return v.item() if hasattr(v, "item") else v
+
+MANUAL = "*"  # reference id for manual decisions: valid against any reference list
+
+class DecisionCache:
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(CACHE_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def lookup(self, reference):
+        """{normalized query: (key, name, score, source)}; manual decisions override auto ones."""
+        rows = self.conn.execute(
+            "SELECT query, key, name, score, source FROM decisions WHERE reference IN (?, ?) "
+            "ORDER BY reference = ? ", (reference, MANUAL, MANUAL))
+        return {q: (key, name, score, "cached" if source in ("auto", "exact") else source)
+                for q, key, name, score, source in rows}
+
+    def store(self, reference, decisions):
+        now = datetime.now().isoformat(timespec="seconds")
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO decisions VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(q, reference, _plain(key), name, score, source, now)
+                 for q, (key, name, score, source) in decisions.items()])
+
+    def decide(self, query, key, name=None):
+        """Manual decision for `query` (key=None rejects it)."""
+        source = "manual" if key is not None else "rejected"
+        self.store(MANUAL, {normalize(query): (key, name, 100.0 if key is not None else 0.0, source)})
+
+def cache_path_for(output_path):
+    return os.path.splitext(output_path)[0] + ".matches.sqlite"
@@ -0,0 +1,80 @@
+"""
+SCORING PROVENANCE
+------------------
+Which configuration produced a result row.
+
+• scoring_config() → model + revision, domain descriptions, thresholds,
+  evidence keywords, extractor and segmenter versions as one dict
+• fingerprint()    → short sha256 of that dict (key order independent)
+• every scored row carries it in FINGERPRINT_COLUMN; the full config is
+  registered once in the results store so a fingerprint can be explained
+• every config names its producer (ISO Maker pipeline, OG scrapper); a
+  row is stale when its fingerprint differs from the current config of
+  the same producer, and only stale rows need recomputing
+"""
+
+import json
+import hashlib
+from importlib import metadata
+
+FINGERPRINT_COLUMN = "Config_Fingerprint"
+
+# pipelines writing to the shared results store
+ISO_MAKER = "iso_maker"      # iso_pipeline.score_pdf (ISO Maker, Scoring service, Recompute stale)
+OG_SCRAPPER = "og_scrapper"  # OG scrapper family: __sim / __snippet / __reason columns
+
+# bump when the text extraction / sentence splitting rules change
+EXTRACTOR_VERSION = "pymupdf-text-1"
+SEGMENTER_VERSION = "punkt-collapse-newlines-1"
+
+def library_version(dist):
+    try:
+        return metadata.version(dist)
+    except metadata.PackageNotFoundError:
+        return "missing"
+
+def scoring_config(descriptions, thresholds, keywords, model, revision=None,
+                   extractor=EXTRACTOR_VERSION, segmenter=SEGMENTER_VERSION, producer=ISO_MAKER):
+    """
+    Everything that can change a score. `descriptions` is the domain
+    mapping (or list of texts), `thresholds` a dict of numeric settings,
+    `producer` the pipeline whose rows these are.
+    """
+    if revision is None:
+        from warm_start import model_revision
+        revision = model_revision(model)
+    return {
+        "producer": producer,
+        "model": model,
+        "revision": revision,
+        "descriptions": dict(descriptions) if hasattr(descriptions, "items") else list(descriptions),
+        "thresholds": {k: thresholds[k] for k in sorted(thresholds)},
+        "keywords": sorted(keywords),
+        "extractor": f"{extractor}/pymupdf-{library_version('PyMuPDF')}",
+        "segmenter": f"{segmenter}/nltk-{library_version('nltk')}",
+    }
+
+def fingerprint(config):
+    # the producer labels a config, it does not change scores — leaving it out
+    # keeps fingerprints registered before it was recorded valid
+    config = {k: v for k, v in config.items() if k != "producer"}
+    blob = json.dumps(config, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16]
+
+def producer_of(config=None, row=None):
+    """
+    Pipeline behind a registered config, or behind an unstamped row.
+    Configs registered before producers were recorded are told apart by
+    OG scrapper's max_sentences threshold; unstamped rows by its columns.
+    """
+    if config is not None:
+        if config.get("producer"):
+            return config["producer"]
+        return OG_SCRAPPER if "max_sentences" in config.get("thresholds", {}) else ISO_MAKER
+    if row is not None:
+        return OG_SCRAPPER if any(str(k).endswith("__reason") for k in row) else ISO_MAKER
+    return None
+
+def stamp(row, fp):
+    row[FINGERPRINT_COLUMN] = fp
+    return row
@@ -0,0 +1,185 @@
+"""
+INCREMENTAL INTEGRITY AUDIT
+---------------------------
+Re-validate only what changed since the last Quality Control run.
+
+• watermark = one content hash per File (all columns, duplicates folded in)
+• row / cell rules (qa_rules) run only on Files whose hash changed
+• frame rules (schema, duplicates, company-year variance) are whole-frame
+  by nature and cheap — they run every time
+• open issues are a persistent set: new ones are inserted, ones no longer
+  produced for a re-validated File are marked resolved, the rest are kept
+• an issue is identified by type + File + Domain (+ Company / Year), so
+  identical issues on duplicate rows of one File count once
+• state lives in a small SQLite file next to the QA report
+"""
+
+import os
+import json
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+
+from iso_scoring import ISO_KEYS
+from qa_rules import run_rules
+from results_store import _plain
+
+IDENTITY = ["Issue_Type", "File", "Domain", "Company", "Year"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS file_hashes (
+    file TEXT PRIMARY KEY,
+    hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS issues (
+    issue_id    TEXT PRIMARY KEY,
+    scope       TEXT NOT NULL,
+    file        TEXT,
+    issue_type  TEXT NOT NULL,
+    payload     TEXT NOT NULL,
+    first_seen  TEXT NOT NULL,
+    last_seen   TEXT NOT NULL,
+    resolved_on TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_issues_open ON issues(scope, resolved_on);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+def audit_state_path_for(report_path):
+    """`ISO_Data_Integrity_Report.xlsx` → `ISO_Data_Integrity_Report.audit.sqlite`."""
+    return os.path.splitext(report_path)[0] + ".audit.sqlite"
+
+def file_hashes(df):
+    """One uint64 content hash per stripped File (rows of a duplicated File are summed)."""
+    files = df["File"].astype(str).str.strip()
+    mixed = df.select_dtypes(include="object").columns
+    rows = pd.util.hash_pandas_object(df.astype({c: str for c in mixed}), index=False)
+    return rows.groupby(files.to_numpy()).sum().astype("uint64").astype(str)
+
+def _issue_id(issue):
+    return "|".join("" if issue.get(c) is None else str(issue[c]) for c in IDENTITY)
+
+def _records(issues):
+    out = []
+    for rec in issues.to_dict("records"):
+        rec = {k: _plain(v) for k, v in rec.items()}
+        out.append({k: v for k, v in rec.items() if v is not None})
+    return out
+
+
+class AuditState:
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    # =========================
+    # WATERMARK
+    # =========================
+    def diff(self, hashes):
+        """(changed, removed) Files relative to the saved hashes."""
+        saved = dict(self.conn.execute("SELECT file, hash FROM file_hashes"))
+        changed = [f for f, h in hashes.items() if saved.get(f) != h]
+        removed = set(saved) - set(hashes.index)
+        return changed, removed
+
+    def save_hashes(self, hashes, changed, removed):
+        self.conn.executemany("INSERT OR REPLACE INTO file_hashes VALUES (?, ?)",
+                              [(f, hashes[f]) for f in changed])
+        self.conn.executemany("DELETE FROM file_hashes WHERE file = ?", [(f,) for f in removed])
+
+    def reset(self):
+        """Forget every hash so the next audit re-validates all rows."""
+        with self.conn:
+            self.conn.execute("DELETE FROM file_hashes")
+
+    # =========================
+    # OPEN ISSUE SET
+    # =========================
+    def sync(self, scope, issues, files=None, now=None):
+        """
+        Reconcile the open `scope` issues with freshly computed `issues`.
+        With `files`, only open issues of those Files are in play.
+        Returns (new, resolved) counts.
+        """
+        now = now or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        open_ids = dict(self.conn.execute(
+            "SELECT issue_id, file FROM issues WHERE scope = ? AND resolved_on IS NULL", (scope,)
+        ))
+        if files is not None:
+            files = set(files)
+            open_ids = {i: f for i, f in open_ids.items() if f in files}
+
+        current = {_issue_id(rec): rec for rec in _records(issues)}
+        new = [i for i in current if i not in open_ids]
+        gone = [i for i in open_ids if i not in current]
+
+        self.conn.executemany(
+            "INSERT INTO issues VALUES (?, ?, ?, ?, ?, ?, ?, NULL) "
+            "ON CONFLICT(issue_id) DO UPDATE SET payload = excluded.payload, "
+            "last_seen = excluded.last_seen, resolved_on = NULL",
+            [(i, scope, rec.get("File"), rec["Issue_Type"], json.dumps(rec, default=str), now, now)
+             for i, rec in current.items()],
+        )
+        self.conn.executemany("UPDATE issues SET resolved_on = ? WHERE issue_id = ?",
+                              [(now, i) for i in gone])
+        return len(new), len(gone)
+
+    def open_issues(self):
+        rows = self.conn.execute(
+            "SELECT payload, first_seen, last_seen FROM issues WHERE resolved_on IS NULL "
+            "ORDER BY issue_type, file"
+        ).fetchall()
+        out = pd.DataFrame([{**json.loads(p), "First_Seen": first, "Checked_On": last}
+                            for p, first, last in rows])
+        if out.empty:
+            return pd.DataFrame(columns=["Issue_Type"])
+        stamps = ["First_Seen", "Checked_On"]
+        return out[[c for c in out.columns if c not in stamps] + stamps]
+
+    def meta(self, key, default=None):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    # =========================
+    # ONE AUDIT PASS
+    # =========================
+    def audit(self, df, keys=ISO_KEYS, full=False):
+        """
+        Validate `df` incrementally and update the open set in one
+        transaction. Returns a summary dict.
+        """
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        if full:
+            self.reset()
+
+        hashes = file_hashes(df)
+        changed, removed = self.diff(hashes)
+
+        files = df["File"].astype(str).str.strip()
+        subset = df[files.isin(set(changed)).to_numpy()]
+        row_issues = run_rules(subset, keys, kinds=("row", "cell"))
+        frame_issues = run_rules(df, keys, kinds=("frame",))
+
+        with self.conn:
+            new_r, res_r = self.sync("row", row_issues, files=set(changed) | removed, now=now)
+            new_f, res_f = self.sync("frame", frame_issues, now=now)
+            self.save_hashes(hashes, changed, removed)
+            if "Processed_On" in df.columns:
+                self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('processed_on', ?)",
+                                  (str(df["Processed_On"].dropna().astype(str).max()),))
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('last_audit', ?)", (now,))
+
+        open_count = self.conn.execute(
+            "SELECT COUNT(*) FROM issues WHERE resolved_on IS NULL"
+        ).fetchone()[0]
+        return {"rows": len(df), "changed": len(changed), "removed": len(removed),
+                "new": new_r + new_f, "resolved": res_r + res_f, "open": open_count}
@@ -0,0 +1,201 @@
+"""
+DATA INTEGRITY RULES ENGINE
+---------------------------
+Declarative, vectorized checks for the ISO master sheet.
+
+• every rule is a mask over the WHOLE frame, never a row loop
+• kind "row"   → bool mask (rows,)          → one issue per flagged row
+• kind "cell"  → bool mask (rows, domains)  → one issue per flagged score cell
+• kind "frame" → returns a ready issue DataFrame (schema, duplicates, groups)
+• issues are emitted in bulk, one DataFrame per rule
+• new checks: decorate a function with @rule("ISSUE_TYPE", ...)
+
+    @rule("NEGATIVE_TOTAL", fields={"Actual": lambda c: c.total})
+    def negative_total(ctx):
+        return ctx.total < 0
+"""
+
+from collections import namedtuple
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from iso_scoring import ISO_KEYS
+
+VALID_STATUSES = {"OK", "PDF_READ_FAILED", "NO_TEXT"}
+VALID_SCORES = (0, 1, 2)
+BASE_COLUMNS = ["Company", "Year", "File", "Status", "Total_Score", "Processed_On"]
+VARIANCE_SPREAD = 10
+
+Rule = namedtuple("Rule", ["name", "kind", "check", "fields"])
+
+RULES = {}
+
+# =========================
+# REGISTRY
+# =========================
+def rule(name, kind="row", fields=None):
+    """
+    Register `check(ctx)` as rule `name`. `fields` maps extra issue
+    columns to callables `(ctx) -> array` shaped like the rule's mask.
+    """
+    if kind not in ("row", "cell", "frame"):
+        raise ValueError(f"unknown rule kind: {kind}")
+
+    def register(check):
+        RULES[name] = Rule(name, kind, check, fields or {})
+        return check
+    return register
+
+def unregister(name):
+    RULES.pop(name, None)
+
+# =========================
+# CONTEXT (COMPUTED ONCE)
+# =========================
+class QAContext:
+    """Column arrays shared by every rule, built once per frame on first use."""
+
+    def __init__(self, df, keys=ISO_KEYS, valid_statuses=VALID_STATUSES):
+        self.df = df
+        self.keys = list(keys)
+        self.valid_statuses = set(valid_statuses)
+        self.missing_columns = sorted(set(BASE_COLUMNS + self.keys) - set(df.columns))
+
+    def _text(self, col):
+        if col not in self.df.columns:
+            return np.full(len(self.df), "", dtype=object)
+        return self.df[col].astype(str).str.strip().to_numpy(dtype=object)
+
+    @cached_property
+    def file(self):
+        return self._text("File")
+
+    @cached_property
+    def status(self):
+        return self._text("Status")
+
+    @cached_property
+    def total(self):
+        if "Total_Score" not in self.df.columns:
+            return np.full(len(self.df), np.nan)
+        return pd.to_numeric(self.df["Total_Score"], errors="coerce").to_numpy(dtype=float)
+
+    @cached_property
+    def _domains(self):
+        return self.df.reindex(columns=self.keys)
+
+    @cached_property
+    def raw(self):
+        return self._domains.to_numpy(dtype=object)
+
+    @cached_property
+    def present(self):
+        return self._domains.notna().to_numpy()
+
+    @cached_property
+    def valid(self):
+        return self._domains.isin(VALID_SCORES).to_numpy()
+
+    @cached_property
+    def scores(self):
+        return self._domains.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+
+    @cached_property
+    def has_scores(self):
+        return self.present.any(axis=1)
+
+    @cached_property
+    def expected(self):
+        return np.where(self.present, np.nan_to_num(self.scores), 0.0).sum(axis=1)
+
+# =========================
+# BUILT-IN RULES
+# =========================
+@rule("MISSING_COLUMNS", kind="frame")
+def missing_columns(ctx):
+    if not ctx.missing_columns:
+        return None
+    return pd.DataFrame([{"Issue_Type": "MISSING_COLUMNS", "Details": ", ".join(ctx.missing_columns)}])
+
+@rule("DUPLICATE_FILE", kind="frame")
+def duplicate_file(ctx):
+    if "File" not in ctx.df.columns:
+        return None
+    files = ctx.df["File"]
+    dupes = files[files.duplicated(keep=False)].unique()
+    return pd.DataFrame({"Issue_Type": "DUPLICATE_FILE", "File": dupes})
+
+@rule("MISSING_DOMAIN_SCORE", kind="cell")
+def missing_domain_score(ctx):
+    return ~ctx.present
+
+@rule("INVALID_DOMAIN_VALUE", kind="cell", fields={"Value": lambda c: c.raw})
+def invalid_domain_value(ctx):
+    return ctx.present & ~ctx.valid
+
+@rule("TOTAL_SCORE_MISMATCH", fields={"Expected": lambda c: c.expected, "Actual": lambda c: c.total})
+def total_score_mismatch(ctx):
+    return ctx.has_scores & ~(ctx.total == ctx.expected)
+
+@rule("OK_WITH_ZERO_SCORE")
+def ok_with_zero_score(ctx):
+    return (ctx.status == "OK") & (ctx.total == 0)
+
+@rule("FAILED_WITH_SCORES", fields={"Status": lambda c: c.status})
+def failed_with_scores(ctx):
+    return (ctx.status != "OK") & (ctx.present & (np.nan_to_num(ctx.scores) > 0)).any(axis=1)
+
+@rule("UNKNOWN_STATUS", fields={"Status": lambda c: c.status})
+def unknown_status(ctx):
+    return ~pd.Series(ctx.status).isin(ctx.valid_statuses).to_numpy()
+
+@rule("COMPANY_YEAR_SCORE_VARIANCE", kind="frame")
+def company_year_score_variance(ctx):
+    df = ctx.df
+    if not {"Company", "Year", "Status", "Total_Score"} <= set(df.columns):
+        return None
+    g = df[df["Status"] == "OK"].groupby(["Company", "Year"])["Total_Score"].agg(["min", "max"])
+    g = g[g["max"] - g["min"] >= VARIANCE_SPREAD].reset_index()
+    return pd.DataFrame({
+        "Issue_Type": "COMPANY_YEAR_SCORE_VARIANCE",
+        "Company": g["Company"],
+        "Year": g["Year"],
+        "Min": g["min"].astype(int),
+        "Max": g["max"].astype(int),
+    })
+
+# =========================
+# RUNNER
+# =========================
+def _emit(ctx, r):
+    if r.kind == "frame":
+        return r.check(ctx)
+
+    mask = np.asarray(r.check(ctx), dtype=bool)
+    if r.kind == "cell":
+        rows, cols = np.nonzero(mask)
+        at = (rows, cols)
+        out = {"Issue_Type": r.name, "File": ctx.file[rows],
+               "Domain": np.asarray(ctx.keys, dtype=object)[cols]}
+    else:
+        rows = at = np.flatnonzero(mask)
+        out = {"Issue_Type": r.name, "File": ctx.file[rows]}
+    for col, fn in r.fields.items():
+        out[col] = np.asarray(fn(ctx))[at]
+    return pd.DataFrame(out)
+
+def run_rules(df, keys=ISO_KEYS, rules=None, valid_statuses=VALID_STATUSES, kinds=None):
+    """
+    All issues for `df` as one DataFrame. `rules` (names) defaults to every
+    registered rule; `kinds` restricts to e.g. ("row", "cell").
+    """
+    ctx = QAContext(df, keys, valid_statuses)
+    selected = RULES.values() if rules is None else [RULES[n] for n in rules]
+    if kinds is not None:
+        selected = [r for r in selected if r.kind in kinds]
+    frames = [f for f in (_emit(ctx, r) for r in selected) if f is not None and len(f)]
+    if not frames:
+        return pd.DataFrame(columns=["Issue_Type"])
+    return pd.concat(frames, ignore_index=True, sort=False)
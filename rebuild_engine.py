@@ -0,0 +1,109 @@
+"""
+PATH A / PATH B REBUILD ENGINE
+------------------------------
+One pass per PDF for both rebuild paths: extract → segment → encode →
+score. The same similarity matrix gives Path A its 0/1/2 grades and
+Path B its best-sentence evidence, so the corpus is encoded once.
+
+• analyze_pdf    → PdfAnalysis (status, sentences, scores, best_idx, best_sim)
+• path_a_fields  → Path A columns (grades, Total_Score, Status, Processed_On)
+• path_b_fields  → Path B columns (<key>_Evidence / <key>_Sim above its own
+                   SIM_THRESHOLD, never overwriting existing evidence)
+"""
+
+import os
+import re
+from collections import namedtuple
+from datetime import datetime
+
+from iso_scoring import SIM_MENTION, SIM_HIGH, WINDOW, EVIDENCE_KEYWORDS, evidence_hits, score_document
+
+MIN_TEXT_CHARS = 50
+MIN_SENTENCE_CHARS = 15
+EVIDENCE_CHARS = 500
+
+PdfAnalysis = namedtuple("PdfAnalysis", ["status", "sentences", "scores", "best_idx", "best_sim"])
+
+# =========================
+# HELPERS
+# =========================
+def extract_text(pdf_path):
+    import fitz
+
+    try:
+        doc = fitz.open(pdf_path)
+        chunks = []
+        for page in doc:
+            try:
+                chunks.append(page.get_text("text") or "")
+            except Exception:
+                pass
+        doc.close()
+        text = "\n".join(chunks)
+        return text.strip() if len(text.strip()) > MIN_TEXT_CHARS else None
+    except Exception:
+        return None
+
+def split_sentences(txt):
+    from nltk.tokenize import sent_tokenize
+
+    txt = re.sub(r"\s+", " ", txt)
+    return [s for s in sent_tokenize(txt) if len(s.strip()) > MIN_SENTENCE_CHARS]
+
+# =========================
+# ONE PASS
+# =========================
+def analyze_pdf(pdf_path, encoder, domain_matrix, sentence_store=None, company="", year="",
+                keywords=EVIDENCE_KEYWORDS, window=WINDOW, sim_mention=SIM_MENTION, sim_high=SIM_HIGH):
+    if not os.path.exists(pdf_path):
+        return PdfAnalysis("PDF_MISSING", None, None, None, None)
+
+    text = extract_text(pdf_path)
+    if not text:
+        return PdfAnalysis("NO_TEXT", None, None, None, None)
+
+    sentences = split_sentences(text)
+    if not sentences:
+        return PdfAnalysis("NO_SENTENCES", None, None, None, None)
+
+    sent_emb = encoder.encode(sentences, show_progress_bar=False)
+    if sentence_store is not None:
+        sentence_store.save(os.path.basename(pdf_path), company, year, sentences, sent_emb)
+
+    result = score_document(
+        sent_emb, domain_matrix,
+        hits=evidence_hits(sentences, keywords),
+        window=window, sim_mention=sim_mention, sim_high=sim_high
+    )
+    return PdfAnalysis("OK", sentences, result.scores, result.best_idx, result.best_sim)
+
+# =========================
+# PER-PATH VIEWS
+# =========================
+def path_a_fields(analysis, keys):
+    """Path A cells for one row; failures only set Status."""
+    if analysis.status != "OK":
+        return {"Status": analysis.status}
+    fields = {k: int(s) for k, s in zip(keys, analysis.scores)}
+    fields["Total_Score"] = int(analysis.scores.sum())
+    fields["Status"] = "OK"
+    fields["Processed_On"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return fields
+
+def path_b_fields(analysis, keys, threshold, existing=None):
+    """
+    Path B evidence cells for one row. `existing` holds keys that already
+    have evidence — they are left alone, as Path B always did.
+    """
+    if analysis.status != "OK":
+        return {}
+    existing = existing or set()
+    fields = {}
+    for j, key in enumerate(keys):
+        if key in existing:
+            continue
+        sim = float(analysis.best_sim[j])
+        if sim >= threshold:
+            fields[f"{key}_Evidence"] = analysis.sentences[int(analysis.best_idx[j])][:EVIDENCE_CHARS]
+            fields[f"{key}_Sim"] = round(sim, 4)
+    return fields
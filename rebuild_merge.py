@@ -0,0 +1,74 @@
+"""
+REBUILD MERGE LAYER
+-------------------
+Keyed upserts for the Path A / Path B rebuild engines.
+
+• load_previous → saved output indexed by File (last duplicate wins)
+• upsert        → bulk, index-aligned write of a whole batch of row
+                  updates; one assignment per column, never per cell
+• partial updates: a missing / null field leaves the existing cell alone
+• duplicate Files in the input all receive the same update
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+KEY = "File"
+
+def load_previous(path, key=KEY):
+    """Saved output keyed by `key`, or None when there is none yet."""
+    if not os.path.exists(path):
+        return None
+    prev = pd.read_excel(path)
+    return prev.drop_duplicates(key, keep="last").set_index(key)
+
+def upsert(df, updates, key=KEY, append=True):
+    """
+    Apply `updates` (DataFrame or iterable of dicts, each with `key`) to
+    `df` by key. Unknown keys are appended when `append` is set.
+    Returns the (possibly extended) frame.
+    """
+    upd = updates if isinstance(updates, pd.DataFrame) else pd.DataFrame(list(updates))
+    if upd.empty:
+        return df
+    if upd.index.name != key:
+        upd = upd.drop_duplicates(key, keep="last").set_index(key)
+
+    if append:
+        new_keys = upd.index.difference(pd.Index(df[key]))
+        if len(new_keys):
+            df = pd.concat([df, upd.loc[new_keys].reset_index()], ignore_index=True)
+
+    hit = df[key].isin(upd.index).to_numpy()
+    if not hit.any():
+        return df
+    rows = df.index[hit]
+    aligned = upd.reindex(df.loc[hit, key])
+
+    for col in upd.columns:
+        values = aligned[col].to_numpy()
+        present = ~pd.isna(values)
+        if not present.any():
+            continue
+        if col not in df.columns:
+            df[col] = np.nan
+        if values.dtype == object and df[col].dtype != object:
+            df[col] = df[col].astype(object)
+        df.loc[rows[present], col] = values[present]
+    return df
+
+def restore(df, prev, columns=None, key=KEY):
+    """Copy saved cells from `prev` (load_previous) back onto `df` rows with the same key."""
+    if prev is None:
+        return df
+    cols = [c for c in (columns or prev.columns) if c in df.columns and c != key]
+    return upsert(df, prev[cols], key=key, append=False)
+
+def batches(items, size):
+    """Split the remaining work into consecutive batches (size None = one batch)."""
+    items = list(items)
+    size = size or len(items) or 1
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
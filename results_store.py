@@ -0,0 +1,622 @@
+"""
+ISO RESULTS STORE
+-----------------
+Append-only SQLite system of record for scored rows.
+
+• commit(rows)   → one INSERT transaction, O(batch) regardless of history
+• latest row per File wins (same rule as drop_duplicates(keep="last"))
+• full row kept as JSON, so every script's schema round-trips unchanged
+• Excel is an on-demand export (export_excel), not the database
+• processed-file index (name + size/mtime) updated in the same
+  transaction, so pending() finds new work without reading any rows;
+  sha256 is taken lazily by pending(verify=True), never on commit
+• multi-writer safe: BEGIN IMMEDIATE + busy timeout between processes,
+  claim() leases so parallel workers never score the same PDF (one owner
+  per process, renewed on every commit / renew(), a crashed worker's
+  leases expire after CLAIM_TTL), optimistic
+  version checks (expected=), merge_from() for stores filled elsewhere
+"""
+
+import os
+import json
+import time
+import uuid
+import socket
+import contextlib
+import hashlib
+import sqlite3
+import threading
+from datetime import datetime
+
+KEY_COLUMNS = ["File", "Company", "Year", "Status", "Total_Score", "Processed_On"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    seq          INTEGER PRIMARY KEY AUTOINCREMENT,
+    file_key     TEXT NOT NULL,
+    File         TEXT,
+    Company      TEXT,
+    Year         TEXT,
+    Status       TEXT,
+    Total_Score  INTEGER,
+    Processed_On TEXT,
+    payload      TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_results_file_key ON results(file_key, seq);
+
+CREATE TABLE IF NOT EXISTS processed (
+    file_key TEXT PRIMARY KEY,
+    size     INTEGER,
+    mtime    REAL,
+    sha256   TEXT,
+    seq      INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS claims (
+    file_key TEXT PRIMARY KEY,
+    owner    TEXT NOT NULL,
+    expires  REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS configs (
+    fingerprint TEXT PRIMARY KEY,
+    config      TEXT NOT NULL,
+    first_seen  TEXT
+);
+
+CREATE TABLE IF NOT EXISTS aliases (
+    file_key   TEXT PRIMARY KEY,
+    canonical  TEXT NOT NULL,
+    kind       TEXT,
+    similarity REAL
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+
+CREATE VIEW IF NOT EXISTS latest AS
+SELECT r.* FROM results r
+JOIN (SELECT file_key, MAX(seq) AS seq FROM results GROUP BY file_key) m
+  ON r.seq = m.seq;
+"""
+
+CLAIM_TTL = 2 * 3600  # seconds before an abandoned (never renewed) claim can be taken over
+
+def worker_id():
+    """
+    Claim owner, unique per process (host:pid:random), so two copies of a
+    script never share or release each other's leases. A crashed worker's
+    batch comes back once its leases expire (CLAIM_TTL). ISO_WORKER_ID
+    overrides it.
+    """
+    return os.environ.get("ISO_WORKER_ID") or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+class ConflictError(Exception):
+    """Rows changed by another writer since the caller read their versions."""
+
+    def __init__(self, keys):
+        super().__init__(f"{len(keys)} rows changed concurrently: {sorted(keys)[:5]}")
+        self.keys = keys
+
+def file_key(name):
+    """Normalized File key — same rule as ISO Maker's normalize_filename."""
+    return os.path.basename(str(name)).strip().lower()
+
+def _plain(v):
+    """JSON-safe scalar: NaN / NaT / NA → None, numpy scalars → Python."""
+    if hasattr(v, "item") and not isinstance(v, (str, bytes)):
+        try:
+            v = v.item()
+        except (ValueError, AttributeError):
+            pass
+    if v is None or (isinstance(v, float) and v != v) or type(v).__name__ in ("NAType", "NaTType"):
+        return None
+    if isinstance(v, (str, int, float, bool)):
+        return v
+    return str(v)
+
+def content_hash(path, chunk=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def _fingerprint(folder, name):
+    """
+    (size, mtime, None) of folder/name, or Nones when it cannot be read.
+    `folder` may also be a {name: path} mapping (a corpus catalog view).
+    The sha256 slot is filled later by pending(verify=True).
+    """
+    if folder is None:
+        return None, None, None
+    if isinstance(folder, dict):
+        path = folder.get(os.path.basename(str(name)))
+        if path is None:
+            return None, None, None
+    else:
+        path = os.path.join(folder, os.path.basename(str(name)))
+    try:
+        st = os.stat(path)
+        return st.st_size, st.st_mtime, None
+    except OSError:
+        return None, None, None
+
+def store_path_for(excel_path):
+    """`ISO Data Collection.xlsx` → `ISO Data Collection.sqlite` next to it."""
+    return os.path.splitext(excel_path)[0] + ".sqlite"
+
+
+class ResultsStore:
+    def __init__(self, path, timeout=30.0, owner=None):
+        self.path = path
+        self.owner = owner or worker_id()
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+        self.conn.execute(f"PRAGMA busy_timeout={int(timeout * 1000)}")
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        with self._write():
+            # stores created before these columns / the processed index existed
+            columns = {c[1] for c in self.conn.execute("PRAGMA table_info(results)")}
+            for col, kind in (("origin", "TEXT"), ("origin_seq", "INTEGER")):
+                if col not in columns:
+                    self.conn.execute(f"ALTER TABLE results ADD COLUMN {col} {kind}")
+            if "File" not in {c[1] for c in self.conn.execute("PRAGMA table_info(aliases)")}:
+                self.conn.execute("ALTER TABLE aliases ADD COLUMN File TEXT")
+            self.conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_results_origin ON results(origin, origin_seq)"
+            )
+            if not self.conn.execute("SELECT 1 FROM processed LIMIT 1").fetchone():
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO processed (file_key, seq) "
+                    "SELECT file_key, MAX(seq) FROM results GROUP BY file_key"
+                )
+            self.conn.execute("INSERT OR IGNORE INTO meta VALUES ('store_id', ?)", (uuid.uuid4().hex,))
+        self.store_id = self.conn.execute("SELECT value FROM meta WHERE key = 'store_id'").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+    @contextlib.contextmanager
+    def _write(self):
+        """
+        Serialized write transaction. BEGIN IMMEDIATE takes the database
+        write lock up front, so concurrent processes queue on busy_timeout
+        instead of failing on a read→write lock upgrade.
+        """
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+            except BaseException:
+                self.conn.rollback()
+                raise
+            self.conn.commit()
+
+    # =========================
+    # WRITE
+    # =========================
+    def commit(self, rows, folder=None, expected=None):
+        """
+        Upsert a batch of result dicts (keyed by File) in one transaction.
+
+        With `folder` (a directory or a {name: path} catalog view), each
+        PDF's size/mtime is recorded in the processed index so
+        pending(verify=True) can spot replaced files.
+        With `expected` ({File: version} from versions()), the batch is
+        rejected with ConflictError if another writer got there first.
+        """
+        records = []
+        for row in rows:
+            row = {k: _plain(v) for k, v in row.items()}
+            records.append((
+                file_key(row.get("File", "")),
+                *(row.get(c) for c in KEY_COLUMNS),
+                json.dumps(row, ensure_ascii=False),
+            ))
+        if not records:
+            return 0
+        prints = [_fingerprint(folder, r[1]) for r in records]
+        with self._write() as conn:
+            if expected is not None:
+                wanted = {file_key(k): v for k, v in expected.items()}
+                current = self._versions(conn, wanted)
+                stale = [k for k, v in wanted.items() if current[k] != v]
+                if stale:
+                    raise ConflictError(stale)
+            self._insert(conn, records, prints)
+            conn.executemany("DELETE FROM claims WHERE file_key = ?", [(r[0],) for r in records])
+            # a live writer keeps the rest of its batch leased
+            conn.execute("UPDATE claims SET expires = ? WHERE owner = ?", (time.time() + CLAIM_TTL, self.owner))
+            self._copy_to_aliases(conn, [r[0] for r in records])
+        return len(records)
+
+    def _insert(self, conn, records, prints):
+        """Append records (file_key, KEY_COLUMNS..., payload) and point the processed index at them."""
+        conn.executemany(
+            "INSERT INTO results (file_key, File, Company, Year, Status, Total_Score, Processed_On, payload) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            records,
+        )
+        last = conn.execute("SELECT MAX(seq) FROM results").fetchone()[0]
+        first = last - len(records) + 1
+        conn.execute(
+            "UPDATE results SET origin = ?, origin_seq = seq WHERE seq BETWEEN ? AND ?",
+            (self.store_id, first, last),
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO processed (file_key, size, mtime, sha256, seq) VALUES (?, ?, ?, ?, ?)",
+            [(r[0], *fp, first + i) for i, (r, fp) in enumerate(zip(records, prints))],
+        )
+
+    # =========================
+    # CONCURRENCY
+    # =========================
+    @staticmethod
+    def _versions(conn, keys):
+        found = dict(conn.execute(
+            f"SELECT file_key, seq FROM processed WHERE file_key IN ({','.join('?' * len(keys))})",
+            list(keys),
+        )) if keys else {}
+        return {k: found.get(k) for k in keys}
+
+    def versions(self, names):
+        """{file_key: version} for optimistic commits; None = never committed."""
+        with self.lock:
+            return self._versions(self.conn, {file_key(n) for n in names})
+
+    def claim(self, names, limit=None, ttl=CLAIM_TTL, skip_processed=True):
+        """
+        Lease up to `limit` unprocessed PDFs to this writer. Returns the
+        names claimed; ones leased to a live writer are skipped, and so
+        are processed ones unless skip_processed=False (forced rescoring).
+        """
+        now = time.time()
+        got = []
+        with self._write() as conn:
+            conn.execute("DELETE FROM claims WHERE expires < ?", (now,))
+            for name in names:
+                if limit is not None and len(got) >= limit:
+                    break
+                key = file_key(name)
+                if skip_processed and conn.execute("SELECT 1 FROM processed WHERE file_key = ?", (key,)).fetchone():
+                    continue
+                holder = conn.execute("SELECT owner FROM claims WHERE file_key = ?", (key,)).fetchone()
+                if holder and holder[0] != self.owner:
+                    continue
+                conn.execute("INSERT OR REPLACE INTO claims VALUES (?, ?, ?)", (key, self.owner, now + ttl))
+                got.append(name)
+        return got
+
+    def renew(self, ttl=CLAIM_TTL):
+        """Extend this writer's claims (call per PDF on long batches)."""
+        with self._write() as conn:
+            conn.execute("UPDATE claims SET expires = ? WHERE owner = ?", (time.time() + ttl, self.owner))
+
+    def release(self, names=None):
+        """Drop this writer's unfinished claims (e.g. on a clean stop); only `names` when given."""
+        with self._write() as conn:
+            if names is None:
+                conn.execute("DELETE FROM claims WHERE owner = ?", (self.owner,))
+            else:
+                conn.executemany("DELETE FROM claims WHERE file_key = ? AND owner = ?",
+                                 [(file_key(n), self.owner) for n in names])
+
+    def merge_from(self, other):
+        """
+        Pull rows from another store (e.g. a Colab/Kaggle run). Idempotent:
+        rows already merged are skipped by origin, and a row never replaces
+        a newer Processed_On for the same File.
+        """
+        close = isinstance(other, str)
+        src = ResultsStore(other) if close else other
+        try:
+            with src.lock:
+                incoming = src.conn.execute(
+                    f"SELECT seq, file_key, {', '.join(KEY_COLUMNS)}, payload, origin, origin_seq "
+                    "FROM results ORDER BY seq"
+                ).fetchall()
+            src_id = src.store_id
+        finally:
+            if close:
+                src.close()
+
+        merged = 0
+        with self._write() as conn:
+            # read once: what was merged already, and the newest Processed_On per File
+            seen = set(conn.execute("SELECT origin, origin_seq FROM results WHERE origin IS NOT NULL"))
+            newest = dict(conn.execute("SELECT file_key, Processed_On FROM latest"))
+            for seq, key, *cols, payload, origin, origin_seq in incoming:
+                origin, origin_seq = origin or src_id, origin_seq or seq
+                if origin == self.store_id or (origin, origin_seq) in seen:
+                    continue
+                if key in newest and (newest[key] or "") >= (cols[-1] or ""):
+                    continue
+                cur = conn.execute(
+                    f"INSERT INTO results (file_key, {', '.join(KEY_COLUMNS)}, payload, origin, origin_seq) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (key, *cols, payload, origin, origin_seq),
+                )
+                conn.execute("INSERT OR REPLACE INTO processed (file_key, seq) VALUES (?, ?)", (key, cur.lastrowid))
+                seen.add((origin, origin_seq))
+                newest[key] = cols[-1]
+                merged += 1
+        return merged
+
+    # =========================
+    # PROVENANCE
+    # =========================
+    def register_config(self, fp, config):
+        """Remember the full scoring config behind fingerprint `fp` (once)."""
+        with self._write() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO configs VALUES (?, ?, ?)",
+                (fp, json.dumps(config, sort_keys=True, ensure_ascii=False, default=str),
+                 datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+            )
+        return fp
+
+    def config(self, fp):
+        with self.lock:
+            found = self.conn.execute("SELECT config FROM configs WHERE fingerprint = ?", (fp,)).fetchone()
+        return json.loads(found[0]) if found else None
+
+    def fingerprints(self):
+        """{fingerprint or None: latest-row count}."""
+        with self.lock:
+            return dict(self.conn.execute(
+                "SELECT json_extract(payload, '$.Config_Fingerprint') AS fp, COUNT(*) FROM latest GROUP BY fp"
+            ))
+
+    def producers(self):
+        """{file_key: producing pipeline} for every latest row (provenance.producer_of)."""
+        from provenance import producer_of
+        with self.lock:
+            configs = {fp: json.loads(c) for fp, c in self.conn.execute("SELECT fingerprint, config FROM configs")}
+            rows = self.conn.execute(
+                "SELECT file_key, json_extract(payload, '$.Config_Fingerprint') AS fp, "
+                "CASE WHEN json_extract(payload, '$.Config_Fingerprint') IS NULL THEN payload END "
+                "FROM latest"
+            ).fetchall()
+        out = {}
+        for key, fp, payload in rows:
+            if fp is None:
+                out[key] = producer_of(row=json.loads(payload))
+            else:
+                out[key] = producer_of(configs[fp]) if fp in configs else None
+        return out
+
+    def stale(self, fp, producer=None):
+        """
+        Files whose latest row was scored under a different (or unknown)
+        config (aliases excluded — they follow their canonical file). With `producer`, only rows of that pipeline are judged —
+        another pipeline's rows are never stale against this config.
+        """
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT file_key, File FROM latest "
+                "WHERE COALESCE(json_extract(payload, '$.Config_Fingerprint'), '') != ? "
+                "AND file_key NOT IN (SELECT file_key FROM aliases) ORDER BY seq",
+                (fp,),
+            ).fetchall()
+        if producer is None:
+            return [f for _, f in rows]
+        owners = self.producers()
+        return [f for key, f in rows if owners.get(key) == producer]
+
+    def insert_records(self, records):
+        """
+        Re-insert raw records (from records_since) keeping their seq and
+        origin, so merge_from() still recognizes them after a restore.
+        Records written before origin was exported get none.
+        """
+        width = 2 + len(KEY_COLUMNS) + 1
+        records = [tuple(r) + (None, None) * (len(r) == width) for r in records]
+        with self._write():
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO results (seq, file_key, {', '.join(KEY_COLUMNS)}, payload, origin, origin_seq) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                records,
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO processed (file_key, seq) "
+                "SELECT file_key, MAX(seq) FROM results GROUP BY file_key"
+            )
+        return len(records)
+
+    def import_frame(self, df):
+        """One-off migration of an existing master DataFrame."""
+        return self.commit(df.to_dict("records"))
+
+    def import_excel(self, excel_path):
+        import pandas as pd
+        return self.import_frame(pd.read_excel(excel_path, engine="openpyxl"))
+
+    # =========================
+    # READ
+    # =========================
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM processed").fetchone()[0]
+
+    def processed_files(self):
+        """Set of normalized File names already committed."""
+        with self.lock:
+            return {k for (k,) in self.conn.execute("SELECT file_key FROM processed")}
+
+    # =========================
+    # DUPLICATE ALIASES
+    # =========================
+    def set_aliases(self, aliases):
+        """
+        Record duplicate files as (alias, canonical, kind, similarity);
+        aliases are never handed out by pending() again, and each gets a
+        copy of its canonical file's row (now, or when that is committed).
+        """
+        rows = [(file_key(a), file_key(c), kind, sim, os.path.basename(str(a))) for a, c, kind, sim in aliases]
+        with self._write() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO aliases (file_key, canonical, kind, similarity, File) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._copy_to_aliases(conn, sorted({r[1] for r in rows}))
+        return len(rows)
+
+    def _copy_to_aliases(self, conn, canonicals):
+        """
+        Alias rows = the canonical's latest row under the alias's File name,
+        appended only when the canonical row changed since the last copy.
+        """
+        if not canonicals:
+            return 0
+        found = []
+        for i in range(0, len(canonicals), 500):
+            chunk = canonicals[i:i + 500]
+            found += conn.execute(
+                "SELECT a.file_key, COALESCE(a.File, a.file_key), c.File, c.seq, c.payload FROM aliases a "
+                "JOIN latest c ON c.file_key = a.canonical "
+                "LEFT JOIN latest o ON o.file_key = a.file_key "
+                f"WHERE a.canonical IN ({','.join('?' * len(chunk))}) "
+                "AND json_extract(o.payload, '$.Alias_Seq') IS NOT c.seq",
+                chunk,
+            ).fetchall()
+        records = []
+        for key, name, source, seq, payload in found:
+            row = dict(json.loads(payload), File=name, Alias_Of=source, Alias_Seq=seq)
+            records.append((key, *(row.get(c) for c in KEY_COLUMNS), json.dumps(row, ensure_ascii=False)))
+        if records:
+            self._insert(conn, records, [(None, None, None)] * len(records))
+        return len(records)
+
+    def aliases(self):
+        """{alias file_key: canonical file_key}"""
+        with self.lock:
+            return dict(self.conn.execute("SELECT file_key, canonical FROM aliases"))
+
+    def unprocessed(self, names):
+        """`names` not yet committed and not duplicate aliases, order kept."""
+        with self.lock:
+            done = {k for (k,) in self.conn.execute("SELECT file_key FROM processed")}
+            done |= {k for (k,) in self.conn.execute("SELECT file_key FROM aliases")}
+        return [n for n in names if file_key(n) not in done]
+
+    def pending(self, folder, verify=False):
+        """
+        PDFs in `folder` not yet committed, in directory order. Known
+        duplicate aliases are skipped — their canonical file is scored.
+
+        verify=True also returns processed files whose size changed, or
+        whose mtime changed and whose sha256 no longer matches. Hashes are
+        taken here, not on commit: unchanged files without one get their
+        baseline recorded, touched-but-identical files their new mtime.
+        """
+        with self.lock:
+            index = {k: (size, mtime, sha) for k, size, mtime, sha in
+                     self.conn.execute("SELECT file_key, size, mtime, sha256 FROM processed")}
+            skip = {k for (k,) in self.conn.execute("SELECT file_key FROM aliases")}
+        out, refresh = [], []
+        with os.scandir(folder) as it:
+            for entry in it:
+                if not entry.name.lower().endswith(".pdf"):
+                    continue
+                key = file_key(entry.name)
+                if key in skip:
+                    continue
+                known = index.get(key)
+                if known is None:
+                    out.append(entry.name)
+                elif verify and known[0] is not None:
+                    st = entry.stat()
+                    if (st.st_size, st.st_mtime) == known[:2]:
+                        if known[2] is None:
+                            refresh.append((st.st_size, st.st_mtime, content_hash(entry.path), key))
+                    elif st.st_size != known[0] or known[2] is None:
+                        out.append(entry.name)  # no baseline hash → the change cannot be ruled out
+                    else:
+                        sha = content_hash(entry.path)
+                        if sha == known[2]:
+                            refresh.append((st.st_size, st.st_mtime, sha, key))
+                        else:
+                            out.append(entry.name)
+        if refresh:
+            with self._write() as conn:
+                conn.executemany("UPDATE processed SET size = ?, mtime = ?, sha256 = ? WHERE file_key = ?", refresh)
+        return out
+
+    def summary(self):
+        """
+        Latest KEY_COLUMNS per File plus the processed fingerprint
+        (size, mtime, sha256) — one query, no payload decoding.
+        """
+        cols = ", ".join(f"l.{c}" for c in KEY_COLUMNS)
+        sql = (f"SELECT l.file_key, {cols}, p.size, p.mtime, p.sha256 FROM latest l "
+               "LEFT JOIN processed p ON p.file_key = l.file_key")
+        with self.lock:
+            return self.conn.execute(sql).fetchall()
+
+    def rows(self, where="", params=()):
+        """Latest row per File as dicts, in commit order."""
+        sql = f"SELECT payload FROM latest {where} ORDER BY seq"
+        with self.lock:
+            return [json.loads(p) for (p,) in self.conn.execute(sql, params)]
+
+    def max_seq(self):
+        with self.lock:
+            return self.conn.execute("SELECT COALESCE(MAX(seq), 0) FROM results").fetchone()[0]
+
+    def records_since(self, seq):
+        """Raw result records (every column, seq first, origin / origin_seq last) appended after `seq`."""
+        with self.lock:
+            return self.conn.execute(
+                f"SELECT seq, file_key, {', '.join(KEY_COLUMNS)}, payload, origin, origin_seq "
+                "FROM results WHERE seq > ? ORDER BY seq",
+                (seq,),
+            ).fetchall()
+
+    def to_frame(self):
+        import pandas as pd
+        return pd.DataFrame(self.rows())
+
+    # =========================
+    # EXPORT / BACKUP
+    # =========================
+    def export_excel(self, excel_path):
+        """Stream the latest rows to a workbook (sanitized, atomic replace)."""
+        from excel_export import write_excel
+        return write_excel(self.to_frame(), excel_path)
+
+    def backup(self, dest=None):
+        """Consistent full copy via the SQLite online-backup API."""
+        if dest is None:
+            dest = self.path.replace(".sqlite", f"_backup_{datetime.now():%Y%m%d_%H%M%S}.sqlite")
+        target = sqlite3.connect(dest)
+        with self.lock:
+            self.conn.backup(target)
+        target.close()
+        return dest
+
+
+def open_store(excel_path):
+    """
+    Store next to `excel_path`, seeded from the workbook on first use so
+    existing results carry over.
+    """
+    store = ResultsStore(store_path_for(excel_path))
+    if not len(store) and os.path.exists(excel_path):
+        store.import_excel(excel_path)
+    return store
+
+def load_results(path):
+    """Latest results as a DataFrame from a .sqlite store or a workbook."""
+    import pandas as pd
+    if path.endswith(".sqlite"):
+        store = ResultsStore(path)
+        try:
+            return store.to_frame()
+        finally:
+            store.close()
+    return pd.read_excel(path, engine="openpyxl")
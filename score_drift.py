@@ -0,0 +1,312 @@
+"""
+SCORE DRIFT & OUTLIERS
+----------------------
+Temporal and cohort checks over the scored corpus, as grouped NumPy /
+pandas operations (no per-company loops).
+
+• company_years() → latest OK row per company-year, domain scores as columns
+• yoy()     → per company × domain delta against the company's previous
+              scored year (groupby shift)
+• zscores() → every domain and Total_Score against its Year cohort, or its
+              Sector × Year cohort when a sector map is given
+• flags()   → YOY_JUMP          |ΔTotal| ≥ JUMP_TOTAL or ≥ FLIP_DOMAINS
+                                domains swinging the full 0 ↔ 2 range
+              EXTRACTION_CHANGE a jump where the two years were scored under
+                                different config fingerprints
+              COHORT_OUTLIER    |z(Total)| ≥ Z_LIMIT in a cohort of ≥ MIN_COHORT
+• DriftState keeps a compact numeric copy of the store in SQLite; refresh()
+  reads only rows committed since the last watermark (store.max_seq), keeps
+  flags as a persistent open set and queues suspect files for re-extraction
+  ("Recompute stale.py --drift"); flags are recomputed when the rows or the
+  sector map changed (the last map given is kept for later runs)
+"""
+
+import os
+import json
+import sqlite3
+import hashlib
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from iso_scoring import ISO_KEYS
+from provenance import FINGERPRINT_COLUMN
+from results_store import KEY_COLUMNS, file_key
+
+JUMP_TOTAL = 8
+FLIP_DOMAINS = 3
+Z_LIMIT = 3.0
+MIN_COHORT = 10
+QUEUE_KINDS = ("YOY_JUMP", "EXTRACTION_CHANGE")  # flags that queue files automatically
+
+FLAG_COLUMNS = ["Flag", "File", "Company", "Year", "Total_Score", "Delta", "Z", "Detail", "Queue_Files"]
+
+def drift_state_path_for(store_path):
+    """`ISO Data Collection.sqlite` → `ISO Data Collection.drift.sqlite`."""
+    return os.path.splitext(store_path)[0] + ".drift.sqlite"
+
+# =========================
+# ANALYTICS (PURE, WHOLE FRAME)
+# =========================
+def company_years(df, keys=ISO_KEYS):
+    """
+    Latest OK row per (Company, Year), sorted by company then year.
+    Input is any results frame (master sheet, store rows); `seq` orders
+    rows when present, else row order does.
+    """
+    df = df[df["Status"].astype(str).str.strip() == "OK"].copy()
+    df["Company"] = df["Company"].astype(str).str.strip()
+    df["Year"] = pd.to_numeric(df["Year"], errors="coerce")
+    df = df[df["Year"].notna() & (df["Company"] != "")]
+    df["Year"] = df["Year"].astype(int)
+    for c in list(keys) + ["Total_Score"]:
+        df[c] = pd.to_numeric(df[c], errors="coerce") if c in df.columns else np.nan
+    if FINGERPRINT_COLUMN not in df.columns:
+        df[FINGERPRINT_COLUMN] = None
+    if "seq" in df.columns:
+        df = df.sort_values("seq", kind="stable")
+    df = df.drop_duplicates(["Company", "Year"], keep="last")
+    return df.sort_values(["Company", "Year"], kind="stable").reset_index(drop=True)
+
+def yoy(cy, keys=ISO_KEYS):
+    """Deltas vs the previous scored year of the same company (NaN for a company's first year)."""
+    cols = list(keys) + ["Total_Score"]
+    prev = cy.groupby("Company", sort=False)[cols + ["Year", "File", FINGERPRINT_COLUMN]].shift(1)
+    out = cy[["Company", "Year", "File"]].copy()
+    out["Prev_Year"] = prev["Year"]
+    out["Prev_File"] = prev["File"]
+    out["Config_Changed"] = (prev[FINGERPRINT_COLUMN].notna() & cy[FINGERPRINT_COLUMN].notna()
+                             & (prev[FINGERPRINT_COLUMN] != cy[FINGERPRINT_COLUMN]))
+    delta = cy[cols].to_numpy(dtype=float) - prev[cols].to_numpy(dtype=float)
+    out[[f"Δ{c}" for c in cols]] = delta
+    return out
+
+def zscores(cy, keys=ISO_KEYS, sectors=None):
+    """z of every domain and Total_Score within its cohort; NaN for cohorts under MIN_COHORT."""
+    cols = list(keys) + ["Total_Score"]
+    cohort = [cy["Year"]]
+    if sectors is not None:
+        cohort.insert(0, cy["Company"].map(sectors).fillna("UNKNOWN"))
+    g = cy.groupby(cohort, sort=False)[cols]
+    mean, std, size = g.transform("mean"), g.transform("std", ddof=0), g.transform("count")
+    z = (cy[cols] - mean) / std.where(std > 0)
+    z = z.where(size >= MIN_COHORT)
+    z.columns = [f"z{c}" for c in cols]
+    return z
+
+def flags(cy, keys=ISO_KEYS, sectors=None):
+    """One row per suspect: File, Company, Year, Flag, Total, Delta, Z, Detail, Queue_Files."""
+    keys = list(keys)
+    d = yoy(cy, keys)
+    z = zscores(cy, keys, sectors)
+    dom = d[[f"Δ{k}" for k in keys]].to_numpy()
+    flips = (np.abs(dom) >= 2).sum(axis=1)
+    dtotal = d["ΔTotal_Score"].to_numpy()
+    ztotal = z["zTotal_Score"].to_numpy()
+
+    jump = (np.abs(np.nan_to_num(dtotal)) >= JUMP_TOTAL) | (flips >= FLIP_DOMAINS)
+    change = jump & d["Config_Changed"].to_numpy()
+    outlier = np.abs(np.nan_to_num(ztotal)) >= Z_LIMIT
+
+    frames = []
+    for name, mask in (("EXTRACTION_CHANGE", change), ("YOY_JUMP", jump & ~change),
+                       ("COHORT_OUTLIER", outlier)):
+        idx = np.flatnonzero(mask)
+        if not len(idx):
+            continue
+        rows = d.iloc[idx]
+        if name == "COHORT_OUTLIER":
+            detail = [f"z={v:+.1f}" for v in ztotal[idx]]
+            queue = [[f] for f in rows["File"]]
+        else:
+            detail = [f"{int(py)}→{y}: Δ{v:+.0f}, {n} domain flip(s)"
+                      for py, y, v, n in zip(rows["Prev_Year"], rows["Year"], np.nan_to_num(dtotal[idx]), flips[idx])]
+            # a config change makes either side suspect; a plain jump the newer year
+            queue = [[pf, f] if name == "EXTRACTION_CHANGE" else [f] for pf, f in zip(rows["Prev_File"], rows["File"])]
+        frames.append(pd.DataFrame({
+            "Flag": name,
+            "File": rows["File"].to_numpy(),
+            "Company": rows["Company"].to_numpy(),
+            "Year": rows["Year"].to_numpy(),
+            "Total_Score": cy["Total_Score"].to_numpy()[idx],
+            "Delta": dtotal[idx],
+            "Z": ztotal[idx],
+            "Detail": detail,
+            "Queue_Files": queue,
+        }))
+    if not frames:
+        return pd.DataFrame(columns=FLAG_COLUMNS)
+    out = pd.concat(frames, ignore_index=True)
+    severity = np.maximum(np.abs(out["Delta"].fillna(0)) / JUMP_TOTAL, np.abs(out["Z"].fillna(0)) / Z_LIMIT)
+    return out.assign(_s=severity).sort_values("_s", ascending=False, kind="stable").drop(columns="_s")
+
+# =========================
+# INCREMENTAL STATE
+# =========================
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    file_key TEXT PRIMARY KEY,
+    seq      INTEGER NOT NULL,
+    row      TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS flags (
+    flag_id     TEXT PRIMARY KEY,
+    flag        TEXT NOT NULL,
+    file        TEXT,
+    payload     TEXT NOT NULL,
+    first_seen  TEXT NOT NULL,
+    last_seen   TEXT NOT NULL,
+    resolved_on TEXT
+);
+CREATE TABLE IF NOT EXISTS queue (
+    file_key  TEXT PRIMARY KEY,
+    file      TEXT NOT NULL,
+    reason    TEXT,
+    queued_on TEXT NOT NULL,
+    queued_at INTEGER NOT NULL,
+    done_on   TEXT
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+def _flag_id(flag, file):
+    return f"{flag}\x1f{file_key(file)}"
+
+
+class DriftState:
+    def __init__(self, path, keys=ISO_KEYS, sectors=None):
+        self.path = path
+        self.keys = list(keys)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        if self.meta("keys") != json.dumps(self.keys):
+            self.reset()
+        # without a map, keep using the one given last (ISO Maker's per-batch refresh)
+        if sectors is None:
+            stored = self.meta("sectors")
+            sectors = json.loads(stored) if stored else None
+        else:
+            with self.conn:
+                self._set_meta("sectors", json.dumps(sectors, sort_keys=True, default=str))
+        self.sectors = sectors
+
+    def close(self):
+        self.conn.close()
+
+    def meta(self, key, default=None):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, key, value):
+        self.conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, str(value)))
+
+    def reset(self):
+        """Forget the compact copy (domain set changed, or a full rebuild is wanted)."""
+        with self.conn:
+            self.conn.execute("DELETE FROM scores")
+            self._set_meta("seq", 0)
+            self._set_meta("keys", json.dumps(self.keys))
+
+    # =========================
+    # COMPACT COPY
+    # =========================
+    def pull(self, store):
+        """Copy rows committed since the watermark; returns how many were read."""
+        since = int(self.meta("seq", 0))
+        if store.max_seq() <= since:
+            return 0
+        wanted = KEY_COLUMNS + self.keys + [FINGERPRINT_COLUMN]
+        latest = {}
+        for seq, key, *_, payload, _origin, _origin_seq in store.records_since(since):
+            row = json.loads(payload)
+            latest[key] = (key, seq, json.dumps({c: row.get(c) for c in wanted}))
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO scores VALUES (?, ?, ?)", latest.values())
+            self._set_meta("seq", max(s for _, s, _ in latest.values()))
+        return len(latest)
+
+    def frame(self):
+        """Latest stored row per file as a results frame (with seq)."""
+        rows = self.conn.execute("SELECT seq, row FROM scores ORDER BY seq").fetchall()
+        df = pd.DataFrame([json.loads(r) for _, r in rows],
+                          columns=KEY_COLUMNS + self.keys + [FINGERPRINT_COLUMN])
+        df["seq"] = [s for s, _ in rows]
+        return df
+
+    # =========================
+    # FLAGS + QUEUE
+    # =========================
+    def _flag_stamp(self):
+        """What the open flags were computed from: the row watermark + the sector map."""
+        sectors = json.dumps(self.sectors, sort_keys=True, default=str)
+        return f"{self.meta('seq')}:{hashlib.sha256(sectors.encode()).hexdigest()[:16]}"
+
+    def refresh(self, store, enqueue=True, now=None):
+        """
+        Pull new rows, recompute flags, sync the open set and (optionally)
+        queue suspect files. Returns (rows pulled, new flags frame).
+        """
+        pulled = self.pull(store)
+        if not pulled and self.meta("flagged") == self._flag_stamp():
+            return 0, pd.DataFrame(columns=FLAG_COLUMNS)
+
+        now = now or datetime.now().isoformat(timespec="seconds")
+        current = flags(company_years(self.frame(), self.keys), self.keys, self.sectors)
+        ids = [_flag_id(f, fn) for f, fn in zip(current["Flag"], current["File"])]
+        known = {i for (i,) in self.conn.execute("SELECT flag_id FROM flags WHERE resolved_on IS NULL")}
+        fresh = current.loc[np.array([i not in known for i in ids], dtype=bool)]
+
+        with self.conn:
+            self.conn.executemany(
+                """INSERT INTO flags (flag_id, flag, file, payload, first_seen, last_seen, resolved_on)
+                   VALUES (?, ?, ?, ?, ?, ?, NULL)
+                   ON CONFLICT(flag_id) DO UPDATE SET payload = excluded.payload,
+                       last_seen = excluded.last_seen, resolved_on = NULL""",
+                [(i, r["Flag"], r["File"], r.to_json(), now, now)
+                 for i, (_, r) in zip(ids, current.iterrows())])
+            gone = known - set(ids)
+            self.conn.executemany("UPDATE flags SET resolved_on = ? WHERE flag_id = ?",
+                                  [(now, i) for i in gone])
+            # queued files rescored since they were queued are done
+            self.conn.execute(
+                """UPDATE queue SET done_on = ? WHERE done_on IS NULL AND EXISTS
+                   (SELECT 1 FROM scores s WHERE s.file_key = queue.file_key AND s.seq > queue.queued_at)""",
+                (now,))
+            self._set_meta("flagged", self._flag_stamp())
+        if enqueue:
+            self.enqueue(fresh[fresh["Flag"].isin(QUEUE_KINDS)], now)
+        return pulled, fresh
+
+    def open_flags(self):
+        rows = self.conn.execute(
+            "SELECT payload, first_seen FROM flags WHERE resolved_on IS NULL ORDER BY first_seen").fetchall()
+        return pd.DataFrame([{**json.loads(p), "First_Seen": fs} for p, fs in rows],
+                            columns=FLAG_COLUMNS + ["First_Seen"])
+
+    def enqueue(self, suspects, now=None):
+        """Queue every file named in suspects["Queue_Files"]; returns how many are newly queued."""
+        now = now or datetime.now().isoformat(timespec="seconds")
+        seq = int(self.meta("seq", 0))
+        rows = {}
+        for files, flag in zip(suspects["Queue_Files"], suspects["Flag"]):
+            for f in files:
+                if isinstance(f, str) and f:
+                    rows.setdefault(file_key(f), (file_key(f), f, flag, now, seq))
+        with self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                """INSERT INTO queue (file_key, file, reason, queued_on, queued_at) VALUES (?, ?, ?, ?, ?)
+                   ON CONFLICT(file_key) DO UPDATE SET reason = excluded.reason, queued_on = excluded.queued_on,
+                       queued_at = excluded.queued_at, done_on = NULL WHERE queue.done_on IS NOT NULL""",
+                rows.values())
+            return self.conn.total_changes - before
+
+    def queued(self):
+        """Files waiting for re-extraction, oldest first."""
+        return [f for (f,) in self.conn.execute(
+            "SELECT file FROM queue WHERE done_on IS NULL ORDER BY queued_on, file")]
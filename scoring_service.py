@@ -0,0 +1,298 @@
+"""
+ISO27001 SCORING SERVICE
+------------------------
+Persistent local scoring service: the model and the results store are
+opened ONCE, PDFs are submitted as jobs over a small HTTP API and scored
+with bounded concurrency.
+
+API (JSON, 127.0.0.1 only)
+  GET    /health                      model + queue state
+  POST   /jobs   {"paths": [...]}     files and/or folders of PDFs
+  GET    /jobs                        all jobs
+  GET    /jobs/<id>                   progress
+  GET    /jobs/<id>/results           NDJSON rows, streamed as they finish
+  DELETE /jobs/<id>                   cancel rows not yet started
+
+Batch scripts use the client helpers at the bottom (service_available,
+submit, stream_results) and fall back to in-process scoring otherwise.
+A job's PDFs are claimed in the results store before scoring, so a batch
+scorer on the same store never scores them twice; files leased elsewhere
+are left out of the job ("held").
+"""
+
+import os
+import json
+import uuid
+import threading
+import urllib.request
+import urllib.error
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from iso_scoring import ISO_KEYS
+from iso_pipeline import normalize_filename, score_pdf
+
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = int(os.environ.get("ISO_SERVICE_PORT", "50556"))
+SERVICE_URL = f"http://{SERVICE_HOST}:{SERVICE_PORT}"
+
+# =========================
+# JOBS
+# =========================
+class Job:
+    def __init__(self, paths, held=()):
+        self.id = uuid.uuid4().hex[:12]
+        self.paths = paths
+        self.held = list(held)  # leased to another scorer, not scored here
+        self.rows = []
+        self.errors = []
+        self.state = "queued"
+        self.created = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.cancelled = False
+        self.error = None  # commit failure, if any
+        self.cond = threading.Condition()
+
+    @property
+    def finished(self):
+        return self.state in ("done", "cancelled", "failed")
+
+    def summary(self):
+        return {
+            "job_id": self.id,
+            "state": self.state,
+            "created": self.created,
+            "total": len(self.paths),
+            "done": len(self.rows),
+            "errors": len(self.errors),
+            "held": len(self.held),
+            "error": self.error,
+        }
+
+
+class ScoringService:
+    def __init__(self, encoder, domain_matrix, store, keys=ISO_KEYS, sentence_store=None, workers=2,
+                 journal=None, fingerprint=None, registry=None):
+        self.encoder = encoder
+        self.domain_matrix = domain_matrix
+        self.keys = keys
+        self.store = store  # results_store.ResultsStore
+        self.journal = journal  # journal.Journal — rows persisted as they finish
+        self.fingerprint = fingerprint  # provenance stamp for every row
+        self.registry = registry  # company_registry.CompanyRegistry — "Code" per row
+        self.sentence_store = sentence_store
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self.workers = workers
+        self.jobs = {}
+        self.encode_lock = threading.Lock()  # one forward pass at a time
+
+    # ---------- submission ----------
+    def expand(self, paths, skip_processed=True):
+        pdfs = []
+        for p in paths:
+            if os.path.isdir(p):
+                pdfs.extend(
+                    os.path.join(p, f) for f in sorted(os.listdir(p)) if f.lower().endswith(".pdf")
+                )
+            elif p.lower().endswith(".pdf"):
+                pdfs.append(p)
+        if skip_processed:
+            processed = self.store.processed_files() | set(self.store.aliases())  # indexed, no rows read
+            pdfs = [p for p in pdfs if normalize_filename(p) not in processed]
+        return pdfs
+
+    def submit(self, paths, skip_processed=True):
+        pdfs = self.expand(paths, skip_processed)
+        claimed = set(self.store.claim([os.path.basename(p) for p in pdfs], skip_processed=skip_processed))
+        job = Job([p for p in pdfs if os.path.basename(p) in claimed],
+                  [p for p in pdfs if os.path.basename(p) not in claimed])
+        self.jobs[job.id] = job
+        if not job.paths:
+            job.state = "done"
+            return job
+        job.state = "running"
+        remaining = [len(job.paths)]
+        counter_lock = threading.Lock()
+
+        def run(path):
+            if job.cancelled:
+                row = None
+            else:
+                try:
+                    row = score_pdf(path, self, self.domain_matrix, self.keys, self.sentence_store,
+                                    fingerprint=self.fingerprint, registry=self.registry)
+                except Exception as e:
+                    row = None
+                    job.errors.append({"File": os.path.basename(path), "Error": str(e)})
+            if row is not None and self.journal is not None:
+                self.journal.append(row)
+            self.store.renew()  # keep this process's leases alive through long jobs
+            with job.cond:
+                if row is not None:
+                    job.rows.append(row)
+                job.cond.notify_all()
+            with counter_lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                # always reach a terminal state, or streaming clients wait forever
+                state = "cancelled" if job.cancelled else "done"
+                try:
+                    if self.journal is not None:
+                        self.journal.compact(self.store)
+                    else:
+                        self.store.commit(job.rows)
+                except Exception as e:
+                    job.error = f"commit failed: {e}"
+                    state = "failed"
+                finally:
+                    try:
+                        # committed files already dropped their lease; hand back the rest
+                        self.store.release([os.path.basename(p) for p in job.paths])
+                    except Exception:
+                        pass
+                    with job.cond:
+                        job.state = state
+                        job.cond.notify_all()
+
+        for path in job.paths:
+            self.pool.submit(run, path)
+        return job
+
+    # the service doubles as the encoder handed to score_pdf
+    def encode(self, sentences, **kwargs):
+        with self.encode_lock:
+            return self.encoder.encode(sentences, **kwargs)
+
+    def cancel(self, job_id):
+        job = self.jobs[job_id]
+        job.cancelled = True
+        return job
+
+    def health(self):
+        return {
+            "status": "ok",
+            "workers": self.workers,
+            "jobs": len(self.jobs),
+            "running": sum(1 for j in self.jobs.values() if not j.finished),
+            "processed_files": len(self.store),
+            "fingerprint": self.fingerprint,
+        }
+
+# =========================
+# HTTP LAYER
+# =========================
+def make_handler(service):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.0"
+
+        def log_message(self, fmt, *args):
+            pass
+
+        def _json(self, payload, code=200):
+            body = json.dumps(payload, default=str).encode()
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _job(self, parts):
+            job = service.jobs.get(parts[1]) if len(parts) > 1 else None
+            if job is None:
+                self._json({"error": "unknown job"}, 404)
+            return job
+
+        def do_GET(self):
+            parts = [p for p in self.path.split("?")[0].split("/") if p]
+            if parts == ["health"]:
+                return self._json(service.health())
+            if parts == ["jobs"]:
+                return self._json([j.summary() for j in service.jobs.values()])
+            if parts and parts[0] == "jobs":
+                job = self._job(parts)
+                if job is None:
+                    return
+                if len(parts) == 2:
+                    return self._json(job.summary())
+                if len(parts) == 3 and parts[2] == "results":
+                    return self._stream(job)
+            self._json({"error": "not found"}, 404)
+
+        def _stream(self, job):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.end_headers()
+            sent = 0
+            while True:
+                with job.cond:
+                    while sent >= len(job.rows) and not job.finished:
+                        job.cond.wait(timeout=30)
+                    batch = job.rows[sent:]
+                    finished = job.finished
+                for row in batch:
+                    self.wfile.write((json.dumps(row, default=str) + "\n").encode())
+                self.wfile.flush()
+                sent += len(batch)
+                if finished and sent >= len(job.rows):
+                    break
+
+        def do_POST(self):
+            if self.path.rstrip("/") != "/jobs":
+                return self._json({"error": "not found"}, 404)
+            length = int(self.headers.get("Content-Length", 0))
+            try:
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                paths = payload["paths"]
+            except (ValueError, KeyError):
+                return self._json({"error": "expected {\"paths\": [...]}"}, 400)
+            job = service.submit(paths, payload.get("skip_processed", True))
+            self._json(job.summary(), 202)
+
+        def do_DELETE(self):
+            parts = [p for p in self.path.split("/") if p]
+            if parts and parts[0] == "jobs":
+                job = self._job(parts)
+                if job is not None:
+                    service.cancel(job.id)
+                    self._json(job.summary())
+                return
+            self._json({"error": "not found"}, 404)
+
+    return Handler
+
+def serve(service, host=SERVICE_HOST, port=SERVICE_PORT):
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    server.daemon_threads = True
+    server.serve_forever()
+
+# =========================
+# CLIENT
+# =========================
+def _request(method, path, payload=None, timeout=10):
+    data = json.dumps(payload).encode() if payload is not None else None
+    req = urllib.request.Request(SERVICE_URL + path, data=data, method=method,
+                                 headers={"Content-Type": "application/json"})
+    return urllib.request.urlopen(req, timeout=timeout)
+
+def service_available():
+    try:
+        with _request("GET", "/health", timeout=1) as r:
+            return r.status == 200
+    except (urllib.error.URLError, OSError):
+        return False
+
+def submit(paths, skip_processed=True):
+    with _request("POST", "/jobs", {"paths": list(paths), "skip_processed": skip_processed}) as r:
+        return json.load(r)
+
+def job_status(job_id):
+    with _request("GET", f"/jobs/{job_id}") as r:
+        return json.load(r)
+
+def stream_results(job_id):
+    """Yield result rows as the service finishes them."""
+    with _request("GET", f"/jobs/{job_id}/results", timeout=None) as r:
+        for line in r:
+            if line.strip():
+                yield json.loads(line)
@@ -0,0 +1,198 @@
+"""
+INCREMENTAL SNAPSHOTS
+---------------------
+Point-in-time backups of the results store without full copies.
+
+• snapshot()  → only rows appended since the previous snapshot, written as
+                one gzip'd, content-addressed segment (sha256 name)
+• manifest    → small JSON listing every segment up to that point, so any
+                manifest restores on its own
+• prune()     → retention: the newest KEEP_LAST snapshots plus one per day
+                for KEEP_DAILY days. Manifests are cumulative, so the
+                history before the oldest kept snapshot is compacted into
+                one base segment (latest row per File); the segments it
+                replaces, and any other unreferenced ones, are deleted
+• restore()   → rebuild a store as it was at any retained snapshot
+
+Snapshot cost follows the batch size, not the size of the history.
+"""
+
+import os
+import json
+import gzip
+import glob
+import hashlib
+from datetime import datetime, timedelta
+
+# =========================
+# CONFIG
+# =========================
+KEEP_LAST = 20
+KEEP_DAILY = 14
+
+def snapshot_dir_for(store_path):
+    """`ISO Data Collection.sqlite` → `ISO Data Collection_snapshots/`."""
+    return os.path.splitext(store_path)[0] + "_snapshots"
+
+def _atomic_write(path, data):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class Snapshots:
+    def __init__(self, root):
+        self.root = root
+        self.segment_dir = os.path.join(root, "segments")
+        self.manifest_dir = os.path.join(root, "manifests")
+        os.makedirs(self.segment_dir, exist_ok=True)
+        os.makedirs(self.manifest_dir, exist_ok=True)
+
+    # =========================
+    # MANIFESTS
+    # =========================
+    def manifests(self):
+        """All manifests, oldest first."""
+        out = []
+        for path in sorted(glob.glob(os.path.join(self.manifest_dir, "*.json"))):
+            with open(path, encoding="utf-8") as f:
+                m = json.load(f)
+            m["path"] = path
+            out.append(m)
+        return out
+
+    def latest(self):
+        manifests = self.manifests()
+        return manifests[-1] if manifests else None
+
+    def at(self, when):
+        """Newest manifest taken at or before `when` (datetime or ISO string)."""
+        if isinstance(when, str):
+            when = datetime.fromisoformat(when)
+        chosen = None
+        for m in self.manifests():
+            if datetime.fromisoformat(m["created"]) <= when:
+                chosen = m
+        return chosen
+
+    # =========================
+    # SNAPSHOT
+    # =========================
+    def snapshot(self, store):
+        """Write a segment for rows added since the last snapshot. None when nothing changed."""
+        prev = self.latest()
+        high_water = prev["seq"] if prev else 0
+        records = store.records_since(high_water)
+        if not records:
+            return None
+
+        digest = self._write_segment(records)
+
+        now = datetime.now()
+        manifest = {
+            "created": now.isoformat(timespec="seconds"),
+            "seq": records[-1][0],
+            "rows": (prev["rows"] if prev else 0) + len(records),
+            "segments": (prev["segments"] if prev else []) + [digest],
+        }
+        path = os.path.join(self.manifest_dir, f"{now:%Y%m%d_%H%M%S_%f}.json")
+        _atomic_write(path, json.dumps(manifest, indent=1).encode("utf-8"))
+        manifest["path"] = path
+        return manifest
+
+    # =========================
+    # RESTORE
+    # =========================
+    def records(self, manifest):
+        return self._read(manifest["segments"])
+
+    def _read(self, digests):
+        for digest in digests:
+            with gzip.open(os.path.join(self.segment_dir, f"{digest}.jsonl.gz"), "rt", encoding="utf-8") as f:
+                for line in f:
+                    yield json.loads(line)
+
+    def _write_segment(self, records):
+        data = gzip.compress(
+            "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records).encode("utf-8"),
+            mtime=0,
+        )
+        digest = hashlib.sha256(data).hexdigest()
+        seg_path = os.path.join(self.segment_dir, f"{digest}.jsonl.gz")
+        if not os.path.exists(seg_path):
+            _atomic_write(seg_path, data)
+        return digest
+
+    def restore(self, store, manifest=None):
+        """Load `manifest` (default: latest) into an empty ResultsStore."""
+        manifest = manifest or self.latest()
+        if manifest is None:
+            return 0
+        if len(store):
+            raise ValueError(f"restore target is not empty: {store.path}")
+        return store.insert_records([tuple(r) for r in self.records(manifest)])
+
+    # =========================
+    # RETENTION
+    # =========================
+    def prune(self, keep_last=KEEP_LAST, keep_daily=KEEP_DAILY):
+        """Apply the retention policy. Returns (manifests removed, segments removed)."""
+        manifests = self.manifests()
+        keep = {m["path"] for m in manifests[-keep_last:]} if keep_last else set()
+
+        cutoff = (datetime.now() - timedelta(days=keep_daily)).date()
+        last_per_day = {}
+        for m in manifests:
+            day = datetime.fromisoformat(m["created"]).date()
+            if day >= cutoff:
+                last_per_day[day] = m["path"]
+        keep.update(last_per_day.values())
+
+        removed = 0
+        for m in manifests:
+            if m["path"] not in keep:
+                os.remove(m["path"])
+                removed += 1
+        kept = [m for m in manifests if m["path"] in keep]
+        if kept:
+            self._rebase(kept)
+
+        live = set()
+        for m in kept:
+            live.update(m["segments"])
+
+        orphans = 0
+        for seg in glob.glob(os.path.join(self.segment_dir, "*.jsonl.gz")):
+            if os.path.basename(seg).split(".")[0] not in live:
+                os.remove(seg)
+                orphans += 1
+        return removed, orphans
+
+    def _rebase(self, kept):
+        """
+        Fold the oldest kept manifest's segments into one base segment
+        holding the latest record per File, and point every kept manifest
+        at it. Restores give the same latest rows; only superseded
+        history from before the retention window is dropped.
+        """
+        prefix = kept[0]["segments"]
+        if len(prefix) < 2:
+            return
+        if any(m["segments"][:len(prefix)] != prefix for m in kept):
+            return  # not one chain (hand-edited manifests) — leave them alone
+        latest, total = {}, 0
+        for r in self._read(prefix):
+            latest[r[1]] = r  # file_key → newest record (segments are in seq order)
+            total += 1
+        base = self._write_segment(sorted(latest.values(), key=lambda r: r[0]))
+        dropped = total - len(latest)
+
+        for m in kept:
+            body = {k: v for k, v in m.items() if k != "path"}
+            body["segments"] = [base] + m["segments"][len(prefix):]
+            body["rows"] = m["rows"] - dropped
+            _atomic_write(m["path"], json.dumps(body, indent=1).encode("utf-8"))
+            m.update(body)
@@ -0,0 +1,208 @@
+"""
+WARM START
+----------
+Cuts the fixed startup cost every scoring script pays.
+
+• sentence-transformers / torch imported only on a real model load
+• HF snapshot resolved from refs/main instead of globbing + stat
+• Domain embedding matrix cached on disk, keyed by description text,
+  model name and model revision
+• NLTK data checked before any download attempt
+• Optional resident encoder daemon ("Scoring daemon.py") that batch
+  scripts connect to instead of loading mpnet themselves; authkey from
+  ISO_DAEMON_KEY or a per-user key file, and only used when it serves
+  the requested model / device
+"""
+
+import os
+import glob
+import hashlib
+import secrets
+
+import numpy as np
+
+from iso_scoring import normalize_rows
+
+# =========================
+# CONFIG
+# =========================
+MODEL_NAME = "all-mpnet-base-v2"
+HF_HUB = os.environ.get(
+    "HF_HUB_CACHE",
+    os.path.join(os.environ.get("HF_HOME", os.path.join(os.path.expanduser("~"), ".cache", "huggingface")), "hub"),
+)
+CACHE_DIR = os.environ.get("ISO_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "iso_scoring"))
+
+DAEMON_ADDRESS = ("127.0.0.1", int(os.environ.get("ISO_DAEMON_PORT", "50555")))
+DAEMON_KEY_FILE = os.path.join(CACHE_DIR, "daemon.key")  # generated once, readable by this user only
+
+# =========================
+# NLTK
+# =========================
+def ensure_nltk(*resources):
+    """Download tokenizer data only when it is actually missing."""
+    import nltk
+    for res in resources or ("punkt",):
+        try:
+            nltk.data.find(f"tokenizers/{res}")
+        except LookupError:
+            nltk.download(res, quiet=True)
+
+# =========================
+# MODEL RESOLUTION
+# =========================
+def _hub_folder(name):
+    repo = name if "/" in name else f"sentence-transformers/{name}"
+    return os.path.join(HF_HUB, "models--" + repo.replace("/", "--"))
+
+def resolve_snapshot(name=MODEL_NAME):
+    """Local snapshot folder for a hub model, or None when not cached."""
+    if os.path.isdir(name):
+        return name
+    folder = _hub_folder(name)
+    ref = os.path.join(folder, "refs", "main")
+    if os.path.exists(ref):
+        with open(ref, encoding="utf-8") as f:
+            path = os.path.join(folder, "snapshots", f.read().strip())
+        if os.path.isdir(path):
+            return path
+    snapshots = glob.glob(os.path.join(folder, "snapshots", "*"))
+    return max(snapshots, key=os.path.getmtime) if snapshots else None
+
+def model_revision(name=MODEL_NAME):
+    snapshot = resolve_snapshot(name)
+    return os.path.basename(os.path.normpath(snapshot)) if snapshot else "unknown"
+
+_models = {}
+
+def load_model(name=MODEL_NAME, device="cpu", local_files_only=True):
+    """Load (once per process) a SentenceTransformer from the local snapshot."""
+    key = (name, device, local_files_only)
+    if key not in _models:
+        from sentence_transformers import SentenceTransformer
+        path = resolve_snapshot(name) if local_files_only else None
+        _models[key] = SentenceTransformer(
+            path or name,
+            local_files_only=local_files_only,
+            device=device,
+        )
+    return _models[key]
+
+# =========================
+# DOMAIN EMBEDDING CACHE
+# =========================
+def domain_cache_key(texts, name=MODEL_NAME, revision=None):
+    h = hashlib.sha256()
+    h.update(name.encode())
+    h.update(b"\0")
+    h.update((revision or model_revision(name)).encode())
+    for t in texts:
+        h.update(b"\0")
+        h.update(t.encode())
+    return h.hexdigest()[:24]
+
+def domain_matrix(texts, encoder=None, name=MODEL_NAME, revision=None):
+    """
+    Normalized domain embedding matrix for `texts`.
+
+    Served from disk when the same text/model/revision was encoded before;
+    `encoder` (a model or daemon proxy) is only touched on a cache miss.
+    """
+    texts = list(texts)
+    path = os.path.join(CACHE_DIR, f"domains_{domain_cache_key(texts, name, revision)}.npy")
+    if os.path.exists(path):
+        return np.load(path)
+
+    if encoder is None:
+        encoder = get_encoder(name)
+    matrix = normalize_rows(encoder.encode(texts, show_progress_bar=False))
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = path + ".tmp.npy"
+    np.save(tmp, matrix)
+    os.replace(tmp, path)
+    return matrix
+
+# =========================
+# RESIDENT ENCODER DAEMON
+# =========================
+def daemon_authkey():
+    """ISO_DAEMON_KEY, else the per-user key file (created 0600 on first use)."""
+    key = os.environ.get("ISO_DAEMON_KEY")
+    if key:
+        return key.encode()
+    try:
+        with open(DAEMON_KEY_FILE, encoding="utf-8") as f:
+            return f.read().strip().encode()
+    except FileNotFoundError:
+        pass
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    try:
+        fd = os.open(DAEMON_KEY_FILE, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:  # another process created it first
+        with open(DAEMON_KEY_FILE, encoding="utf-8") as f:
+            return f.read().strip().encode()
+    key = secrets.token_hex(32)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(key)
+    return key.encode()
+
+def _manager_class():
+    from multiprocessing.managers import BaseManager
+
+    class EncoderManager(BaseManager):
+        pass
+
+    return EncoderManager
+
+def serve_encoder(name=MODEL_NAME, device="cpu", address=DAEMON_ADDRESS):
+    """Block forever, serving encode() from one resident model."""
+    model = load_model(name, device)
+
+    class Encoder:
+        def encode(self, sentences, **kwargs):
+            kwargs.setdefault("show_progress_bar", False)
+            return model.encode(list(sentences), **kwargs)
+
+        def revision(self):
+            return model_revision(name)
+
+        def identity(self):
+            return name, device
+
+    encoder = Encoder()
+    manager = _manager_class()
+    manager.register("encoder", callable=lambda: encoder)
+    server = manager(address=address, authkey=daemon_authkey()).get_server()
+    server.serve_forever()
+
+def connect_encoder(address=DAEMON_ADDRESS):
+    """Proxy to a running daemon, or None when nothing is listening."""
+    from multiprocessing import AuthenticationError
+
+    manager = _manager_class()
+    manager.register("encoder")
+    client = manager(address=address, authkey=daemon_authkey())
+    try:
+        client.connect()
+    except (ConnectionRefusedError, OSError, EOFError, AuthenticationError):
+        return None
+    return client.encoder()
+
+def get_encoder(name=MODEL_NAME, device=None, local_files_only=True, use_daemon=True):
+    """
+    Daemon proxy when one is running the same model (and `device`, when
+    given), else the in-process model (CPU unless `device` says otherwise).
+    """
+    if use_daemon:
+        proxy = connect_encoder()
+        if proxy is not None:
+            try:
+                served_name, served_device = proxy.identity()
+            except Exception:  # daemon from before identity() — cannot tell what it serves
+                served_name = served_device = None
+            if served_name == name and device in (None, served_device):
+                return proxy
+            print(f"[⚠️] Encoder daemon serves {served_name} ({served_device}), "
+                  f"wanted {name} ({device or 'any'}) — loading locally")
+    return load_model(name, device or "cpu", local_files_only)